@@ -130,7 +130,7 @@ export function useItem(companyId: number, itemId: number) {
 export function useItemSearch(companyId: number, search: string, enabled: boolean) {
     return useQuery({
         queryKey: ['items', companyId, { search }],
-        queryFn: () => itemAPI.list(companyId, { search, active: true }),
+        queryFn: () => itemAPI.page(companyId, { search, active: true }, { pageSize: 20, fields: ['id', 'name', 'uom'] }).then(page => page.results),
         staleTime: 30 * 1000,
         enabled: enabled && search.length >= 2,
     });
@@ -25,6 +25,10 @@ export interface MyPermissionsResponse {
     permissions: string[];
 }
 
+export interface AllMyPermissionsResponse {
+    permissions: Record<string, string[]>;   // company id → permission keys
+}
+
 export interface TeamMember {
     id: number;
     user_id: number;
@@ -92,6 +96,10 @@ export const accessAPI = {
     getMyPermissions: (companyId: number): Promise<MyPermissionsResponse> =>
         apiRequest(`/api/access/companies/${companyId}/my-permissions/`),
 
+    /** Every company at once — prefer this over one getMyPermissions call per company. */
+    getAllMyPermissions: (): Promise<AllMyPermissionsResponse> =>
+        apiRequest(`/api/access/my-permissions/`),
+
     // --- Team ---
 
     getTeamMembers: (companyId: number, page: number = 1): Promise<TeamListResponse> =>
@@ -119,6 +119,41 @@ export interface ItemFilters {
     search?: string;
 }
 
+export type ItemFacetName = 'type' | 'category' | 'active';
+
+export interface ItemFacetCount<V> {
+    value: V;
+    label?: string | null;
+    count: number;
+}
+
+export interface ItemFacets {
+    type?: ItemFacetCount<ItemType>[];
+    category?: ItemFacetCount<number | null>[];
+    active?: ItemFacetCount<boolean>[];
+}
+
+export interface ItemPage {
+    next: string | null;          // absolute URL carrying the next cursor
+    previous: string | null;
+    results: Item[];
+    count?: number;               // only with includeTotal
+    facets?: ItemFacets;          // only with facets
+}
+
+export interface ItemPageOptions {
+    cursor?: string;
+    pageSize?: number;
+    includeTotal?: boolean;
+    facets?: ItemFacetName[];     // each facet ignores its own filter, honours the others
+    fields?: (keyof Item)[];      // sparse rows: only these keys are queried and returned
+}
+
+export interface ItemLookup {
+    results: Item[];              // in requested order
+    missing: number[];            // ids not found in this company
+}
+
 export interface ItemAttribute {
     id: number;
     key: string;
@@ -173,17 +208,45 @@ export const categoryAPI = {
         }),
 };
 
+function itemFilterParams(filters?: ItemFilters): URLSearchParams {
+    const params = new URLSearchParams();
+    if (filters?.type)                    params.set('type', filters.type);
+    if (filters?.active !== undefined)    params.set('active', String(filters.active));
+    if (filters?.category !== undefined)  params.set('category', String(filters.category));
+    if (filters?.search)                  params.set('search', filters.search);
+    return params;
+}
+
 export const itemAPI = {
+    /**
+     * Whole filtered catalog in one (streamed) response.
+     * Prefer `page` for anything user-facing — large tenants have tens of thousands of items.
+     */
     list: (companyId: number, filters?: ItemFilters): Promise<Item[]> => {
-        const params = new URLSearchParams();
-        if (filters?.type)                    params.set('type', filters.type);
-        if (filters?.active !== undefined)    params.set('active', String(filters.active));
-        if (filters?.category !== undefined)  params.set('category', String(filters.category));
-        if (filters?.search)                  params.set('search', filters.search);
+        const params = itemFilterParams(filters);
+        params.set('stream', 'true');
+        return apiRequest(`/api/items/companies/${companyId}/items/?${params.toString()}`);
+    },
+
+    /** One cursor page, newest first. Pass `next`'s cursor to continue. */
+    page: (companyId: number, filters?: ItemFilters, options?: ItemPageOptions): Promise<ItemPage> => {
+        const params = itemFilterParams(filters);
+        if (options?.cursor)        params.set('cursor', options.cursor);
+        if (options?.pageSize)      params.set('page_size', String(options.pageSize));
+        if (options?.includeTotal)  params.set('include_total', 'true');
+        if (options?.facets?.length) params.set('facets', options.facets.join(','));
+        if (options?.fields?.length) params.set('fields', options.fields.join(','));
         const qs = params.toString();
         return apiRequest(`/api/items/companies/${companyId}/items/${qs ? `?${qs}` : ''}`);
     },
 
+    /** Many items by id in one request — POST so long id lists don't hit URL limits. */
+    lookup: (companyId: number, ids: number[], fields?: (keyof Item)[]): Promise<ItemLookup> =>
+        apiRequest(`/api/items/companies/${companyId}/items/lookup/`, {
+            method: 'POST',
+            body: JSON.stringify(fields?.length ? { ids, fields } : { ids }),
+        }),
+
     create: (companyId: number, data: CreateItemData): Promise<ItemDetail> =>
         apiRequest(`/api/items/companies/${companyId}/items/`, {
             method: 'POST',
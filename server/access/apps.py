@@ -1,5 +1,16 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.models.signals import post_migrate
 
 
 class AccessConfig(AppConfig):
-    name = 'access'
\ No newline at end of file
+    name = 'access'
+
+    def ready(self):
+        # Builds the in-memory permission registry from PERMISSION_CATALOG and keeps
+        # the permissions table in line with it after every `migrate` and on the
+        # first request of the process (no queries here: see services/catalog.py).
+        from .services.catalog import SYNC_ON_FIRST_REQUEST, sync_on_first_request, sync_permission_catalog
+
+        post_migrate.connect(sync_permission_catalog, sender=self, dispatch_uid='access.sync_permission_catalog')
+        request_started.connect(sync_on_first_request, dispatch_uid=SYNC_ON_FIRST_REQUEST)
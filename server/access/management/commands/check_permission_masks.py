@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from access.models import Role
+from access.services.permissions import bump_access_versions, compute_role_masks
+
+
+class Command(BaseCommand):
+    """
+    Compares every Role.permission_mask with the mask derived from its
+    RolePermission rows (the source of truth).
+
+        python manage.py check_permission_masks            # report drift, exit 1 if any
+        python manage.py check_permission_masks --repair   # rewrite drifted masks
+    """
+    help = "Verify Role.permission_mask against RolePermission rows and optionally repair drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repair',
+            action='store_true',
+            help='Rewrite drifted masks and invalidate cached permissions of affected companies.',
+        )
+
+    def handle(self, *args, **options):
+        expected = compute_role_masks()
+
+        drifted = []
+        for role in Role.objects.only('id', 'company_id', 'name', 'permission_mask').iterator():
+            mask = expected.get(role.id, 0)
+            if role.permission_mask != mask:
+                self.stdout.write(
+                    f"Role {role.id} ({role.name!r}, company {role.company_id}): "
+                    f"stored {role.permission_mask:#x}, expected {mask:#x}"
+                )
+                role.permission_mask = mask
+                drifted.append(role)
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("All role permission masks are consistent."))
+            return
+
+        if not options['repair']:
+            raise CommandError(f"{len(drifted)} role(s) have drifted. Re-run with --repair to fix them.")
+
+        with transaction.atomic():
+            Role.objects.bulk_update(drifted, ['permission_mask'], batch_size=1000)
+            bump_access_versions({role.company_id for role in drifted})
+
+        self.stdout.write(self.style.SUCCESS(f"Repaired {len(drifted)} role permission mask(s)."))
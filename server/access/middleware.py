@@ -0,0 +1,50 @@
+import logging
+
+from django.utils.functional import SimpleLazyObject
+
+from .services import audit
+from .services.tenant import get_tenant
+
+logger = logging.getLogger(__name__)
+
+
+class TenantContextMiddleware:
+    """
+    Attaches a lazy `request.tenant` (company, membership, permission mask) to
+    every request routed with a `company_id` URL kwarg.
+
+    Resolution is deferred until first access because DRF authenticates inside
+    the view — by then `request.user` is the JWT user. See access/services/tenant.py.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        company_id = view_kwargs.get('company_id')
+        if company_id is not None:
+            request.tenant = SimpleLazyObject(lambda: get_tenant(request, company_id))
+        return None
+
+
+class AuditMiddleware:
+    """
+    Writes the access audit events a request produced in one bulk insert
+    (or hands them to the background writer) once the response is ready.
+    See access/services/audit.py.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        audit.open_buffer(request)
+        response = self.get_response(request)
+        try:
+            audit.flush(request)
+        except Exception:
+            logger.exception('Failed to write audit events for %s %s', request.method, request.path)
+        return response
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-17 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('access', '0003_alter_permission_key_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='role',
+            name='permission_mask',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+    ]
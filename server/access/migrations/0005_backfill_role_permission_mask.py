@@ -0,0 +1,34 @@
+# Generated by Django 6.0.2 on 2026-10-17 03:45
+
+from django.db import migrations
+
+
+def backfill_permission_masks(apps, schema_editor):
+    Role = apps.get_model("access", "Role")
+    RolePermission = apps.get_model("access", "RolePermission")
+
+    from access.permissions import PERMISSION_BITS
+
+    masks = {}
+    rows = RolePermission.objects.values_list("role_id", "permission__key").iterator()
+    for role_id, key in rows:
+        if key in PERMISSION_BITS:
+            masks[role_id] = masks.get(role_id, 0) | (1 << PERMISSION_BITS[key])
+
+    roles = []
+    for role in Role.objects.only("id", "permission_mask").iterator():
+        role.permission_mask = masks.get(role.id, 0)
+        roles.append(role)
+
+    Role.objects.bulk_update(roles, ["permission_mask"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('access', '0004_role_permission_mask'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_permission_masks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-17 03:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('access', '0005_backfill_role_permission_mask'),
+        ('companies', '0003_company_access_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='membership',
+            name='idx_membership_user_active',
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['company', 'is_active', '-joined_at', '-id'], name='idx_membership_company_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['user', 'is_active', '-joined_at', '-id'], name='idx_membership_user_keyset'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0.2 on 2026-10-17 03:54
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('access', '0006_keyset_pagination_indexes'),
+        ('companies', '0003_company_access_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccessAuditEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(max_length=64)),
+                ('target_type', models.CharField(blank=True, default='', max_length=32)),
+                ('target_id', models.BigIntegerField(blank=True, null=True)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='audit_events', to='companies.company')),
+            ],
+            options={
+                'db_table': 'access_audit_events',
+                'ordering': ['-timestamp', '-id'],
+                'indexes': [models.Index(fields=['company', '-timestamp', '-id'], name='idx_audit_company_time')],
+            },
+        ),
+    ]
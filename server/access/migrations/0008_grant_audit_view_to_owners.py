@@ -0,0 +1,41 @@
+# Generated by Django 6.0.2 on 2026-10-17 05:10
+
+from django.db import migrations
+from django.db.models import F
+
+AUDIT_VIEW = "audit.view"
+AUDIT_VIEW_BIT = 14
+
+
+def grant_audit_view(apps, schema_editor):
+    """Owner roles hold every permission, so existing ones get the new audit.view too."""
+    Permission = apps.get_model("access", "Permission")
+    Role = apps.get_model("access", "Role")
+    RolePermission = apps.get_model("access", "RolePermission")
+    Company = apps.get_model("companies", "Company")
+
+    permission, _ = Permission.objects.get_or_create(
+        key=AUDIT_VIEW,
+        defaults={"description": "View the access audit log"},
+    )
+
+    owners = Role.objects.filter(name="Owner", is_system=True)
+    RolePermission.objects.bulk_create(
+        [RolePermission(role_id=role_id, permission_id=permission.id) for role_id in owners.values_list("id", flat=True)],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    owners.update(permission_mask=F("permission_mask").bitor(1 << AUDIT_VIEW_BIT))
+    Company.objects.filter(roles__name="Owner", roles__is_system=True).update(access_version=F("access_version") + 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('access', '0007_accessauditevent'),
+        ('companies', '0003_company_access_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(grant_audit_view, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 class Membership(models.Model):
@@ -40,7 +41,15 @@ class Membership(models.Model):
             )
         ]
         indexes = [
-            models.Index(fields=["user", "is_active"], name="idx_membership_user_active"),
+            # Keyset pagination: team list (company) and my-companies (user)
+            models.Index(
+                fields=["company", "is_active", "-joined_at", "-id"],
+                name="idx_membership_company_keyset",
+            ),
+            models.Index(
+                fields=["user", "is_active", "-joined_at", "-id"],
+                name="idx_membership_user_keyset",
+            ),
         ]
 
     def __str__(self) -> str:
@@ -71,6 +80,10 @@ class Role(models.Model):
     # Useful when you seed default roles like Owner/Admin and want to protect them
     is_system = models.BooleanField(default=False)
 
+    # Denormalized OR of PERMISSION_BITS for every RolePermission row of this role.
+    # Recomputed whenever those rows change — never edit by hand.
+    permission_mask = models.BigIntegerField(default=0, editable=False)
+
     class Meta:
         db_table = "roles"
         verbose_name = "Role"
@@ -167,4 +180,49 @@ class MembershipRole(models.Model):
         ]
 
     def __str__(self) -> str:
-        return f"{self.membership} → {self.role.name}"
\ No newline at end of file
+        return f"{self.membership} → {self.role.name}"
+
+class AccessAuditEvent(models.Model):
+    """
+    Append-only trail of access changes (roles, permissions, memberships).
+
+    Rows are written in bulk by access.services.audit — never updated or deleted
+    through the ORM. `target_id` is a plain integer (not a FK) so the trail
+    outlives the roles/memberships it describes.
+    """
+
+    company = models.ForeignKey(
+        "companies.Company",
+        on_delete=models.CASCADE,
+        related_name="audit_events",
+    )
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    action = models.CharField(max_length=64)
+    target_type = models.CharField(max_length=32, blank=True, default="")
+    target_id = models.BigIntegerField(null=True, blank=True)
+    data = models.JSONField(default=dict, blank=True)
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "access_audit_events"
+        ordering = ["-timestamp", "-id"]
+        indexes = [
+            models.Index(fields=["company", "-timestamp", "-id"], name="idx_audit_company_time"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.timestamp:%Y-%m-%d %H:%M:%S} | {self.company_id} | {self.action}"
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Audit events are append-only.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Audit events are append-only.")
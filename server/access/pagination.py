@@ -1,7 +1,17 @@
-from rest_framework.pagination import PageNumberPagination
+from core.pagination import KeysetPagination
 
 
-class TeamPagination(PageNumberPagination):
+class TeamPagination(KeysetPagination):
+    """Newest members first; served by idx_membership_company_keyset."""
+    ordering = ('-joined_at', '-id')
     page_size = 20
     page_size_query_param = 'page_size'
-    max_page_size = 100
\ No newline at end of file
+    max_page_size = 100
+
+
+class AuditPagination(KeysetPagination):
+    """Newest events first; served by idx_audit_company_time."""
+    ordering = ('-timestamp', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
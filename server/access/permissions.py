@@ -6,6 +6,8 @@ to roles. Roles are then assigned to memberships inside companies.
 
 Admins combine these permissions to create custom roles.
 """
+from django.core.exceptions import ImproperlyConfigured
+
 
 PERMISSION_CATALOG = {
     "companies": {
@@ -44,16 +46,73 @@ PERMISSION_CATALOG = {
             "items.edit": "Edit items",
             "items.delete": "Delete items"
         },
-    }
+    },
+
+    "audit": {
+        "label": "Audit Log",
+        "permissions": {
+            "audit.view": "View the access audit log",
+        },
+    },
 }
 
 
+"""
+Stable bit position of every permission key.
+
+Roles store their granted permissions as a bitmask (Role.permission_mask)
+built from these positions, so they are persisted data:
+APPEND ONLY — never renumber, and never reuse the position of a retired key.
+"""
+PERMISSION_BITS = {
+    "companies.view": 0,
+    "companies.edit": 1,
+
+    "members.view": 2,
+    "members.invite": 3,
+    "members.remove": 4,
+
+    "roles.view": 5,
+    "roles.create": 6,
+    "roles.edit": 7,
+    "roles.delete": 8,
+    "roles.assign": 9,
+
+    "items.view": 10,
+    "items.create": 11,
+    "items.edit": 12,
+    "items.delete": 13,
+
+    "audit.view": 14,
+}
+
+# Role.permission_mask is a signed 64-bit column
+MAX_PERMISSION_BITS = 63
+
+
 """
 Helper that runs in migration file
 so whenver a new db created we have same
 permissions consistent in different environments.
+After that the table is kept in sync on every `migrate` and
+at startup by access.services.catalog, whose in-memory registry
+is built from it too (no new migration needed).
 """
-def iter_permissions():
-    for module in PERMISSION_CATALOG.values():
+def iter_permissions(catalog=PERMISSION_CATALOG):
+    for module in catalog.values():
         for key, desc in module["permissions"].items():
-            yield key, desc
\ No newline at end of file
+            yield key, desc
+
+
+def _validate_permission_bits():
+    missing = [key for key, _ in iter_permissions() if key not in PERMISSION_BITS]
+    if missing:
+        raise ImproperlyConfigured(f"Permissions without a bit position in PERMISSION_BITS: {missing}")
+    positions = list(PERMISSION_BITS.values())
+    if len(set(positions)) != len(positions):
+        raise ImproperlyConfigured("PERMISSION_BITS positions must be unique.")
+    if max(positions) >= MAX_PERMISSION_BITS:
+        raise ImproperlyConfigured(f"PERMISSION_BITS positions must be below {MAX_PERMISSION_BITS}.")
+
+
+_validate_permission_bits()
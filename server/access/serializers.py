@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Role, Membership, Permission
+from .models import AccessAuditEvent, Role, Membership, Permission
 
 
 class PermissionSerializer(serializers.ModelSerializer):
@@ -24,7 +24,33 @@ class RoleDetailSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'is_system', 'permissions']
 
     def get_permissions(self, obj):
-        perms = Permission.objects.filter(permission_roles__role=obj)
+        # Reads the `role_permissions__permission` prefetch when the view provides it
+        perms = sorted((rp.permission for rp in obj.role_permissions.all()), key=lambda p: p.key)
+        return PermissionSerializer(perms, many=True).data
+
+
+class RoleListSerializer(RoleSerializer):
+    """
+    Role list with opt-in expansions: ?include=permissions,member_count
+    Fields not requested through context['include'] are dropped.
+    """
+    INCLUDE_FIELDS = ('permissions', 'member_count')
+
+    permissions = serializers.SerializerMethodField()
+    member_count = serializers.IntegerField(read_only=True)
+
+    class Meta(RoleSerializer.Meta):
+        fields = RoleSerializer.Meta.fields + ['permissions', 'member_count']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        include = self.context.get('include', ())
+        for name in self.INCLUDE_FIELDS:
+            if name not in include:
+                self.fields.pop(name)
+
+    def get_permissions(self, obj):
+        perms = sorted((rp.permission for rp in obj.role_permissions.all()), key=lambda p: p.key)
         return PermissionSerializer(perms, many=True).data
 
 
@@ -39,5 +65,14 @@ class TeamMemberSerializer(serializers.ModelSerializer):
         fields = ['id', 'user_id', 'username', 'email', 'is_active', 'joined_at', 'roles']
 
     def get_roles(self, obj):
-        roles = Role.objects.filter(assigned_memberships__membership=obj)
-        return RoleSerializer(roles, many=True).data
\ No newline at end of file
+        # Reads the `membership_roles__role` prefetch when the view provides it
+        roles = sorted((mr.role for mr in obj.membership_roles.all()), key=lambda r: r.name)
+        return RoleSerializer(roles, many=True).data
+
+
+class AccessAuditEventSerializer(serializers.ModelSerializer):
+    actor_username = serializers.CharField(source='actor.username', read_only=True, default=None)
+
+    class Meta:
+        model = AccessAuditEvent
+        fields = ['id', 'timestamp', 'action', 'actor_id', 'actor_username', 'target_type', 'target_id', 'data']
@@ -0,0 +1,162 @@
+"""
+Access-change audit trail with a batched writer.
+
+Views call `record(request, company, action, ...)`. Events are not inserted
+where they happen:
+
+    1. Each event is queued with transaction.on_commit, so an event only
+       exists if the change it describes was committed.
+    2. Inside a request AuditMiddleware opened (`open_buffer()`), the commit
+       appends to the request's buffer and the middleware hands it to
+       `flush()` once the response is built — ONE bulk INSERT per request,
+       however many events. Anywhere else (commands, batch jobs, commits
+       after the flush) the commit dispatches the event on its own.
+    3. With ACCESS_AUDIT["BACKGROUND"] on, flush() only enqueues and a daemon
+       thread writes the events in batches, taking the insert off the request
+       path entirely (pending events are written at interpreter exit).
+"""
+import atexit
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from access.models import AccessAuditEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BACKGROUND': False,
+    'FLUSH_INTERVAL': 1.0,
+    'MAX_BATCH': 500,
+}
+
+BUFFER_ATTR = '_audit_events'
+
+
+def _config(name):
+    return getattr(settings, 'ACCESS_AUDIT', {}).get(name, DEFAULTS[name])
+
+
+def _http_request(request):
+    return getattr(request, '_request', request)
+
+
+def record(request, company, action, target=None, target_type='', **data):
+    """
+    Queues one audit event for `company` (instance or id), attributed to request.user.
+    `request` may be None outside HTTP; the event then has no actor.
+
+    target: model instance (type/id taken from it) or a bare id with `target_type`.
+    data:   JSON-serializable details of the change.
+    """
+    http_request = _http_request(request)
+    user = getattr(http_request, 'user', None)
+
+    if target is not None and hasattr(target, '_meta'):
+        target_type, target = target._meta.model_name, target.pk
+
+    event = AccessAuditEvent(
+        company_id=getattr(company, 'pk', company),
+        actor_id=user.pk if user is not None and user.is_authenticated else None,
+        action=action,
+        target_type=target_type,
+        target_id=target,
+        data=data,
+    )
+
+    def on_commit():
+        buffer = getattr(http_request, BUFFER_ATTR, None)
+        if buffer is None:
+            _dispatch([event])
+        else:
+            buffer.append(event)
+
+    transaction.on_commit(on_commit)
+
+
+def write_events(events):
+    """Bulk-inserts events (used by flush, the background writer and batch jobs)."""
+    if events:
+        AccessAuditEvent.objects.bulk_create(events, batch_size=_config('MAX_BATCH'))
+
+
+def _dispatch(events):
+    if _config('BACKGROUND'):
+        background_writer.submit(events)
+    else:
+        write_events(events)
+
+
+def open_buffer(request):
+    """Collects the request's committed events until `flush()` (called by AuditMiddleware)."""
+    setattr(_http_request(request), BUFFER_ATTR, [])
+
+
+def flush(request):
+    """
+    Writes (or hands to the background writer) every committed event of the
+    request and closes its buffer, so later commits dispatch on their own.
+    """
+    http_request = _http_request(request)
+    events = getattr(http_request, BUFFER_ATTR, None)
+    setattr(http_request, BUFFER_ATTR, None)
+    if events:
+        _dispatch(events)
+
+
+class BackgroundWriter:
+    """Daemon thread draining a queue of events into batched bulk inserts."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, events):
+        self._ensure_started()
+        for event in events:
+            self._queue.put(event)
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='access-audit-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.drain)
+
+    def _take_batch(self, timeout):
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=timeout))
+            while len(batch) < _config('MAX_BATCH'):
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _write(self, batch):
+        try:
+            write_events(batch)
+        except Exception:
+            logger.exception('Failed to write %d audit event(s)', len(batch))
+        finally:
+            close_old_connections()
+
+    def _run(self):
+        while True:
+            batch = self._take_batch(timeout=_config('FLUSH_INTERVAL'))
+            if batch:
+                self._write(batch)
+
+    def drain(self):
+        """Writes everything still queued (at exit, or from tests)."""
+        while batch := self._take_batch(timeout=0):
+            self._write(batch)
+
+
+background_writer = BackgroundWriter()
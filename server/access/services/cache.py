@@ -0,0 +1,102 @@
+"""
+Cross-request cache for membership permission masks.
+
+Two tiers:
+    1. In-process LRU — no I/O at all, bounded by LOCAL_MAXSIZE entries.
+    2. Django cache backend — shared between workers/processes.
+
+Entries are keyed by (user id, company id) and hold
+(membership id, mask, access_version). The tenant resolver reads the entry
+before touching the database and only trusts it while the version matches the
+company's current `access_version`. Any write that changes who can do what in
+a company bumps that version (see `bump_access_version`), so a stale entry is
+reloaded on its next read and overwritten.
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+DEFAULTS = {
+    'ALIAS': 'default',
+    'LOCAL_MAXSIZE': 4096,
+    'TIMEOUT': 60 * 60,
+    'KEY_PREFIX': 'access:mask',
+}
+
+
+def _config(name):
+    return getattr(settings, 'ACCESS_PERMISSION_CACHE', {}).get(name, DEFAULTS[name])
+
+
+class PermissionCache:
+    """
+    LRU in front of the Django cache backend.
+
+    Counters (per process):
+        hits         – served from the in-process LRU
+        shared_hits  – served from the Django cache backend (then promoted to the LRU)
+        misses       – had to be loaded from the database
+        evictions    – LRU entries dropped to respect LOCAL_MAXSIZE
+    """
+
+    def __init__(self):
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'evictions': 0}
+
+    @staticmethod
+    def make_key(user_id, company_id) -> str:
+        return f"{_config('KEY_PREFIX')}:{user_id}:{company_id}"
+
+    @property
+    def backend(self):
+        return caches[_config('ALIAS')]
+
+    def get(self, user_id, company_id):
+        key = self.make_key(user_id, company_id)
+
+        with self._lock:
+            if key in self._local:
+                self._local.move_to_end(key)
+                self._stats['hits'] += 1
+                return self._local[key]
+
+        value = self.backend.get(key)
+        if value is None:
+            with self._lock:
+                self._stats['misses'] += 1
+            return None
+
+        with self._lock:
+            self._stats['shared_hits'] += 1
+        self._remember(key, value)
+        return value
+
+    def set(self, user_id, company_id, value):
+        key = self.make_key(user_id, company_id)
+        self.backend.set(key, value, _config('TIMEOUT'))
+        self._remember(key, value)
+
+    def _remember(self, key, value):
+        maxsize = _config('LOCAL_MAXSIZE')
+        with self._lock:
+            self._local[key] = value
+            self._local.move_to_end(key)
+            while len(self._local) > maxsize:
+                self._local.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, 'local_size': len(self._local)}
+
+    def clear(self):
+        """Drops the in-process tier and resets counters. Shared entries expire on their own."""
+        with self._lock:
+            self._local.clear()
+            self._stats = dict.fromkeys(self._stats, 0)
+
+
+permission_cache = PermissionCache()
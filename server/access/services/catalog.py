@@ -0,0 +1,157 @@
+"""
+In-memory permission catalog.
+
+The catalog is code (access.permissions.PERMISSION_CATALOG) and only changes at
+deploy, so it is built once per process, when AccessConfig.ready imports this
+module, and served from memory. The `permissions` table is kept in line with it
+by `sync()`, which inserts new keys and refreshes changed descriptions:
+
+    post_migrate        after every `migrate`
+    request_started     once per process, on its first request — a deploy that
+                        skipped `migrate` is still synced before any lookup, and
+                        the {key: id} map is warm when the first view needs it.
+                        Not in ready(): that also runs for management commands,
+                        before `migrate` has created the table.
+    `ids`               lazily, if keys are still missing
+
+Keys removed from code are left in the table: roles may still reference them.
+"""
+import hashlib
+import json
+import logging
+import threading
+
+from django.core.signals import request_started
+
+from access.permissions import PERMISSION_CATALOG, iter_permissions
+
+logger = logging.getLogger(__name__)
+
+SYNC_ON_FIRST_REQUEST = 'access.sync_on_first_request'
+
+
+class PermissionRegistry:
+
+    def __init__(self, catalog):
+        self.modules = [
+            {'module': module, 'label': spec['label'], 'keys': list(spec['permissions'])}
+            for module, spec in catalog.items()
+        ]
+        self.descriptions = dict(iter_permissions(catalog))
+        self._ids = None
+        self._payloads = {}
+        self._lock = threading.RLock()
+
+    # ── Database sync ────────────────────────────────────────────────────────
+
+    def sync(self, using='default'):
+        """
+        Idempotent diff-sync of the permissions table against the catalog.
+        Returns {"created": [keys], "updated": [keys]}.
+        """
+        from access.models import Permission
+
+        existing = {p.key: p for p in Permission.objects.using(using).all()}
+
+        created = [
+            Permission(key=key, description=description)
+            for key, description in self.descriptions.items()
+            if key not in existing
+        ]
+        updated = []
+        for key, description in self.descriptions.items():
+            permission = existing.get(key)
+            if permission is not None and permission.description != description:
+                permission.description = description
+                updated.append(permission)
+
+        if created:
+            Permission.objects.using(using).bulk_create(created, ignore_conflicts=True)
+        if updated:
+            Permission.objects.using(using).bulk_update(updated, ['description'])
+
+        retired = sorted(set(existing) - set(self.descriptions))
+        if retired:
+            logger.warning('Permissions no longer in the catalog: %s', retired)
+
+        if created or updated:
+            self.reset()
+        return {'created': [p.key for p in created], 'updated': [p.key for p in updated]}
+
+    def reset(self):
+        with self._lock:
+            self._ids = None
+            self._payloads = {}
+
+    # ── Lookups ──────────────────────────────────────────────────────────────
+
+    @property
+    def ids(self) -> dict:
+        """{key: permission_id}, loaded on first use (one query, or a sync when keys are missing)."""
+        if self._ids is None:
+            from access.models import Permission
+
+            with self._lock:
+                if self._ids is None:
+                    rows = Permission.objects.filter(key__in=self.descriptions).values_list('key', 'id')
+                    ids = dict(rows)
+                    if len(ids) < len(self.descriptions):
+                        self.sync()
+                        ids = dict(rows.all())
+                    self._ids = ids
+        return self._ids
+
+    def permission(self, key) -> dict:
+        return {'id': self.ids[key], 'key': key, 'description': self.descriptions[key]}
+
+    # ── Serialized catalog ───────────────────────────────────────────────────
+
+    def payload(self, grouped=False):
+        """
+        (data, etag) for the catalog endpoint, computed once per process.
+
+        flat:    [{"id", "key", "description"}, ...] ordered by key
+        grouped: [{"module", "label", "permissions": [...]}, ...] in catalog order
+        """
+        cached = self._payloads.get(grouped)
+        if cached is None:
+            if grouped:
+                data = [
+                    {
+                        'module': module['module'],
+                        'label': module['label'],
+                        'permissions': [self.permission(key) for key in module['keys']],
+                    }
+                    for module in self.modules
+                ]
+            else:
+                data = [self.permission(key) for key in sorted(self.descriptions)]
+
+            body = json.dumps(data, sort_keys=True, separators=(',', ':'))
+            cached = self._payloads[grouped] = (data, hashlib.sha256(body.encode()).hexdigest()[:32])
+        return cached
+
+
+permission_registry = PermissionRegistry(PERMISSION_CATALOG)
+
+
+def sync_permission_catalog(sender, using='default', **kwargs):
+    """
+    post_migrate receiver: keeps the permissions table in line with the code catalog.
+    Returns the sync result, or None before the table exists.
+    """
+    from django.db import connections
+
+    if 'permissions' not in connections[using].introspection.table_names():
+        return None
+    result = permission_registry.sync(using=using)
+    if result['created'] or result['updated']:
+        logger.info('Permission catalog synced: %s', result)
+    return result
+
+
+def sync_on_first_request(sender, **kwargs):
+    """request_started receiver: syncs the catalog and loads the id map, once per process."""
+    request_started.disconnect(dispatch_uid=SYNC_ON_FIRST_REQUEST)
+    if sync_permission_catalog(sender) is not None:
+        permission_registry.ids  # warm: the first view asking for an id doesn't pay the query
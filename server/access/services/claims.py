@@ -0,0 +1,58 @@
+"""
+Company-scoped permission claims carried in the access JWT.
+
+When ACCESS_JWT_PERMISSION_CLAIMS is on, login/refresh embed a compact digest
+
+    "cperms": {"<company_id>": [<permission_mask>, <access_version>], ...}
+
+into the (short-lived) access token. Company endpoints then authorize from the
+claim instead of the database (see access/services/tenant.py). A claim whose version no longer matches the
+company's access_version is rejected with 401 so the client refreshes and gets
+a fresh digest. Companies missing from the claim fall back to the DB path.
+"""
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+
+from .permissions import load_user_company_masks
+
+CLAIM_NAME = 'cperms'
+
+
+def claims_enabled() -> bool:
+    return getattr(settings, 'ACCESS_JWT_PERMISSION_CLAIMS', False)
+
+
+def add_permission_claims(token, user_id):
+    """Embeds the per-company permission digest into `token` (no-op when disabled)."""
+    if not claims_enabled():
+        return token
+
+    limit = getattr(settings, 'ACCESS_JWT_PERMISSION_CLAIMS_MAX_COMPANIES', 100)
+    masks = list(load_user_company_masks(user_id).items())[:limit]
+    token[CLAIM_NAME] = {str(company_id): [mask, version] for company_id, (mask, version) in masks}
+    return token
+
+
+def get_claim(request, company_id):
+    """
+    (permission_mask, access_version) claimed for `company_id` by the access token,
+    or None when the token carries no claim for it (mode disabled, company not in
+    the digest). The tenant resolver checks the version against the company.
+    """
+    if not claims_enabled():
+        return None
+
+    token = getattr(request, 'auth', None)
+    digest = token.get(CLAIM_NAME) if token is not None else None
+    if not digest:
+        return None
+
+    claim = digest.get(str(company_id))
+    return tuple(claim) if claim is not None else None
+
+
+def stale_claim():
+    return AuthenticationFailed(
+        'Permissions in the access token are out of date. Refresh the token.',
+        code='permission_claims_stale',
+    )
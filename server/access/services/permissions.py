@@ -1,12 +1,95 @@
-from access.models import Permission
+from functools import reduce
+from operator import or_
 
-def membership_has_perm(membership, perm_key: str) -> bool:
+from django.db.models import F
+
+from access.models import Membership, Role, RolePermission
+from access.permissions import PERMISSION_BITS
+from companies.models import Company
+
+
+# ============================================================================
+# BITMASKS
+# ============================================================================
+
+def permission_bit(perm_key: str) -> int:
+    """Bit of `perm_key` in a permission mask. Unknown keys map to 0 (never granted)."""
+    position = PERMISSION_BITS.get(perm_key)
+    return 0 if position is None else 1 << position
+
+
+def mask_for_keys(perm_keys) -> int:
+    return reduce(or_, (permission_bit(k) for k in perm_keys), 0)
+
+
+def keys_for_mask(mask: int) -> frozenset:
+    return frozenset(key for key, position in PERMISSION_BITS.items() if mask & (1 << position))
+
+
+def mask_has_perm(mask: int, perm_key: str) -> bool:
+    bit = permission_bit(perm_key)
+    return bool(bit) and mask & bit == bit
+
+
+def compute_role_masks(role_ids=None) -> dict:
+    """
+    Builds {role_id: mask} from the relational RolePermission rows (source of truth).
+    Pass `role_ids` to limit the scan; roles without rows are reported as 0.
     """
-    Returns True if membership has `perm_key` through any assigned role.
+    rows = RolePermission.objects.all()
+    if role_ids is not None:
+        role_ids = list(role_ids)
+        rows = rows.filter(role_id__in=role_ids)
+
+    masks = dict.fromkeys(role_ids or (), 0)
+    for role_id, key in rows.values_list('role_id', 'permission__key').iterator():
+        masks[role_id] = masks.get(role_id, 0) | permission_bit(key)
+    return masks
 
-    membership -> MembershipRole -> Role -> RolePermission -> Permission(key)
+
+def recompute_role_mask(role) -> int:
+    """Re-derives `role.permission_mask` from its RolePermission rows and saves it."""
+    role.permission_mask = compute_role_masks([role.pk])[role.pk]
+    Role.objects.filter(pk=role.pk).update(permission_mask=role.permission_mask)
+    return role.permission_mask
+
+
+# ============================================================================
+# MEMBERSHIP MASKS
+# ============================================================================
+
+def load_user_company_masks(user_id) -> dict:
     """
-    return Permission.objects.filter(
-        key=perm_key,
-        permission_roles__role__assigned_memberships__membership=membership,
-    ).exists()
\ No newline at end of file
+    {company_id: (mask, access_version)} for every active membership of the user.
+
+    One grouped query: memberships ⟕ membership_roles ⟕ roles, masks OR-ed per company.
+    Most recently joined companies come first.
+    """
+    rows = (
+        Membership.objects
+        .filter(user_id=user_id, is_active=True)
+        .order_by('-joined_at', '-id')
+        .values_list('company_id', 'company__access_version', 'membership_roles__role__permission_mask')
+    )
+    masks = {}
+    for company_id, version, role_mask in rows:
+        mask, _ = masks.get(company_id, (0, version))
+        masks[company_id] = (mask | (role_mask or 0), version)
+    return masks
+
+
+def bump_access_version(company) -> None:
+    """
+    Invalidates every cached permission set of a company.
+
+    Call inside the same transaction as any write to RolePermission,
+    MembershipRole or Membership.is_active for that company.
+    """
+    bump_access_versions([getattr(company, 'pk', company)])
+
+
+def bump_access_versions(company_ids) -> None:
+    """Batched `bump_access_version` — one UPDATE for any number of companies."""
+    company_ids = list(company_ids)
+    if company_ids:
+        Company.objects.filter(pk__in=company_ids).update(access_version=F('access_version') + 1)
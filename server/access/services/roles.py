@@ -0,0 +1,214 @@
+"""
+Role write paths: set-difference permission updates and batched role cloning.
+"""
+from django.db import transaction
+from django.db.models import Q
+
+from access.models import Permission, Role, RolePermission
+from core.validation import is_id
+
+from .catalog import permission_registry
+from .permissions import bump_access_versions, mask_for_keys
+
+BATCH_SIZE = 1000
+
+
+class RoleDefinitionError(ValueError):
+    """Malformed role definitions in a request body; nothing was written."""
+
+
+def validate_role_definitions(definitions, reserved_names=()) -> list:
+    """
+    Normalizes role definitions sent by clients (bulk clone, company provisioning):
+
+        [{"name", "description"?, "permission_ids"?: [ids], "permission_keys"?: [keys]}]
+      → [{"name", "description", "permission_ids": {ids}, "permission_keys": [keys]}]
+
+    Permissions are checked against the in-memory registry, no query per role.
+    Raises RoleDefinitionError on the first malformed definition.
+    """
+    if not isinstance(definitions, list):
+        raise RoleDefinitionError('roles must be a list of objects.')
+
+    key_by_id = {pid: key for key, pid in permission_registry.ids.items()}
+    roles, seen = [], set()
+    for definition in definitions:
+        if not isinstance(definition, dict):
+            raise RoleDefinitionError('Every role must be an object.')
+
+        name = definition.get('name')
+        name = name.strip() if isinstance(name, str) else ''
+        if not name:
+            raise RoleDefinitionError('Every role needs a name.')
+        if name in reserved_names:
+            raise RoleDefinitionError(f'Reserved role name: {name!r}')
+        if name in seen:
+            raise RoleDefinitionError(f'Duplicate role name {name!r}.')
+        seen.add(name)
+
+        description = definition.get('description') or ''
+        if not isinstance(description, str):
+            raise RoleDefinitionError(f'description of role {name!r} must be a string.')
+
+        ids = definition.get('permission_ids') or []
+        if not isinstance(ids, list) or not all(is_id(pid) for pid in ids):
+            raise RoleDefinitionError(f'permission_ids of role {name!r} must be a list of ids.')
+        keys = definition.get('permission_keys') or []
+        if not isinstance(keys, list) or not all(isinstance(key, str) for key in keys):
+            raise RoleDefinitionError(f'permission_keys of role {name!r} must be a list of keys.')
+
+        unknown = [str(pid) for pid in ids if pid not in key_by_id]
+        unknown += [key for key in keys if key not in permission_registry.ids]
+        if unknown:
+            raise RoleDefinitionError(f'Unknown permissions for role {name!r}: {unknown}')
+
+        keys = list(dict.fromkeys([*(key_by_id[pid] for pid in ids), *keys]))
+        roles.append({
+            'name': name,
+            'description': description.strip(),
+            'permission_ids': {permission_registry.ids[key] for key in keys},
+            'permission_keys': keys,
+        })
+    return roles
+
+
+def resolve_permissions(permission_ids=None, permission_keys=None) -> dict:
+    """
+    {permission_id: key} for the given ids and/or keys (one query).
+    Unknown ids/keys are silently dropped — compare lengths to detect them.
+    """
+    ids, keys = set(permission_ids or ()), set(permission_keys or ())
+    if not ids and not keys:
+        return {}
+    rows = Permission.objects.filter(Q(id__in=ids) | Q(key__in=keys))
+    return dict(rows.values_list('id', 'key'))
+
+
+def set_role_permissions(role, permission_ids) -> dict:
+    """
+    Makes the role grant exactly `permission_ids`, touching only the rows that differ:
+    inserts additions, deletes removals, leaves the rest alone.
+
+    Updates `role.permission_mask` when anything changed. Returns the delta
+    {"added": [ids], "removed": [ids]}. The caller bumps the company access version.
+    """
+    wanted = resolve_permissions(permission_ids)
+    current = set(RolePermission.objects.filter(role=role).values_list('permission_id', flat=True))
+
+    added = sorted(set(wanted) - current)
+    removed = sorted(current - set(wanted))
+
+    if removed:
+        RolePermission.objects.filter(role=role, permission_id__in=removed).delete()
+    if added:
+        RolePermission.objects.bulk_create([
+            RolePermission(role=role, permission_id=pid) for pid in added
+        ])
+    if added or removed:
+        role.permission_mask = mask_for_keys(wanted.values())
+        Role.objects.filter(pk=role.pk).update(permission_mask=role.permission_mask)
+
+    return {'added': added, 'removed': removed}
+
+
+@transaction.atomic
+def clone_roles(definitions, company_ids, on_conflict='skip') -> list:
+    """
+    Copies role definitions into many companies with a fixed number of queries.
+
+    definitions: [{"name", "description", "permission_ids": {ids}}] — ids already validated.
+    on_conflict: what to do when a company already has a role with that name
+        "skip"   – leave it untouched
+        "update" – sync description + permissions to the definition (system roles are always skipped)
+
+    Returns one outcome row per (company, role):
+        {"company_id", "name", "role_id", "status": created|updated|unchanged|skipped}
+    """
+    company_ids = list(dict.fromkeys(company_ids))
+    by_name = {d['name']: d for d in definitions}
+    perm_keys = resolve_permissions(set().union(*(d['permission_ids'] for d in definitions)))
+    masks = {
+        name: mask_for_keys(perm_keys[pid] for pid in d['permission_ids'])
+        for name, d in by_name.items()
+    }
+
+    existing = {
+        (role.company_id, role.name): role
+        for role in Role.objects.filter(company_id__in=company_ids, name__in=by_name)
+    }
+
+    # ── New roles ────────────────────────────────────────────────────────────
+    new_roles = Role.objects.bulk_create([
+        Role(
+            company_id=company_id,
+            name=name,
+            description=d['description'],
+            permission_mask=masks[name],
+        )
+        for company_id in company_ids
+        for name, d in by_name.items()
+        if (company_id, name) not in existing
+    ], batch_size=BATCH_SIZE)
+
+    rows_to_add = [
+        RolePermission(role_id=role.pk, permission_id=pid)
+        for role in new_roles
+        for pid in by_name[role.name]['permission_ids']
+    ]
+
+    # ── Existing roles ───────────────────────────────────────────────────────
+    outcomes = {}
+    to_update = []
+    if on_conflict == 'update':
+        to_update = [role for role in existing.values() if not role.is_system]
+
+    if to_update:
+        current = {}
+        for row_id, role_id, pid in RolePermission.objects.filter(
+            role_id__in=[r.pk for r in to_update],
+        ).values_list('id', 'role_id', 'permission_id'):
+            current.setdefault(role_id, {})[pid] = row_id
+
+        rows_to_delete, changed_roles = [], []
+        for role in to_update:
+            d = by_name[role.name]
+            have = current.get(role.pk, {})
+            added = d['permission_ids'] - set(have)
+            removed = set(have) - d['permission_ids']
+
+            rows_to_add += [RolePermission(role_id=role.pk, permission_id=pid) for pid in added]
+            rows_to_delete += [have[pid] for pid in removed]
+
+            if added or removed or role.description != d['description']:
+                role.description = d['description']
+                role.permission_mask = masks[role.name]
+                changed_roles.append(role)
+                outcomes[(role.company_id, role.name)] = 'updated'
+            else:
+                outcomes[(role.company_id, role.name)] = 'unchanged'
+
+        if rows_to_delete:
+            RolePermission.objects.filter(pk__in=rows_to_delete).delete()
+        if changed_roles:
+            Role.objects.bulk_update(changed_roles, ['description', 'permission_mask'], batch_size=BATCH_SIZE)
+
+    RolePermission.objects.bulk_create(rows_to_add, batch_size=BATCH_SIZE)
+
+    touched = {role.company_id for role in new_roles}
+    touched |= {company_id for (company_id, _), status in outcomes.items() if status == 'updated'}
+    bump_access_versions(touched)
+
+    results = [
+        {'company_id': role.company_id, 'name': role.name, 'role_id': role.pk, 'status': 'created'}
+        for role in new_roles
+    ]
+    results += [
+        {
+            'company_id': company_id,
+            'name': name,
+            'role_id': role.pk,
+            'status': outcomes.get((company_id, name), 'skipped'),
+        }
+        for (company_id, name), role in existing.items()
+    ]
+    return sorted(results, key=lambda r: (r['company_id'], r['name']))
@@ -0,0 +1,114 @@
+"""
+Tenant context for /companies/<company_id>/ routes.
+
+Resolves company + the requester's active membership + their permission mask
+once per request and keeps the result on the request, so every app (access,
+items, invites, companies) shares it instead of running its own company and
+membership lookups.
+
+The permission mask comes from, in order:
+    1. the access-token claim for the company (access/services/claims.py)
+    2. the cross-request permission cache (access/services/cache.py)
+    3. memberships ⋈ companies ⟕ membership_roles ⟕ roles, one query
+
+Both 1 and 2 only need the company row, read by primary key, to check their
+access_version — a match means the membership was still active with that
+mask, since deactivations and role changes bump the version. A stale claim is
+a 401 (the client refreshes its token); a stale cache entry falls through to 3.
+The membership row itself is loaded only if a view asks for it.
+"""
+from dataclasses import dataclass
+from functools import cached_property, reduce
+from operator import or_
+
+from django.db.models import F
+from django.http import Http404
+
+from access.models import Membership
+from companies.models import Company
+
+from .cache import permission_cache
+from .claims import get_claim, stale_claim
+
+
+def _not_found():
+    return Http404('No Company matches the given query.')
+
+
+@dataclass(frozen=True)
+class TenantContext:
+    company: Company
+    perm_mask: int
+    user_id: int
+    membership_id: int | None = None
+
+    @cached_property
+    def membership(self) -> Membership:
+        memberships = Membership.objects.filter(company=self.company, user_id=self.user_id, is_active=True)
+        if self.membership_id is not None:
+            memberships = memberships.filter(pk=self.membership_id)
+        membership = memberships.first()
+        if membership is None:
+            raise _not_found()
+        membership.company = self.company
+        return membership
+
+
+def _load(user_id, company_id) -> TenantContext:
+    """memberships ⋈ companies ⟕ membership_roles ⟕ roles — one row per assigned role."""
+    rows = list(
+        Membership.objects
+        .select_related('company')
+        .filter(company_id=company_id, user_id=user_id, is_active=True)
+        .annotate(role_mask=F('membership_roles__role__permission_mask'))
+        .order_by()
+    )
+    if not rows:
+        raise _not_found()
+
+    membership = rows[0]
+    mask = reduce(or_, (row.role_mask or 0 for row in rows), 0)
+    permission_cache.set(user_id, membership.company.pk, (membership.pk, mask, membership.company.access_version))
+
+    tenant = TenantContext(company=membership.company, perm_mask=mask, user_id=user_id, membership_id=membership.pk)
+    tenant.__dict__['membership'] = membership  # already loaded, skip the lazy query
+    return tenant
+
+
+def resolve_tenant(request, company_id) -> TenantContext:
+    """
+    Raises Http404 if the company doesn't exist or the user is not an active member,
+    AuthenticationFailed (401) if the token's permission claim is out of date.
+    """
+    user_id = request.user.pk
+    claim = get_claim(request, company_id)
+    cached = None if claim is not None else permission_cache.get(user_id, company_id)
+    if claim is None and cached is None:
+        return _load(user_id, company_id)
+
+    company = Company.objects.filter(pk=company_id).first()
+    if company is None:
+        raise _not_found()
+
+    if claim is not None:
+        mask, version = claim
+        if version != company.access_version:
+            raise stale_claim()
+        return TenantContext(company=company, perm_mask=mask, user_id=user_id)
+
+    membership_id, mask, version = cached
+    if version != company.access_version:
+        return _load(user_id, company_id)
+    return TenantContext(company=company, perm_mask=mask, user_id=user_id, membership_id=membership_id)
+
+
+def get_tenant(request, company_id) -> TenantContext:
+    """
+    Returns the tenant context already resolved for this request, resolving it
+    on first use. Pass the DRF request so the token's claims are visible.
+    """
+    http_request = getattr(request, '_request', request)
+    tenant = http_request.__dict__.get('_tenant')
+    if tenant is None or str(tenant.company.pk) != str(company_id):
+        tenant = http_request._tenant = http_request.tenant = resolve_tenant(request, company_id)
+    return tenant
@@ -1 +1,608 @@
-from django.test import TestCase
\ No newline at end of file
+import importlib
+from io import StringIO
+from unittest import mock
+
+from django.apps import apps
+from django.core.management import CommandError, call_command
+from django.core.signals import request_started
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from access.models import AccessAuditEvent, Membership, MembershipRole, Permission, Role, RolePermission
+from access.permissions import iter_permissions
+from access.services import audit
+from access.services.catalog import SYNC_ON_FIRST_REQUEST, permission_registry, sync_on_first_request
+from access.services.claims import add_permission_claims
+from access.services.permissions import bump_access_version, mask_for_keys, permission_bit, recompute_role_mask
+from companies.models import Company
+from core.testing import CompanyFixturesMixin
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.models import User
+
+
+class AccessFixturesMixin(CompanyFixturesMixin):
+    """Members and roles on top of the owner + company fixture."""
+
+    def add_members(self, count, roles=()):
+        start = User.objects.count()
+        users = User.objects.bulk_create([
+            User(username=f'member{start + i}', email=f'member{start + i}@example.com')
+            for i in range(count)
+        ])
+        memberships = Membership.objects.bulk_create([
+            Membership(user=user, company=self.company) for user in users
+        ])
+        MembershipRole.objects.bulk_create([
+            MembershipRole(membership=membership, role=role)
+            for membership in memberships for role in roles
+        ])
+        return memberships
+
+    def add_roles(self, count, permissions_per_role=3):
+        permissions = list(Permission.objects.all()[:permissions_per_role])
+        start = Role.objects.count()
+        roles = Role.objects.bulk_create([
+            Role(company=self.company, name=f'Role {start + i}') for i in range(count)
+        ])
+        RolePermission.objects.bulk_create([
+            RolePermission(role=role, permission=permission)
+            for role in roles for permission in permissions
+        ])
+        for role in roles:
+            recompute_role_mask(role)
+        return roles
+
+
+class AccessTestCase(AccessFixturesMixin, TestCase):
+    pass
+
+
+class TeamListQueryCountTests(AccessTestCase):
+    """
+    tenant context + memberships page + membership_roles prefetch + roles prefetch
+    (+ one COUNT(*) when a total is asked for, explicitly or via legacy ?page=)
+    """
+    QUERIES = 4
+
+    def test_team_page_costs_fixed_queries_regardless_of_page_size(self):
+        roles = self.add_roles(2)
+        self.add_members(30, roles=roles)
+        url = f'/api/access/companies/{self.company.id}/team/'
+
+        for page_size in (2, 10, 31):
+            with self.subTest(page_size=page_size), self.assertNumQueries(self.QUERIES):
+                response = self.client.get(url, {'page_size': page_size})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.json())
+
+    def test_total_and_page_number_mode_add_one_count_query(self):
+        self.add_members(5, roles=self.add_roles(1))
+        url = f'/api/access/companies/{self.company.id}/team/'
+
+        for params in ({'include_total': 'true'}, {'page': 2, 'page_size': 2}):
+            with self.subTest(params=params), self.assertNumQueries(self.QUERIES + 1):
+                response = self.client.get(url, params)
+            self.assertEqual(response.json()['count'], 6)
+
+    def test_team_member_roles_come_from_prefetch(self):
+        roles = self.add_roles(2)
+        self.add_members(3, roles=roles)
+
+        response = self.client.get(f'/api/access/companies/{self.company.id}/team/')
+
+        members = [m for m in response.json()['results'] if m['username'].startswith('member')]
+        self.assertEqual(len(members), 3)
+        for member in members:
+            self.assertEqual([r['name'] for r in member['roles']], sorted(r.name for r in roles))
+
+
+class TeamKeysetPaginationTests(AccessTestCase):
+
+    def walk(self, url, direction='next'):
+        pages = []
+        while url:
+            body = self.client.get(url).json()
+            pages.append([m['id'] for m in body['results']])
+            url = body[direction]
+        return pages
+
+    def test_cursor_walk_visits_every_member_once_newest_first(self):
+        self.add_members(11)
+        expected = list(
+            Membership.objects.filter(company=self.company)
+            .order_by('-joined_at', '-id').values_list('id', flat=True)
+        )
+
+        pages = self.walk(f'/api/access/companies/{self.company.id}/team/?page_size=5')
+
+        self.assertEqual([len(p) for p in pages], [5, 5, 2])
+        self.assertEqual([i for page in pages for i in page], expected)
+
+    def test_previous_links_walk_back_to_the_first_page(self):
+        self.add_members(11)
+        url = f'/api/access/companies/{self.company.id}/team/?page_size=5'
+        forward = self.walk(url)
+
+        last = self.client.get(url).json()
+        while last['next']:
+            last = self.client.get(last['next']).json()
+        backward = self.walk(last['previous'], direction='previous')
+
+        self.assertEqual(backward, forward[-2::-1])
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get(f'/api/access/companies/{self.company.id}/team/', {'cursor': 'nope'})
+        self.assertEqual(response.status_code, 404)
+
+
+class TeamFilterTests(AccessTestCase):
+
+    def usernames(self, **params):
+        response = self.client.get(f'/api/access/companies/{self.company.id}/team/', params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(m['username'] for m in response.json()['results'])
+
+    def test_search_matches_username_or_email_substring(self):
+        members = self.add_members(3)
+        target = members[1].user
+        target.email = 'Finance.Lead@Example.com'
+        target.save(update_fields=['email'])
+
+        self.assertEqual(self.usernames(search='finance'), [target.username])
+        self.assertEqual(self.usernames(search=target.username[:4].upper()), sorted(
+            m.user.username for m in members
+        ))
+        self.assertEqual(self.usernames(search='owner'), ['owner'])
+
+    def test_role_filter_is_a_semi_join(self):
+        role_a, role_b = self.add_roles(2)
+        with_a = self.add_members(2, roles=[role_a])
+        both = self.add_members(1, roles=[role_a, role_b])
+
+        self.assertEqual(
+            self.usernames(role=role_a.id),
+            sorted(m.user.username for m in with_a + both),
+        )
+        self.assertEqual(self.usernames(role=role_b.id), [both[0].user.username])
+
+        response = self.client.get(f'/api/access/companies/{self.company.id}/team/', {'role': 'x'})
+        self.assertEqual(response.status_code, 400)
+
+
+class RoleListQueryCountTests(AccessTestCase):
+
+    def test_plain_role_list(self):
+        self.add_roles(10)
+        # tenant context + roles
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/access/companies/{self.company.id}/roles/')
+        self.assertEqual(len(response.json()), 11)
+        self.assertNotIn('permissions', response.json()[0])
+        self.assertNotIn('member_count', response.json()[0])
+
+    def test_included_permissions_and_member_count_cost_fixed_queries(self):
+        url = f'/api/access/companies/{self.company.id}/roles/'
+        for role_count in (1, 20):
+            roles = self.add_roles(role_count, permissions_per_role=4)
+            self.add_members(2, roles=roles[:1])
+            # tenant context + annotated roles + role_permissions⋈permissions prefetch
+            with self.subTest(role_count=role_count), self.assertNumQueries(3):
+                response = self.client.get(url, {'include': 'permissions,member_count'})
+            self.assertEqual(response.status_code, 200)
+
+    def test_member_count_counts_active_members_only(self):
+        role = self.add_roles(1)[0]
+        active, inactive = self.add_members(2, roles=[role])
+        inactive.is_active = False
+        inactive.save(update_fields=['is_active'])
+
+        response = self.client.get(
+            f'/api/access/companies/{self.company.id}/roles/', {'include': 'member_count,permissions'},
+        )
+
+        row = next(r for r in response.json() if r['id'] == role.id)
+        self.assertEqual(row['member_count'], 1)
+        self.assertEqual(len(row['permissions']), 3)
+
+
+class RoleDetailQueryCountTests(AccessTestCase):
+
+    def test_role_detail_costs_fixed_queries_regardless_of_permission_count(self):
+        owner_role = Role.objects.get(company=self.company, name='Owner')
+        small_role = self.add_roles(1, permissions_per_role=1)[0]
+
+        for role in (small_role, owner_role):
+            # tenant context + role + role_permissions⋈permissions prefetch
+            with self.subTest(role=role.name), self.assertNumQueries(3):
+                response = self.client.get(f'/api/access/companies/{self.company.id}/roles/{role.id}/')
+            self.assertEqual(response.status_code, 200)
+
+
+class BulkMemberRolesTests(AccessTestCase):
+    def assign(self, assignments):
+        return self.client.post(
+            f'/api/access/companies/{self.company.id}/team/roles/', {'assignments': assignments}, format='json',
+        )
+
+    def test_malformed_rows_are_reported_per_row(self):
+        role = self.add_roles(1)[0]
+        member = self.add_members(1)[0]
+
+        response = self.assign([
+            {'membership_id': member.id, 'role_ids': 5},
+            {'membership_id': [1], 'role_ids': [role.id]},
+            {'membership_id': member.id, 'role_ids': [{}]},
+            'x',
+            {'membership_id': member.id, 'role_ids': [role.id]},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body['error'], body['updated']), (4, 1))
+        self.assertEqual([row['status'] for row in body['results']], ['error'] * 4 + ['updated'])
+        self.assertEqual(list(member.membership_roles.values_list('role_id', flat=True)), [role.id])
+
+
+class PermissionMaskTests(AccessTestCase):
+    def owner_role(self):
+        return Role.objects.get(company=self.company, name='Owner', is_system=True)
+
+    def assertMasksConsistent(self):
+        out = StringIO()
+        call_command('check_permission_masks', stdout=out)
+        self.assertIn('consistent', out.getvalue())
+
+    def test_drift_is_reported_and_repaired(self):
+        self.assertMasksConsistent()
+        role = self.owner_role()
+        expected = role.permission_mask
+        Role.objects.filter(pk=role.pk).update(permission_mask=0)
+
+        version = Company.objects.get(pk=self.company.pk).access_version
+
+        with self.assertRaises(CommandError):
+            call_command('check_permission_masks', stdout=StringIO())
+        call_command('check_permission_masks', '--repair', stdout=StringIO())
+
+        self.assertEqual(self.owner_role().permission_mask, expected)
+        # Cached masks of the company are invalidated
+        self.assertEqual(Company.objects.get(pk=self.company.pk).access_version, version + 1)
+        self.assertMasksConsistent()
+
+    def test_role_patch_stores_the_new_mask(self):
+        role, = self.add_roles(1, permissions_per_role=0)
+        url = f'/api/access/companies/{self.company.id}/roles/{role.id}/'
+        view, edit = Permission.objects.get(key='items.view'), Permission.objects.get(key='items.edit')
+
+        response = self.client.patch(url, {'permission_ids': [view.id, edit.id]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        role.refresh_from_db()
+        self.assertEqual(role.permission_mask, mask_for_keys(['items.view', 'items.edit']))
+
+        self.client.patch(url, {'permission_ids': [edit.id]}, format='json')
+        role.refresh_from_db()
+        self.assertEqual(role.permission_mask, mask_for_keys(['items.edit']))
+        self.assertMasksConsistent()
+
+    def test_backfill_migrations(self):
+        backfill = importlib.import_module('access.migrations.0005_backfill_role_permission_mask')
+        Role.objects.update(permission_mask=0)
+        backfill.backfill_permission_masks(apps, None)
+        self.assertMasksConsistent()
+
+        grant = importlib.import_module('access.migrations.0008_grant_audit_view_to_owners')
+        role = self.owner_role()
+        RolePermission.objects.filter(role=role, permission__key='audit.view').delete()
+        recompute_role_mask(role)
+        version = Company.objects.get(pk=self.company.pk).access_version
+
+        grant.grant_audit_view(apps, None)
+
+        role = self.owner_role()
+        self.assertTrue(role.role_permissions.filter(permission__key='audit.view').exists())
+        self.assertTrue(role.permission_mask & permission_bit('audit.view'))
+        self.assertEqual(Company.objects.get(pk=self.company.pk).access_version, version + 1)
+        self.assertMasksConsistent()
+
+
+class RoleBulkCloneTests(AccessTestCase):
+    url = '/api/access/roles/bulk-clone/'
+
+    def clone(self, roles, **extra):
+        return self.client.post(self.url, {'company_ids': [self.company.id], 'roles': roles, **extra}, format='json')
+
+    def test_clones_definitions_by_id_and_key(self):
+        view = Permission.objects.get(key='items.view')
+
+        response = self.clone([
+            {'name': 'Viewer', 'permission_ids': [view.id]},
+            {'name': 'Editor', 'permission_keys': ['items.view', 'items.edit']},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['created'], 2)
+        editor = Role.objects.get(company=self.company, name='Editor')
+        self.assertEqual(
+            sorted(editor.role_permissions.values_list('permission__key', flat=True)), ['items.edit', 'items.view'],
+        )
+
+    def test_malformed_definitions_are_400(self):
+        for roles in (
+            ['x'],
+            [{'name': 'A', 'permission_ids': 'abc'}],
+            [{'name': 'A', 'permission_ids': [{}]}],
+            [{'name': 'A', 'permission_keys': 'items.view'}],
+            [{'name': 'A', 'permission_keys': ['no.such']}],
+            [{'name': 'A'}, {'name': 'A'}],
+            [{'name': 7}],
+        ):
+            with self.subTest(roles=roles):
+                self.assertEqual(self.clone(roles).status_code, 400)
+        self.assertFalse(Role.objects.filter(company=self.company, name='A').exists())
+
+    def test_malformed_company_ids_are_400(self):
+        for company_ids in ([], [True], [self.company.id, 'x'], self.company.id):
+            with self.subTest(company_ids=company_ids):
+                response = self.client.post(
+                    self.url, {'company_ids': company_ids, 'roles': [{'name': 'A'}]}, format='json',
+                )
+                self.assertEqual(response.status_code, 400)
+
+    def test_malformed_source_is_400(self):
+        for extra in ({'source_company_id': [1], 'source_role_ids': [1]}, {'source_company_id': self.company.id, 'source_role_ids': 'x'}):
+            with self.subTest(extra=extra):
+                response = self.client.post(self.url, {'company_ids': [self.company.id], **extra}, format='json')
+                self.assertEqual(response.status_code, 400)
+
+
+class CompanyProvisioningTests(AccessTestCase):
+    url = '/api/companies/provision/'
+
+    def setUp(self):
+        super().setUp()
+        self.owner.is_staff = True
+        self.owner.save(update_fields=['is_staff'])
+
+    def provision(self, roles, companies=None):
+        companies = companies or [{'name': 'Beta', 'owner_id': self.owner.id}]
+        return self.client.post(self.url, {'companies': companies, 'roles': roles}, format='json')
+
+    def test_default_roles_share_the_role_definition_validator(self):
+        for roles in (
+            ['x'],
+            [{'name': 'Viewer', 'permission_keys': 'items.view'}],
+            [{'name': 'Viewer', 'permission_keys': ['no.such']}],
+            [{'name': 'Owner'}],
+        ):
+            with self.subTest(roles=roles):
+                self.assertEqual(self.provision(roles).status_code, 400)
+        self.assertFalse(Company.objects.filter(name='Beta').exists())
+
+        response = self.provision([{'name': 'Viewer', 'permission_keys': ['items.view']}])
+        self.assertEqual(response.status_code, 201)
+        viewer = Role.objects.get(company__name='Beta', name='Viewer')
+        self.assertEqual(list(viewer.role_permissions.values_list('permission__key', flat=True)), ['items.view'])
+
+    def test_malformed_company_rows_are_skipped(self):
+        response = self.provision([], companies=[
+            {'name': ['Beta'], 'owner_id': self.owner.id},
+            {'name': 'Gamma', 'owner_id': [self.owner.id]},
+            {'name': 'Delta', 'owner_email': {}},
+            {'name': 'Epsilon', 'owner_id': self.owner.id},
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['created'], 1)
+        self.assertEqual([e['row'] for e in response.json()['errors']], [0, 1, 2])
+
+
+class PermissionCatalogTests(AccessTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/access/companies/{self.company.id}/permissions/'
+
+    def test_catalog_is_served_from_memory(self):
+        self.client.get(self.url)
+        # tenant context only
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        expected = list(Permission.objects.order_by('key').values('id', 'key', 'description'))
+        self.assertEqual(response.json(), expected)
+
+    def test_grouped_by_module(self):
+        response = self.client.get(self.url, {'group': 'module'})
+
+        groups = {g['module']: g for g in response.json()}
+        self.assertEqual(groups['roles']['label'], 'Role & Access Control')
+        self.assertIn('roles.assign', [p['key'] for p in groups['roles']['permissions']])
+
+    def test_etag_revalidation(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(etag.startswith('W/'))
+
+    def test_sync_is_idempotent_and_restores_missing_keys(self):
+        self.assertEqual(permission_registry.sync(), {'created': [], 'updated': []})
+
+        Permission.objects.filter(key='items.delete').update(description='stale')
+        Permission.objects.create(key='retired.key')
+        result = permission_registry.sync()
+
+        self.assertEqual(result, {'created': [], 'updated': ['items.delete']})
+        self.assertTrue(Permission.objects.filter(key='retired.key').exists())
+
+    def test_first_request_of_the_process_syncs(self):
+        Permission.objects.filter(key='items.delete').update(description='stale')
+        permission_registry.reset()
+        request_started.connect(sync_on_first_request, dispatch_uid=SYNC_ON_FIRST_REQUEST)
+        self.client.get(self.url)
+
+        # The receiver already removed itself
+        self.assertFalse(request_started.disconnect(dispatch_uid=SYNC_ON_FIRST_REQUEST))
+        description = Permission.objects.get(key='items.delete').description
+        self.assertEqual(description, dict(iter_permissions())['items.delete'])
+
+
+class MyPermissionsTests(AccessTestCase):
+    url = '/api/access/my-permissions/'
+
+    def test_every_active_membership_in_one_query(self):
+        other = Company.objects.create(name='Other')
+        role = Role.objects.create(company=other, name='Viewer')
+        RolePermission.objects.create(role=role, permission=Permission.objects.get(key='items.view'))
+        recompute_role_mask(role)
+        MembershipRole.objects.create(membership=Membership.objects.create(user=self.owner, company=other), role=role)
+        Membership.objects.create(user=self.owner, company=Company.objects.create(name='Former'), is_active=False)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        permissions = response.json()['permissions']
+        self.assertEqual(set(permissions), {str(self.company.id), str(other.id)})
+        self.assertEqual(permissions[str(other.id)], ['items.view'])
+        self.assertEqual(permissions[str(self.company.id)], sorted(permission_registry.descriptions))
+
+    def test_etag_revalidation_until_a_version_bump(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, response['ETag']), (304, etag))
+
+        bump_access_version(self.company)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class TenantContextTests(AccessTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/access/companies/{self.company.id}/permissions/'
+
+    def capture(self, client=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = (client or self.client).get(self.url)
+        return response, [q['sql'] for q in ctx.captured_queries]
+
+    def test_warm_cache_reads_the_company_row_only(self):
+        _, cold = self.capture()
+        response, warm = self.capture()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('membership_roles', cold[0])
+        self.assertEqual(len(warm), 1)
+        self.assertNotIn('memberships', warm[0])
+
+    def test_access_change_reloads_a_stale_entry(self):
+        self.url = f'/api/access/companies/{self.company.id}/my-permissions/'
+        member = self.add_members(1, roles=self.add_roles(1))[0]
+        client = APIClient()
+        client.force_authenticate(member.user)
+        self.assertEqual(self.capture(client)[0].status_code, 200)
+
+        Membership.objects.filter(pk=member.pk).update(is_active=False)
+        bump_access_version(self.company)
+        response, queries = self.capture(client)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(len(queries), 2)
+
+    @override_settings(ACCESS_JWT_PERMISSION_CLAIMS=True)
+    def test_token_claims_skip_the_membership_join(self):
+        token = add_permission_claims(RefreshToken.for_user(self.owner).access_token, self.owner.id)
+        self.client.force_authenticate(self.owner, token=token)
+
+        response, queries = self.capture()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('memberships', queries[0])
+
+        bump_access_version(self.company)
+        self.assertEqual(self.capture()[0].status_code, 401)
+
+
+class AuditLogTests(AccessFixturesMixin, TransactionTestCase):
+    """Real commits: events are queued with transaction.on_commit."""
+    serialized_rollback = True
+
+    def audit(self, **params):
+        response = self.client.get(f'/api/access/companies/{self.company.id}/audit/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_access_changes_are_recorded_newest_first(self):
+        response = self.client.post(
+            f'/api/access/companies/{self.company.id}/roles/create/',
+            {'name': 'Viewer', 'permission_ids': [Permission.objects.get(key='items.view').id]},
+            format='json',
+        )
+        role_id = response.json()['id']
+        self.client.delete(f'/api/access/companies/{self.company.id}/roles/{role_id}/')
+
+        events = self.audit()['results']
+
+        self.assertEqual([e['action'] for e in events], ['role.deleted', 'role.created', 'company.created'])
+        self.assertEqual(events[0]['target_id'], role_id)
+        self.assertEqual(events[0]['actor_username'], 'owner')
+        self.assertEqual([e['action'] for e in self.audit(action='role.created')['results']], ['role.created'])
+
+    def test_request_events_are_written_in_one_insert(self):
+        role = self.add_roles(1)[0]
+        members = self.add_members(3)
+        assignments = [{'membership_id': m.id, 'role_ids': [role.id]} for m in members]
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(
+                f'/api/access/companies/{self.company.id}/team/roles/', {'assignments': assignments}, format='json',
+            )
+
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "access_audit_events"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(AccessAuditEvent.objects.filter(action='member.roles_changed').count(), 3)
+
+    def test_rejected_changes_leave_no_event(self):
+        owner_role = Role.objects.get(company=self.company, name='Owner')
+
+        response = self.client.delete(f'/api/access/companies/{self.company.id}/roles/{owner_role.id}/')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(AccessAuditEvent.objects.filter(action='role.deleted').exists())
+
+    def test_events_are_append_only(self):
+        event = AccessAuditEvent.objects.get(action='company.created')
+        with self.assertRaises(ValueError):
+            event.save()
+        with self.assertRaises(ValueError):
+            event.delete()
+
+    def test_events_outside_a_request_are_written_on_commit(self):
+        with transaction.atomic():
+            audit.record(None, self.company, 'role.created', target=1, target_type='role')
+            self.assertFalse(AccessAuditEvent.objects.filter(action='role.created').exists())
+
+        event = AccessAuditEvent.objects.get(action='role.created')
+        self.assertIsNone(event.actor_id)
+        self.assertEqual(event.target_id, 1)
+
+    @override_settings(ACCESS_AUDIT={'BACKGROUND': True, 'FLUSH_INTERVAL': 1.0, 'MAX_BATCH': 500})
+    def test_background_writer_takes_the_insert_off_the_request(self):
+        # No writer thread: the test drains the queue itself
+        with mock.patch.object(audit.background_writer, '_ensure_started'):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(
+                    f'/api/access/companies/{self.company.id}/roles/create/', {'name': 'Viewer'}, format='json',
+                )
+            self.assertEqual(response.status_code, 201)
+            self.assertFalse([q for q in ctx.captured_queries if 'INSERT INTO "access_audit_events"' in q['sql']])
+
+            audit.background_writer.drain()
+
+        self.assertTrue(AccessAuditEvent.objects.filter(action='role.created', target_id=response.json()['id']).exists())
@@ -3,11 +3,16 @@ from .views import (
     CompanyRolesListView,
     RoleCreateView,
     RoleDetailView,
+    RoleBulkCloneView,
     PermissionCatalogView,
     MyCompanyPermissionsView,
+    MyPermissionsView,
+    PermissionCacheStatsView,
     TeamMembersListView,
     ChangeMemberRoleView,
+    BulkMemberRolesView,
     RemoveMemberView,
+    AuditEventListView,
 )
 
 urlpatterns = [
@@ -15,13 +20,20 @@ urlpatterns = [
     path("companies/<int:company_id>/roles/", CompanyRolesListView.as_view(), name="company-roles-list"),
     path("companies/<int:company_id>/roles/create/", RoleCreateView.as_view(), name="company-role-create"),
     path("companies/<int:company_id>/roles/<int:role_id>/", RoleDetailView.as_view(), name="company-role-detail"),
+    path("roles/bulk-clone/", RoleBulkCloneView.as_view(), name="role-bulk-clone"),
 
     # Permissions
     path("companies/<int:company_id>/permissions/", PermissionCatalogView.as_view(), name="permission-catalog"),
     path("companies/<int:company_id>/my-permissions/", MyCompanyPermissionsView.as_view(), name="my-company-permissions"),
+    path("my-permissions/", MyPermissionsView.as_view(), name="my-permissions"),
+    path("cache/permissions/", PermissionCacheStatsView.as_view(), name="permission-cache-stats"),
 
     # Team
     path("companies/<int:company_id>/team/", TeamMembersListView.as_view(), name="company-team"),
+    path("companies/<int:company_id>/team/roles/", BulkMemberRolesView.as_view(), name="bulk-member-roles"),
     path("companies/<int:company_id>/team/<int:membership_id>/role/", ChangeMemberRoleView.as_view(), name="change-member-role"),
     path("companies/<int:company_id>/team/<int:membership_id>/", RemoveMemberView.as_view(), name="remove-member"),
+
+    # Audit
+    path("companies/<int:company_id>/audit/", AuditEventListView.as_view(), name="company-audit"),
 ]
\ No newline at end of file
@@ -1,16 +1,41 @@
+import hashlib
+
 from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Prefetch, Q
 from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags, quote_etag
 from rest_framework import generics, status
-from rest_framework.exceptions import PermissionDenied
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Membership, MembershipRole, Role, Permission, RolePermission
-from .serializers import RoleSerializer, RoleDetailSerializer, TeamMemberSerializer, PermissionSerializer
-from .pagination import TeamPagination
-from .services.permissions import membership_has_perm
-from companies.models import Company
+from core.validation import is_id
+
+from .models import AccessAuditEvent, Membership, MembershipRole, Role, RolePermission
+from .serializers import (
+    AccessAuditEventSerializer,
+    RoleListSerializer,
+    RoleDetailSerializer,
+    TeamMemberSerializer,
+)
+from .pagination import AuditPagination, TeamPagination
+from .services import audit
+from .services.cache import permission_cache
+from .services.catalog import permission_registry
+from .services.tenant import get_tenant
+from .services.permissions import (
+    bump_access_version,
+    keys_for_mask,
+    load_user_company_masks,
+    mask_has_perm,
+)
+from .services.roles import (
+    RoleDefinitionError,
+    clone_roles,
+    set_role_permissions,
+    validate_role_definitions,
+)
 
 
 # ============================================================================
@@ -23,24 +48,36 @@ class CompanyMemberMixin:
     Raises 404 if company doesn't exist or user is not an active member.
     """
 
+    def get_tenant(self):
+        """Company + membership + permission mask, resolved in one query per request."""
+        return get_tenant(self.request, self.kwargs['company_id'])
+
     def get_company(self):
-        if not hasattr(self, '_company'):
-            self._company = get_object_or_404(Company, id=self.kwargs['company_id'])
-        return self._company
+        return self.get_tenant().company
 
     def get_membership(self):
-        if not hasattr(self, '_membership'):
-            self._membership = get_object_or_404(
-                Membership,
-                user=self.request.user,
-                company=self.get_company(),
-                is_active=True,
-            )
-        return self._membership
+        return self.get_tenant().membership
+
+    def get_perm_mask(self) -> int:
+        """
+        Requester's permission bitmask in this company — from the access-token
+        claims when present, else the permission cache or the tenant query.
+        """
+        return self.get_tenant().perm_mask
+
+    def get_perm_keys(self):
+        return keys_for_mask(self.get_perm_mask())
+
+    def has_perm(self, perm: str) -> bool:
+        return mask_has_perm(self.get_perm_mask(), perm)
+
+    def has_perms(self, *perms: str) -> bool:
+        mask = self.get_perm_mask()
+        return all(mask_has_perm(mask, perm) for perm in perms)
 
     def require_perm(self, perm: str):
         """Returns 403 Response if lacking permission. Use in APIView methods."""
-        if not membership_has_perm(self.get_membership(), perm):
+        if not self.has_perm(perm):
             return Response(
                 {'detail': f'Missing permission: {perm}'},
                 status=status.HTTP_403_FORBIDDEN,
@@ -49,7 +86,7 @@ class CompanyMemberMixin:
 
     def check_perm(self, perm: str):
         """Raises PermissionDenied if lacking permission. Use in get_queryset."""
-        if not membership_has_perm(self.get_membership(), perm):
+        if not self.has_perm(perm):
             raise PermissionDenied(f'Missing permission: {perm}')
 
 
@@ -57,17 +94,42 @@ class CompanyMemberMixin:
 # ROLES
 # ============================================================================
 
+def role_permissions_prefetch():
+    """Single prefetch query for role → permissions (role_permissions JOIN permissions)."""
+    return Prefetch('role_permissions', queryset=RolePermission.objects.select_related('permission'))
+
+
 class CompanyRolesListView(CompanyMemberMixin, generics.ListAPIView):
     """
     GET /api/access/companies/{company_id}/roles/
     Requires: roles.view
+
+    Optional: ?include=permissions,member_count
+        permissions  – assigned permissions per role (one prefetch query)
+        member_count – active members holding the role (annotation)
     """
     permission_classes = [IsAuthenticated]
-    serializer_class = RoleSerializer
+    serializer_class = RoleListSerializer
+
+    def get_include(self):
+        raw = self.request.query_params.get('include', '')
+        return {part.strip() for part in raw.split(',') if part.strip()} & set(RoleListSerializer.INCLUDE_FIELDS)
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), 'include': self.get_include()}
 
     def get_queryset(self):
         self.check_perm('roles.view')
-        return Role.objects.filter(company=self.get_company())
+        include = self.get_include()
+        qs = Role.objects.filter(company=self.get_company())
+        if 'member_count' in include:
+            qs = qs.annotate(member_count=Count(
+                'assigned_memberships',
+                filter=Q(assigned_memberships__membership__is_active=True),
+            ))
+        if 'permissions' in include:
+            qs = qs.prefetch_related(role_permissions_prefetch())
+        return qs
 
 
 class RoleCreateView(CompanyMemberMixin, APIView):
@@ -105,12 +167,12 @@ class RoleCreateView(CompanyMemberMixin, APIView):
             is_system=False,
         )
 
-        if permission_ids:
-            permissions = Permission.objects.filter(id__in=permission_ids)
-            RolePermission.objects.bulk_create([
-                RolePermission(role=role, permission=p) for p in permissions
-            ])
+        changes = set_role_permissions(role, permission_ids) if permission_ids else {'added': []}
 
+        bump_access_version(company)
+        audit.record(request, company, 'role.created', target=role, name=role.name, permission_ids=changes['added'])
+
+        role = Role.objects.prefetch_related(role_permissions_prefetch()).get(pk=role.pk)
         return Response(RoleDetailSerializer(role).data, status=status.HTTP_201_CREATED)
 
 
@@ -119,17 +181,25 @@ class RoleDetailView(CompanyMemberMixin, APIView):
     GET /api/access/companies/{company_id}/roles/{role_id}/ → requires roles.view
     PATCH  /api/access/companies/{company_id}/roles/{role_id}/  → requires roles.edit
     DELETE /api/access/companies/{company_id}/roles/{role_id}/  → requires roles.delete
+
+    PATCH with "permission_ids" writes only the difference and returns it as
+    "permission_changes": {"added": [...], "removed": [...]}.
     """
     permission_classes = [IsAuthenticated]
 
     def get_role(self):
-        return get_object_or_404(Role, id=self.kwargs['role_id'], company=self.get_company())
+        return get_object_or_404(
+            Role.objects.prefetch_related(role_permissions_prefetch()),
+            id=self.kwargs['role_id'],
+            company=self.get_company(),
+        )
 
     def get(self, request, company_id, role_id):
         if denied := self.require_perm('roles.view'):
             return denied
         return Response(RoleDetailSerializer(self.get_role()).data)
 
+    @transaction.atomic
     def patch(self, request, company_id, role_id):
         if denied := self.require_perm('roles.edit'):
             return denied
@@ -154,16 +224,25 @@ class RoleDetailView(CompanyMemberMixin, APIView):
         role.description = description
         role.save()
 
+        changes = None
         if permission_ids is not None:
-            RolePermission.objects.filter(role=role).delete()
-            if permission_ids:
-                permissions = Permission.objects.filter(id__in=permission_ids)
-                RolePermission.objects.bulk_create([
-                    RolePermission(role=role, permission=p) for p in permissions
-                ])
+            # Only additions are inserted and only removals deleted
+            changes = set_role_permissions(role, permission_ids)
+            if changes['added'] or changes['removed']:
+                bump_access_version(role.company_id)
+                role = self.get_role()  # re-read the updated permissions
+
+        audit.record(
+            request, role.company_id, 'role.updated', target=role,
+            name=role.name, description=role.description, permission_changes=changes,
+        )
 
-        return Response(RoleDetailSerializer(role).data)
+        data = RoleDetailSerializer(role).data
+        if changes is not None:
+            data['permission_changes'] = changes
+        return Response(data)
 
+    @transaction.atomic
     def delete(self, request, company_id, role_id):
         if denied := self.require_perm('roles.delete'):
             return denied
@@ -173,10 +252,116 @@ class RoleDetailView(CompanyMemberMixin, APIView):
         if role.is_system:
             return Response({'detail': 'System roles cannot be deleted.'}, status=status.HTTP_400_BAD_REQUEST)
 
+        audit.record(request, role.company_id, 'role.deleted', target=role, name=role.name)
         role.delete()
+        bump_access_version(company_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class RoleBulkCloneView(APIView):
+    """
+    POST /api/access/roles/bulk-clone/
+    Copies one or more role definitions into many companies in one batched transaction.
+
+    Body:
+    {
+        "company_ids": [2, 3, 4],
+        "roles": [
+            {"name": "Manager", "description": "...", "permission_ids": [1, 2]},
+            {"name": "Viewer", "permission_keys": ["items.view"]}
+        ],
+        "on_conflict": "skip" | "update"      # optional, default "skip"
+    }
+    or, instead of "roles", copy existing roles of a company:
+        "source_company_id": 1, "source_role_ids": [5, 6]
+
+    Requires: roles.create in every target company (+ roles.edit for "update"),
+    roles.view in the source company.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        company_ids = request.data.get('company_ids') or []
+        on_conflict = request.data.get('on_conflict', 'skip')
+
+        if not isinstance(company_ids, list) or not company_ids or not all(is_id(c) for c in company_ids):
+            return Response({'detail': 'company_ids must be a non-empty list of ids.'}, status=status.HTTP_400_BAD_REQUEST)
+        if on_conflict not in ('skip', 'update'):
+            return Response({'detail': 'on_conflict must be "skip" or "update".'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # One grouped query for the requester's rights in every company
+        masks = {cid: mask for cid, (mask, _) in load_user_company_masks(request.user.pk).items()}
+        required = ['roles.create'] + (['roles.edit'] if on_conflict == 'update' else [])
+        forbidden = [
+            cid for cid in company_ids
+            if not all(mask_has_perm(masks.get(cid, 0), perm) for perm in required)
+        ]
+        if forbidden:
+            return Response(
+                {'detail': f'Missing permission {" + ".join(required)} in companies: {forbidden}'},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        if 'source_role_ids' in request.data:
+            definitions, error = self.definitions_from_source(request, masks)
+        else:
+            definitions, error = self.definitions_from_body(request.data.get('roles') or [])
+        if error:
+            return error
+
+        results = clone_roles(definitions, company_ids, on_conflict=on_conflict)
+        for row in results:
+            if row['status'] in ('created', 'updated'):
+                audit.record(
+                    request, row['company_id'], f"role.{row['status']}",
+                    target=row['role_id'], target_type='role', name=row['name'], via='bulk-clone',
+                )
+
+        summary = {key: 0 for key in ('created', 'updated', 'unchanged', 'skipped')}
+        for row in results:
+            summary[row['status']] += 1
+        return Response({**summary, 'results': results})
+
+    def definitions_from_body(self, roles):
+        if not roles:
+            return None, Response({'detail': 'roles is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            return validate_role_definitions(roles), None
+        except RoleDefinitionError as exc:
+            return None, Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    def definitions_from_source(self, request, masks):
+        source_company_id = request.data.get('source_company_id')
+        role_ids = request.data.get('source_role_ids') or []
+        if not is_id(source_company_id):
+            return None, Response({'detail': 'source_company_id must be an id.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(role_ids, list) or not all(is_id(r) for r in role_ids):
+            return None, Response({'detail': 'source_role_ids must be a list of ids.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not mask_has_perm(masks.get(source_company_id, 0), 'roles.view'):
+            return None, Response(
+                {'detail': 'Missing permission: roles.view in the source company.'},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        roles = list(
+            Role.objects
+            .filter(company_id=source_company_id, id__in=role_ids)
+            .prefetch_related('role_permissions')
+        )
+        missing = sorted(set(role_ids) - {r.pk for r in roles})
+        if missing:
+            return None, Response({'detail': f'Roles not found in the source company: {missing}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return [
+            {
+                'name': role.name,
+                'description': role.description,
+                'permission_ids': {rp.permission_id for rp in role.role_permissions.all()},
+            }
+            for role in roles
+        ], None
+
+
 # ============================================================================
 # PERMISSIONS CATALOG
 # ============================================================================
@@ -184,13 +369,29 @@ class RoleDetailView(CompanyMemberMixin, APIView):
 class PermissionCatalogView(CompanyMemberMixin, APIView):
     """
     GET /api/access/companies/{company_id}/permissions/
+    GET /api/access/companies/{company_id}/permissions/?group=module
     Requires: roles.view
+
+    Served from the in-memory registry (no catalog query). Default is the flat
+    [{id, key, description}] list; ?group=module nests it under module labels.
+    The strong ETag only changes when the deployed catalog does.
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request, company_id):
         self.check_perm('roles.view')
-        return Response(PermissionSerializer(Permission.objects.all(), many=True).data)
+
+        grouped = request.query_params.get('group') == 'module'
+        data, digest = permission_registry.payload(grouped=grouped)
+        etag = quote_etag(digest)
+
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
 
 
 class MyCompanyPermissionsView(CompanyMemberMixin, APIView):
@@ -201,15 +402,51 @@ class MyCompanyPermissionsView(CompanyMemberMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, company_id):
-        membership = self.get_membership()
+        return Response({'permissions': sorted(self.get_perm_keys())})
 
-        permission_keys = list(
-            Permission.objects.filter(
-                permission_roles__role__assigned_memberships__membership=membership
-            ).values_list('key', flat=True).distinct()
-        )
 
-        return Response({'permissions': permission_keys})
+class MyPermissionsView(APIView):
+    """
+    GET /api/access/my-permissions/
+    Permission keys for every company the user is an active member of:
+        { "permissions": { "<company_id>": ["items.view", ...], ... } }
+
+    One grouped query. The ETag is derived from the companies' access versions,
+    so a repeated call with If-None-Match returns 304 until something changes.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        masks = load_user_company_masks(request.user.pk)
+
+        digest = hashlib.sha256(
+            f"{request.user.pk}|".encode()
+            + ",".join(f"{cid}:{version}" for cid, (_, version) in sorted(masks.items())).encode()
+        ).hexdigest()[:32]
+        etag = quote_etag(digest)
+
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({
+                'permissions': {
+                    str(cid): sorted(keys_for_mask(mask)) for cid, (mask, _) in masks.items()
+                },
+            })
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class PermissionCacheStatsView(APIView):
+    """
+    GET /api/access/cache/permissions/
+    Staff only — hit/miss/eviction counters of this worker's permission cache.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(permission_cache.stats())
 
 
 # ============================================================================
@@ -220,6 +457,11 @@ class TeamMembersListView(CompanyMemberMixin, generics.ListAPIView):
     """
     GET /api/access/companies/{company_id}/team/
     Requires: members.view
+
+    Query params:
+        ?search=<text>   username or email contains <text> (case-insensitive;
+                         trigram-indexed on PostgreSQL)
+        ?role=<role_id>  members holding that role (EXISTS semi-join)
     """
     permission_classes = [IsAuthenticated]
     serializer_class = TeamMemberSerializer
@@ -227,13 +469,29 @@ class TeamMembersListView(CompanyMemberMixin, generics.ListAPIView):
 
     def get_queryset(self):
         self.check_perm('members.view')
-        return (
+        queryset = (
             Membership.objects
             .filter(company=self.get_company(), is_active=True)
             .select_related('user')
             .prefetch_related('membership_roles__role')
         )
 
+        search = self.request.query_params.get('search', '').strip()
+        if search:
+            queryset = queryset.filter(
+                Q(user__username__icontains=search) | Q(user__email__icontains=search)
+            )
+
+        role_id = self.request.query_params.get('role')
+        if role_id:
+            if not role_id.isdigit():
+                raise ValidationError({'role': 'Must be a role id.'})
+            queryset = queryset.filter(Exists(
+                MembershipRole.objects.filter(membership=OuterRef('pk'), role_id=int(role_id))
+            ))
+
+        return queryset
+
 
 class ChangeMemberRoleView(CompanyMemberMixin, APIView):
     """
@@ -264,10 +522,142 @@ class ChangeMemberRoleView(CompanyMemberMixin, APIView):
 
         MembershipRole.objects.filter(membership=target).delete()
         MembershipRole.objects.create(membership=target, role=new_role)
+        bump_access_version(company_id)
+        audit.record(
+            request, target.company_id, 'member.roles_changed', target=target,
+            user_id=target.user_id, role_ids=[new_role.pk],
+        )
 
         return Response(TeamMemberSerializer(target).data)
 
 
+class BulkMemberRolesView(CompanyMemberMixin, APIView):
+    """
+    POST /api/access/companies/{company_id}/team/roles/
+    Body: { "assignments": [ {"membership_id": 7, "role_ids": [2, 3]}, ... ] }
+    Requires: roles.assign
+
+    Sets the exact role set of each listed member (several roles per member allowed).
+    Memberships and roles are validated with set-based queries, valid rows are applied
+    with one bulk delete + one bulk insert, and every row gets an outcome:
+        updated | unchanged | error (with "detail")
+    Invalid rows are reported and skipped; they don't block the valid ones.
+    """
+    permission_classes = [IsAuthenticated]
+    max_assignments = 1000
+
+    @transaction.atomic
+    def post(self, request, company_id):
+        if denied := self.require_perm('roles.assign'):
+            return denied
+
+        assignments = request.data.get('assignments')
+        if not isinstance(assignments, list) or not assignments:
+            return Response({'detail': 'assignments must be a non-empty list.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(assignments) > self.max_assignments:
+            return Response(
+                {'detail': f'At most {self.max_assignments} assignments per request.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        company = self.get_company()
+
+        # ── Shape checks first: only well-formed rows reach the set-based queries
+        rows = []
+        for row in assignments:
+            membership_id = row.get('membership_id') if isinstance(row, dict) else None
+            row_role_ids = row.get('role_ids') if isinstance(row, dict) else None
+            error = None
+            if not is_id(membership_id):
+                error = 'membership_id must be an id.'
+            elif not isinstance(row_role_ids, list) or not row_role_ids or not all(is_id(r) for r in row_role_ids):
+                error = 'role_ids must be a non-empty list of ids.'
+            rows.append((membership_id, row_role_ids, error))
+
+        membership_ids = {membership_id for membership_id, _, error in rows if error is None}
+        role_ids = {rid for _, row_role_ids, error in rows if error is None for rid in row_role_ids}
+
+        # ── Set-based validation: three queries whatever the batch size ─────
+        members = dict(
+            Membership.objects
+            .filter(company=company, is_active=True, id__in=membership_ids)
+            .values_list('id', 'user_id')
+        )
+        roles = {
+            r['id']: r for r in
+            Role.objects.filter(company=company, id__in=role_ids).values('id', 'name', 'is_system')
+        }
+        owners = set(
+            MembershipRole.objects
+            .filter(membership_id__in=members, role__name='Owner', role__is_system=True)
+            .values_list('membership_id', flat=True)
+        )
+
+        results, wanted, seen = [], {}, set()
+        for membership_id, row_role_ids, error in rows:
+            if error:
+                pass
+            elif membership_id in seen:
+                error = 'Duplicate membership_id in this request.'
+            elif membership_id not in members:
+                error = 'Membership not found in this company.'
+            elif members[membership_id] == request.user.pk:
+                error = 'You cannot change your own role.'
+            elif membership_id in owners:
+                error = 'Cannot change the roles of the company Owner.'
+            elif missing := sorted(set(row_role_ids) - set(roles)):
+                error = f'Roles not found in this company: {missing}'
+            elif any(roles[rid]['is_system'] and roles[rid]['name'] == 'Owner' for rid in row_role_ids):
+                error = 'Cannot assign the Owner role.'
+
+            if error:
+                results.append({'membership_id': membership_id, 'status': 'error', 'detail': error})
+            else:
+                seen.add(membership_id)
+                wanted[membership_id] = set(row_role_ids)
+                results.append({'membership_id': membership_id, 'status': None, 'role_ids': sorted(row_role_ids)})
+
+        # ── Diff against current assignments, apply in bulk ──────────────────
+        current = {}
+        for row_id, membership_id, role_id in MembershipRole.objects.filter(
+            membership_id__in=wanted,
+        ).values_list('id', 'membership_id', 'role_id'):
+            current.setdefault(membership_id, {})[role_id] = row_id
+
+        to_delete, to_create, changed = [], [], set()
+        for membership_id, role_set in wanted.items():
+            have = current.get(membership_id, {})
+            to_delete += [row_id for role_id, row_id in have.items() if role_id not in role_set]
+            to_create += [
+                MembershipRole(membership_id=membership_id, role_id=role_id)
+                for role_id in role_set - set(have)
+            ]
+            if role_set != set(have):
+                changed.add(membership_id)
+                audit.record(
+                    request, company, 'member.roles_changed',
+                    target=membership_id, target_type='membership', user_id=members[membership_id],
+                    role_ids=sorted(role_set), added=sorted(role_set - set(have)),
+                    removed=sorted(set(have) - role_set), via='bulk',
+                )
+
+        if to_delete:
+            MembershipRole.objects.filter(pk__in=to_delete).delete()
+        if to_create:
+            MembershipRole.objects.bulk_create(to_create, batch_size=1000)
+        if changed:
+            bump_access_version(company)
+
+        for result in results:
+            if result['status'] is None:
+                result['status'] = 'updated' if result['membership_id'] in changed else 'unchanged'
+
+        summary = {key: 0 for key in ('updated', 'unchanged', 'error')}
+        for result in results:
+            summary[result['status']] += 1
+        return Response({**summary, 'results': results})
+
+
 class RemoveMemberView(CompanyMemberMixin, APIView):
     """
     DELETE /api/access/companies/{company_id}/team/{membership_id}/
@@ -275,6 +665,7 @@ class RemoveMemberView(CompanyMemberMixin, APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    @transaction.atomic
     def delete(self, request, company_id, membership_id):
         if denied := self.require_perm('members.remove'):
             return denied
@@ -293,4 +684,41 @@ class RemoveMemberView(CompanyMemberMixin, APIView):
 
         target.is_active = False
         target.save(update_fields=['is_active'])
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        bump_access_version(company_id)
+        audit.record(request, target.company_id, 'member.removed', target=target, user_id=target.user_id)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# ============================================================================
+# AUDIT
+# ============================================================================
+
+class AuditEventListView(CompanyMemberMixin, generics.ListAPIView):
+    """
+    GET /api/access/companies/{company_id}/audit/
+    Requires: audit.view
+
+    Keyset-paginated, newest first. Optional filters:
+        ?action=role.updated   ?actor=<user_id>
+        ?target_type=membership&target_id=<id>
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = AccessAuditEventSerializer
+    pagination_class = AuditPagination
+
+    def get_queryset(self):
+        self.check_perm('audit.view')
+        queryset = AccessAuditEvent.objects.filter(company=self.get_company()).select_related('actor')
+
+        params = self.request.query_params
+        for param, lookup in (('actor', 'actor_id'), ('target_id', 'target_id')):
+            value = params.get(param)
+            if value:
+                if not value.isdigit():
+                    raise ValidationError({param: 'Must be an id.'})
+                queryset = queryset.filter(**{lookup: int(value)})
+        for param in ('action', 'target_type'):
+            if params.get(param):
+                queryset = queryset.filter(**{param: params[param]})
+
+        return queryset
@@ -0,0 +1,85 @@
+"""
+Where-used through the BOM closure table (items/closure.py), against walking the
+recipe graph upwards one level per query (the best a query-per-level walk can
+do: all parents of the whole frontier at once).
+
+Shape: the shared BOM of benchmarks/bom_explosion.py — every level 45 raw
+ingredients + 5 sub-assemblies, each using all 5 sub-assemblies of the next
+level. Where-used is asked for a raw ingredient of the deepest level, which
+every BOM of the graph contains.
+
+Also timed: the full rebuild (manage.py rebuild_bom_closure) and the
+incremental refresh a recipe write pays for, on the deepest BOM — the one
+with the most ancestors.
+
+    cd server && python -m benchmarks.bom_where_used [--depth 10] [--width 50]
+"""
+import argparse
+
+from benchmarks.bom_explosion import build
+from benchmarks.harness import count_queries, print_table, setup, test_database, time_ms
+
+setup()
+
+
+def per_level_where_used(item_id):
+    """Ancestors of `item_id`, one query per BOM level."""
+    from items.models import RecipeLine
+
+    found, frontier = set(), {item_id}
+    while frontier:
+        parents = set(
+            RecipeLine.objects
+            .filter(ingredient_id__in=frontier, recipe__is_default=True)
+            .values_list('recipe__output_item_id', flat=True)
+        )
+        frontier = parents - found
+        found |= parents
+    return found
+
+
+def main(depth, width):
+    from django.db import connection
+
+    from companies.models import Company
+    from items.closure import rebuild_closure, refresh_closure, where_used
+    from items.models import BomClosure, Item, RecipeLine
+
+    company = Company.objects.create(name='Bench Co')
+    print(f'\nBOM where-used, depth {depth}, width {width}, {connection.vendor}')
+
+    build(company, depth, width, subassemblies=5)
+    deepest = Item.objects.filter(company=company, name__contains=f' L{depth - 1} #').first()
+    leaf = Item.objects.filter(company=company, name__startswith=f'raw {depth}x5 {deepest.pk}-').first()
+
+    rebuild_ms = time_ms(lambda: rebuild_closure(company), repeat=1)
+    closure_rows = BomClosure.objects.filter(ancestor__company=company).count()
+
+    results, queries = count_queries(lambda: where_used(leaf.pk))
+    legacy, legacy_queries = count_queries(lambda: per_level_where_used(leaf.pk))
+    assert {row['item'] for row in results} == legacy
+
+    line = RecipeLine.objects.filter(recipe__output_item=deepest, ingredient=leaf).first()
+
+    def edit_line():
+        # A quantity edit on the deepest BOM: one factor changes under each of its ancestors
+        line.quantity += 0.5
+        line.save(update_fields=['quantity'])
+        refresh_closure(deepest.pk)
+
+    _, refresh_queries = count_queries(edit_line)
+    print_table(['path', 'queries', 'ms'], [
+        (f'per level ({len(legacy)} items found)', legacy_queries, f'{time_ms(lambda: per_level_where_used(leaf.pk), repeat=5):.1f}'),
+        ('closure table', queries, f'{time_ms(lambda: where_used(leaf.pk), repeat=5):.1f}'),
+        (f'rebuild ({closure_rows:,} rows)', '', f'{rebuild_ms:.1f}'),
+        ('line edit on the deepest BOM + refresh', refresh_queries, f'{time_ms(edit_line, repeat=5):.1f}'),
+    ])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--depth', type=int, default=10)
+    parser.add_argument('--width', type=int, default=50)
+    args = parser.parse_args()
+    with test_database():
+        main(args.depth, args.width)
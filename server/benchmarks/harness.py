@@ -0,0 +1,68 @@
+"""
+Shared scaffolding for the scripts in this package.
+
+Every benchmark runs against a throwaway test database (created and destroyed
+around the run), never against the configured development/production DB.
+
+    cd server && python -m benchmarks.<name>
+"""
+import contextlib
+import io
+import os
+import time
+from statistics import median
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+
+def setup():
+    import django
+
+    # settings.py prints a startup banner — keep benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        django.setup()
+
+
+@contextlib.contextmanager
+def test_database():
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def count_queries(fn):
+    """Runs `fn` once and returns (result, number_of_queries)."""
+    from django.db import connection, reset_queries
+    from django.test.utils import CaptureQueriesContext
+
+    # The query log is capped; a full log from an earlier run would make the count 0
+    reset_queries()
+    with CaptureQueriesContext(connection) as ctx:
+        result = fn()
+    return result, len(ctx.captured_queries)
+
+
+def time_ms(fn, repeat=20):
+    """Median wall time of `fn` in milliseconds over `repeat` runs."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return median(samples)
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(v)) for v in column) for column in zip(headers, *rows)]
+    line = '  '.join(f'{{:<{w}}}' for w in widths)
+    print(line.format(*headers))
+    print(line.format(*('-' * w for w in widths)))
+    for row in rows:
+        print(line.format(*row))
@@ -0,0 +1,94 @@
+"""
+Catalog export (items/export.py): time to first byte, total time and peak Python
+memory while streaming, at growing catalog sizes. Flat peak memory across sizes
+is the point — rows are consumed and discarded chunk by chunk.
+
+    cd server && python -m benchmarks.item_export [--sizes 10000 100000]
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.harness import print_table, setup, test_database
+
+setup()
+
+
+def seed(company, count):
+    from items.models import Category, Item, ItemAttribute, UnitOfMeasure
+
+    uom = UnitOfMeasure.objects.first()
+    category = Category.objects.create(company=company, name='Bulk')
+    batch = []
+    for i in range(count):
+        batch.append(Item(company=company, name=f'Item {i:06d}', description='grade A', unit_of_measurement=uom, category=category))
+        if len(batch) == 5000:
+            Item.objects.bulk_create(batch)
+            batch = []
+    Item.objects.bulk_create(batch)
+
+    ids = Item.objects.filter(company=company).values_list('id', flat=True)
+    ItemAttribute.objects.bulk_create(
+        (ItemAttribute(item_id=item_id, key='Shelf Life', value='12 months') for item_id in ids),
+        batch_size=5000,
+    )
+
+
+def consume(stream):
+    """Drains a stream → (first byte ms, total ms, output MB)."""
+    start = time.perf_counter()
+    first_byte_ms = None
+    size = 0
+    for part in stream:
+        if first_byte_ms is None:
+            first_byte_ms = (time.perf_counter() - start) * 1000
+        size += len(part)
+    return first_byte_ms, (time.perf_counter() - start) * 1000, size / 1024 / 1024
+
+
+def peak_memory_mb(stream):
+    """Separate pass: tracemalloc slows Python down too much to time under it."""
+    tracemalloc.start()
+    for _ in stream:
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main(sizes):
+    from django.db import connection
+
+    from companies.models import Company
+    from items.export import csv_header, csv_rows, export_queryset, export_rows
+    from items.models import Item
+    from items.pagination import items_list_setting
+    from items.streaming import csv_stream, ndjson_stream
+
+    chunk_size = items_list_setting('STREAM_CHUNK_SIZE')
+    includes = ('attributes', 'recipe')
+    rows = []
+    for size in sizes:
+        company = Company.objects.create(name=f'Bench Co {size}')
+        seed(company, size)
+        qs = export_queryset(Item.objects.filter(company=company))
+
+        streams = {
+            'ndjson': lambda: ndjson_stream(qs, lambda chunk: export_rows(chunk, includes), chunk_size),
+            'csv': lambda: csv_stream(qs, csv_header(includes), lambda chunk: csv_rows(chunk, includes), chunk_size),
+        }
+        for name, stream in streams.items():
+            first_ms, total_ms, out_mb = consume(stream())
+            peak_mb = peak_memory_mb(stream())
+            rows.append((size, name, f'{first_ms:.1f}', f'{total_ms:.0f}', f'{out_mb:.1f}', f'{peak_mb:.1f}'))
+
+    print(f'\nCatalog export with attributes + recipe, {connection.vendor}, chunks of {chunk_size}')
+    print_table(['items', 'format', 'first byte ms', 'total ms', 'output MB', 'peak MB'], rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+    with test_database():
+        main(args.sizes)
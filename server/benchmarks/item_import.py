@@ -0,0 +1,85 @@
+"""
+Item import (items/importer.py) of a generated CSV, against the one-item-at-a-time
+path ItemListCreateView.post takes (category exists(), name exists(), INSERT).
+
+    cd server && python -m benchmarks.item_import [--rows 100000] [--baseline-rows 2000]
+
+The per-item baseline runs on a smaller sample and is reported as rows/s, which
+is what matters for an onboarding file of any size.
+"""
+import argparse
+import io
+import random
+import time
+
+from benchmarks.harness import print_table, setup, test_database
+
+setup()
+
+UOMS = ('kg', 'g', 'L', 'pcs', 'ml')
+
+
+def generate_csv(rows, categories, prefix):
+    rng = random.Random(7)
+    out = io.StringIO()
+    out.write('name,uom,description,item_type,category,is_active\n')
+    for i in range(rows):
+        category = rng.choice(categories) if i % 4 else ''
+        out.write(f'{prefix} {i:06d},{rng.choice(UOMS)},grade {i % 10},{"bom" if i % 9 == 0 else "raw"},{category},true\n')
+    out.seek(0)
+    return out
+
+
+def per_item(company, rows, categories):
+    """What N calls to ItemListCreateView.post cost in queries, minus the HTTP layer."""
+    from items.models import Category, Item, UnitOfMeasure
+
+    uom = UnitOfMeasure.objects.get(abbreviation='kg')
+    category_ids = dict(Category.objects.filter(company=company).values_list('name', 'id'))
+    started = time.perf_counter()
+    for i in range(rows):
+        category_id = category_ids[categories[i % len(categories)]]
+        name = f'legacy {i:06d}'
+        Category.objects.filter(id=category_id, company=company).exists()
+        Item.objects.filter(company=company, name=name).exists()
+        Item.objects.create(company=company, name=name, unit_of_measurement=uom, category_id=category_id)
+    return rows / (time.perf_counter() - started)
+
+
+def main(rows, baseline_rows):
+    from django.db import connection
+
+    from companies.models import Company
+    from items.importer import import_items
+    from items.models import Category
+
+    company = Company.objects.create(name='Bench Co')
+    categories = [f'Category {i}' for i in range(20)]
+    Category.objects.bulk_create(Category(company=company, name=name) for name in categories[:10])
+
+    results = []
+    legacy_rate = per_item(company, baseline_rows, categories[:10])
+    results.append(('per-item create', baseline_rows, baseline_rows, '', f'{legacy_rate:.0f}', '1.0x'))
+
+    for dry_run in (True, False):
+        report = import_items(
+            company, generate_csv(rows, categories, 'import'), 'csv',
+            dry_run=dry_run, create_categories=True,
+        ).as_dict()
+        label = 'import (dry run)' if dry_run else 'import'
+        results.append((
+            label, report['read'], report['created'], f"{report['seconds']:.2f}",
+            f"{report['rows_per_second']:.0f}", f"{report['rows_per_second'] / legacy_rate:.1f}x",
+        ))
+
+    print(f'\nItem import, {connection.vendor}')
+    print_table(['path', 'rows', 'created', 'seconds', 'rows/s', 'vs per-item'], results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--baseline-rows', type=int, default=2_000)
+    args = parser.parse_args()
+    with test_database():
+        main(args.rows, args.baseline_rows)
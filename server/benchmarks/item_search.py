@@ -0,0 +1,103 @@
+"""
+Item search at 100k items in one company: the legacy `name__icontains` scan
+versus the indexed search path (items/search.py).
+
+On SQLite the indexed path is the FTS5 trigram shadow table; point DJANGO_DB_URL
+at PostgreSQL to measure the pg_trgm GIN indexes instead (the "scan" column then
+runs with index scans disabled so both columns use the same SQL).
+
+    cd server && python -m benchmarks.item_search [--items 100000]
+
+Reading the numbers: selective terms (what the ingredient picker sends after a
+few keystrokes) are where the scan hurts and the index wins by an order of
+magnitude. Very common terms let the unranked scan stop after the first page of
+hits, while the ranked search has to order every match — that is the price of
+relevance ordering, and it stays bounded by the number of matches, not items.
+"""
+import argparse
+import contextlib
+import random
+
+from benchmarks.harness import print_table, setup, test_database, time_ms
+
+setup()
+
+WORDS = [
+    'acid', 'amber', 'basil', 'butter', 'carbon', 'cocoa', 'copper', 'flour', 'ginger', 'glass',
+    'honey', 'lemon', 'malt', 'mint', 'nickel', 'olive', 'pepper', 'resin', 'salt', 'sugar',
+    'syrup', 'vanilla', 'walnut', 'yeast', 'zinc', 'paper', 'label', 'bottle', 'cap', 'film',
+]
+
+PAGE = 50
+
+
+def seed(company, count):
+    from items.models import Item, UnitOfMeasure
+
+    rng = random.Random(42)
+    uom = UnitOfMeasure.objects.first()
+    batch = []
+    for i in range(count):
+        name = f'{rng.choice(WORDS)} {rng.choice(WORDS)} {i:06d}'
+        batch.append(Item(company=company, name=name, description=f'{rng.choice(WORDS)} grade', unit_of_measurement=uom))
+        if len(batch) == 5000:
+            Item.objects.bulk_create(batch)
+            batch = []
+    Item.objects.bulk_create(batch)
+
+
+@contextlib.contextmanager
+def without_indexes(connection):
+    """PostgreSQL only: make the planner ignore indexes for the 'scan' column."""
+    if connection.vendor != 'postgresql':
+        yield
+        return
+    from django.db import transaction
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute('SET LOCAL enable_bitmapscan = off')
+        cursor.execute('SET LOCAL enable_indexscan = off')
+        yield
+
+
+def main(count):
+    from django.db import connection
+
+    from companies.models import Company
+    from items.models import Item
+    from items.search import search_items
+
+    company = Company.objects.create(name='Bench Co')
+    seed(company, count)
+    base = Item.objects.filter(company=company)
+
+    def legacy(term):
+        return list(base.filter(name__icontains=term).order_by('-date_added', 'id')[:PAGE])
+
+    def indexed(term):
+        return list(search_items(base, term).order_by('search_rank', 'search_distance', 'id')[:PAGE])
+
+    terms = [
+        ('rare (1 match)', f'{count // 2:06d}'),
+        ('two words', 'olive resin'),
+        ('common word', 'sugar'),
+        ('short (2 chars)', 'zi'),
+    ]
+
+    print(f'\n{count} items, {connection.vendor}, first page of {PAGE}')
+    rows = []
+    for label, term in terms:
+        matches = base.filter(name__icontains=term).count()
+        with without_indexes(connection):
+            scan_ms = time_ms(lambda: legacy(term), repeat=5)
+        search_ms = time_ms(lambda: indexed(term), repeat=5)
+        rows.append((label, repr(term), matches, f'{scan_ms:.1f}', f'{search_ms:.1f}', f'{scan_ms / search_ms:.1f}x'))
+    print_table(['term', 'query', 'matches', 'icontains ms', 'indexed ms', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=100_000)
+    args = parser.parse_args()
+    with test_database():
+        main(args.items)
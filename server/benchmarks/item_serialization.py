@@ -0,0 +1,89 @@
+"""
+Item list serialization: ItemSerializer over model instances versus the
+projection path (items/projections.py) building rows from `.values()`.
+
+Both columns include the query and the JSON rendering, i.e. what a streamed
+`?stream=true` response costs end to end. Every run also checks that the two
+paths render byte-identical JSON.
+
+    cd server && python -m benchmarks.item_serialization [--sizes 1000 10000 100000]
+"""
+import argparse
+import random
+
+from benchmarks.harness import print_table, setup, test_database, time_ms
+
+setup()
+
+
+def seed(company, count):
+    from items.models import Category, Item, UnitOfMeasure
+
+    rng = random.Random(42)
+    uoms = list(UnitOfMeasure.objects.all()[:3])
+    categories = Category.objects.bulk_create(
+        Category(company=company, name=f'Category {i}') for i in range(10)
+    )
+    batch = []
+    for i in range(count):
+        batch.append(Item(
+            company=company,
+            name=f'Item {i:06d}',
+            description='grade A' if i % 3 else '',
+            item_type=rng.choice(('raw', 'bom')),
+            unit_of_measurement=rng.choice(uoms),
+            # ~1 in 5 uncategorised, to cover the omitted category_name key
+            category=rng.choice(categories) if i % 5 else None,
+            is_active=bool(i % 7),
+        ))
+        if len(batch) == 5000:
+            Item.objects.bulk_create(batch)
+            batch = []
+    Item.objects.bulk_create(batch)
+
+
+def main(sizes):
+    from django.db import connection
+    from rest_framework.renderers import JSONRenderer
+
+    from companies.models import Company
+    from items.models import Item
+    from items.pagination import ItemPagination
+    from items.projections import item_list_projection, serialize_item_rows
+
+    ordering = ItemPagination.ordering
+    renderer = JSONRenderer()
+    rows = []
+    for size in sizes:
+        company = Company.objects.create(name=f'Bench Co {size}')
+        seed(company, size)
+        base = (
+            Item.objects
+            .filter(company=company)
+            .select_related('unit_of_measurement', 'category')
+            .order_by(*ordering)
+        )
+
+        def serializer():
+            return renderer.render(serialize_item_rows(list(base), fast=False))
+
+        def projection():
+            return renderer.render(serialize_item_rows(list(item_list_projection.values(base)), fast=True))
+
+        assert serializer() == projection(), f'outputs differ at {size} rows'
+
+        repeat = 5 if size <= 10_000 else 3
+        slow_ms = time_ms(serializer, repeat=repeat)
+        fast_ms = time_ms(projection, repeat=repeat)
+        rows.append((size, f'{slow_ms:.1f}', f'{fast_ms:.1f}', f'{slow_ms / fast_ms:.1f}x', 'yes'))
+
+    print(f'\nItem list rendering, {connection.vendor}')
+    print_table(['rows', 'serializer ms', 'projection ms', 'speedup', 'identical'], rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+    with test_database():
+        main(args.sizes)
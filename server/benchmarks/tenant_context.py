@@ -0,0 +1,160 @@
+"""
+Queries per request for company-scoped endpoints: legacy resolution
+(get_object_or_404(Company) + get_object_or_404(Membership) + permission query)
+versus the single-query tenant context resolver.
+
+    cd server && python -m benchmarks.tenant_context [--baseline REF]
+
+With --baseline, the "before" column is measured by running the same endpoint
+script against a temporary git worktree checked out at REF (e.g. the commit
+before the tenant resolver landed); without it only the current tree is measured.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from functools import reduce
+from operator import or_
+from pathlib import Path
+
+from benchmarks.harness import count_queries, print_table, setup, test_database, time_ms
+
+setup()
+
+ENDPOINTS = [
+    ('roles list', 'GET', '/api/access/companies/{cid}/roles/'),
+    ('my permissions', 'GET', '/api/access/companies/{cid}/my-permissions/'),
+    ('items list', 'GET', '/api/items/companies/{cid}/items/'),
+    ('categories list', 'GET', '/api/items/companies/{cid}/categories/'),
+    ('sent invites', 'GET', '/api/invites/companies/{cid}/sent/'),
+]
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+
+
+def join_resolve(user, company_id):
+    """Pre-bitmask path: company, membership, then the four-table membership_has_perm join."""
+    from django.shortcuts import get_object_or_404
+
+    from access.models import Membership, Permission
+    from companies.models import Company
+
+    company = get_object_or_404(Company, id=company_id)
+    membership = get_object_or_404(Membership, user=user, company=company, is_active=True)
+    allowed = Permission.objects.filter(
+        key='roles.view',
+        permission_roles__role__assigned_memberships__membership=membership,
+    ).exists()
+    return company, membership, allowed
+
+
+def legacy_resolve(user, company_id):
+    """What every company-scoped view did right before the tenant resolver (role masks, no cache)."""
+    from django.shortcuts import get_object_or_404
+
+    from access.models import Membership, Role
+    from companies.models import Company
+
+    company = get_object_or_404(Company, id=company_id)
+    membership = get_object_or_404(Membership, user=user, company=company, is_active=True)
+    masks = Role.objects.filter(assigned_memberships__membership=membership).values_list('permission_mask', flat=True)
+    return company, membership, reduce(or_, masks, 0)
+
+
+def tenant_resolve(user, company_id):
+    from django.test import RequestFactory
+
+    from access.services.tenant import resolve_tenant
+
+    request = RequestFactory().get('/')
+    request.user = user
+    return resolve_tenant(request, company_id)
+
+
+def create_owner():
+    from rest_framework.test import APIClient
+
+    from users.models import User
+
+    user = User.objects.create_user(username='bench', email='bench@example.com', password='bench-pass-123')
+    client = APIClient()
+    client.force_authenticate(user)
+    company_id = client.post('/api/companies/', {'name': 'Bench Co'}, format='json').json()['id']
+    return user, client, company_id
+
+
+def endpoint_queries(client, company_id):
+    """{label: [status, queries]} for every endpoint, measured in the running tree."""
+    counts = {}
+    for label, method, url in ENDPOINTS:
+        response, queries = count_queries(lambda: client.generic(method, url.format(cid=company_id)))
+        counts[label] = [response.status_code, queries]
+    return counts
+
+
+def baseline_queries(ref):
+    """
+    Runs `--endpoints-json` against a worktree at `ref`. The worktree's own
+    server/ comes first on sys.path, so only this harness is borrowed from
+    the current tree; views, models and migrations are the baseline's.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        worktree = Path(tmp) / 'baseline'
+        subprocess.run(
+            ['git', 'worktree', 'add', '--detach', '--quiet', str(worktree), ref],
+            cwd=SERVER_DIR, check=True,
+        )
+        try:
+            env = {**os.environ, 'PYTHONPATH': str(SERVER_DIR)}
+            result = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.tenant_context', '--endpoints-json'],
+                cwd=worktree / 'server', env=env, check=True, capture_output=True, text=True,
+            )
+        finally:
+            subprocess.run(['git', 'worktree', 'remove', '--force', str(worktree)], cwd=SERVER_DIR, check=True)
+    # settings.py may print to stdout; the JSON is the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(baseline):
+    user, client, company_id = create_owner()
+
+    print('\nTenant resolution only')
+    rows = []
+    for label, fn in [
+        ('membership_has_perm join', join_resolve),
+        ('legacy (role masks)', legacy_resolve),
+        ('tenant resolver', tenant_resolve),
+    ]:
+        _, queries = count_queries(lambda: fn(user, company_id))
+        rows.append((label, queries, f'{time_ms(lambda: fn(user, company_id)):.2f}'))
+    print_table(['resolver', 'queries', 'median ms'], rows)
+
+    after = endpoint_queries(client, company_id)
+    print('\nQueries per request')
+    if baseline is None:
+        rows = [(label, status, queries) for label, (status, queries) in after.items()]
+        print_table(['endpoint', 'status', 'queries'], rows)
+        return
+
+    before = baseline_queries(baseline)
+    rows = []
+    for label, (status, queries) in after.items():
+        before_status, before_queries = before.get(label, ['-', '-'])
+        rows.append((label, f'{before_status}/{status}', before_queries, queries))
+    print(f'before = {baseline}, after = working tree')
+    print_table(['endpoint', 'status', 'before', 'after'], rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--baseline', metavar='REF', help='git ref to measure the "before" column at')
+    parser.add_argument('--endpoints-json', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    with test_database():
+        if args.endpoints_json:
+            print(json.dumps(endpoint_queries(*create_owner()[1:])))
+        else:
+            main(args.baseline)
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-17 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_alter_company_date_created'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='access_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -22,6 +22,10 @@ class Company(models.Model):
         date_created (DateTimeField):
             Timestamp indicating when the company record
             was created in the system.
+
+        access_version (PositiveIntegerField):
+            Counter bumped on every role/permission/membership change
+            inside the company. Used to invalidate cached permission sets.
     """
     name = models.CharField(
         max_length=255,
@@ -41,6 +45,7 @@ class Company(models.Model):
 
     description = models.TextField(blank=True, default="")
     date_created = models.DateTimeField(auto_now_add=True, db_index=True)
+    access_version = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         db_table = 'companies'
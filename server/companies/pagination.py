@@ -1,14 +1,17 @@
-from rest_framework.pagination import PageNumberPagination
+from core.pagination import KeysetPagination
 
 
-class MyCompaniesPagination(PageNumberPagination):
+class MyCompaniesPagination(KeysetPagination):
     """
     Pagination strategy for listing companies where the user is a member.
 
+    - Keyset over the membership's (joined_at, id), most recently joined first
+      (the view annotates both onto each company row)
     - Default: 10 per page
     - Allows client override via ?page_size=
     - Hard cap prevents abuse
     """
+    ordering = ("-joined_at", "-membership_id")
     page_size = 10
     page_size_query_param = "page_size"
-    max_page_size = 50
\ No newline at end of file
+    max_page_size = 50
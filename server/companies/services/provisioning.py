@@ -0,0 +1,231 @@
+"""
+Batched tenant provisioning.
+
+Creating a company means: company row, the owner's membership, the system
+"Owner" role (+ any default roles), their RolePermission rows and the owner's
+MembershipRole. Done row by row that is ~6 round trips per company; here every
+table gets one bulk INSERT per batch, masks are computed in Python and the
+permission ids come from the in-memory registry (no per-company reads).
+
+Used by CompanyCreateView (a batch of one), the admin provisioning API and the
+`provision_companies` management command.
+"""
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from access.models import AccessAuditEvent, Membership, MembershipRole, Role, RolePermission
+from access.services.audit import write_events
+from access.services.catalog import permission_registry
+from access.services.permissions import mask_for_keys
+from access.services.roles import validate_role_definitions
+from companies.models import Company
+from core.validation import is_id
+from users.models import User
+
+OWNER_ROLE = {
+    'name': 'Owner',
+    'description': 'Full access to manage the company.',
+}
+
+BATCH_SIZE = 500
+
+
+@dataclass
+class ProvisionReport:
+    created: list = field(default_factory=list)   # [{"row", "company_id", "name"}]
+    skipped: list = field(default_factory=list)   # [{"row", "name", "detail"}]
+    rows: Counter = field(default_factory=Counter)
+    seconds: float = 0.0
+
+    @property
+    def total_rows(self):
+        return sum(self.rows.values())
+
+    def as_dict(self):
+        seconds = self.seconds or 1e-9
+        return {
+            'created': len(self.created),
+            'skipped': len(self.skipped),
+            'rows': dict(self.rows),
+            'seconds': round(self.seconds, 3),
+            'rows_per_second': round(self.total_rows / seconds, 1),
+            'companies_per_second': round(len(self.created) / seconds, 1),
+            'results': self.created,
+            'errors': self.skipped,
+        }
+
+
+def validate_default_roles(definitions):
+    """
+    Default roles added next to Owner, checked by the same validator as bulk role
+    cloning. Raises RoleDefinitionError (a malformed entry, unknown permissions,
+    a clash with the system Owner role).
+    """
+    return validate_role_definitions(definitions or [], reserved_names=(OWNER_ROLE['name'],))
+
+
+def bootstrap_companies(owners, roles=()) -> Counter:
+    """
+    Access-control bootstrap for freshly inserted companies.
+
+    owners: [(company, owner_user_id)] — companies must already have primary keys.
+    roles:  validated default role definitions added next to Owner.
+
+    Four bulk INSERTs whatever the number of companies. Returns rows written per table.
+    """
+    ids = permission_registry.ids
+    definitions = [
+        {**OWNER_ROLE, 'permission_keys': list(ids), 'is_system': True},
+        *({**role, 'is_system': False} for role in roles),
+    ]
+    for definition in definitions:
+        definition['mask'] = mask_for_keys(definition['permission_keys'])
+
+    memberships = Membership.objects.bulk_create([
+        Membership(company_id=company.pk, user_id=user_id, is_active=True)
+        for company, user_id in owners
+    ], batch_size=BATCH_SIZE)
+
+    new_roles = Role.objects.bulk_create([
+        Role(
+            company_id=company.pk,
+            name=definition['name'],
+            description=definition['description'],
+            is_system=definition['is_system'],
+            permission_mask=definition['mask'],
+        )
+        for company, _ in owners
+        for definition in definitions
+    ], batch_size=BATCH_SIZE)
+
+    keys_by_name = {d['name']: d['permission_keys'] for d in definitions}
+    role_permissions = RolePermission.objects.bulk_create([
+        RolePermission(role_id=role.pk, permission_id=ids[key])
+        for role in new_roles
+        for key in keys_by_name[role.name]
+    ], batch_size=BATCH_SIZE)
+
+    owner_roles = {role.company_id: role.pk for role in new_roles if role.name == OWNER_ROLE['name']}
+    membership_roles = MembershipRole.objects.bulk_create([
+        MembershipRole(membership_id=membership.pk, role_id=owner_roles[membership.company_id])
+        for membership in memberships
+    ], batch_size=BATCH_SIZE)
+
+    return Counter({
+        'memberships': len(memberships),
+        'roles': len(new_roles),
+        'role_permissions': len(role_permissions),
+        'membership_roles': len(membership_roles),
+    })
+
+
+def _is_text(value):
+    return isinstance(value, str) and bool(value)
+
+
+def _resolve_owners(specs):
+    """{row_index: user_id} from each spec's owner_id or owner_email (two queries at most)."""
+    owner_ids = {s['owner_id'] for s in specs if is_id(s.get('owner_id'))}
+    owner_emails = {s['owner_email'].lower() for s in specs if not s.get('owner_id') and _is_text(s.get('owner_email'))}
+
+    known_ids = set(User.objects.filter(pk__in=owner_ids, is_active=True).values_list('pk', flat=True))
+    by_email = {
+        email.lower(): pk for pk, email in
+        User.objects.filter(email__in=owner_emails, is_active=True).values_list('pk', 'email')
+    } if owner_emails else {}
+
+    resolved = {}
+    for index, spec in enumerate(specs):
+        if spec.get('owner_id'):
+            user_id = spec['owner_id'] if is_id(spec['owner_id']) and spec['owner_id'] in known_ids else None
+        else:
+            email = spec.get('owner_email')
+            user_id = by_email.get(email.lower()) if _is_text(email) else None
+        if user_id is not None:
+            resolved[index] = user_id
+    return resolved
+
+
+def provision_companies(specs, roles=(), batch_size=BATCH_SIZE, actor_id=None) -> ProvisionReport:
+    """
+    Creates many companies with their owners and default roles.
+
+    specs: [{"name", "description"?, "owner_id" | "owner_email"}]
+    roles: validated default role definitions (see validate_default_roles)
+
+    Invalid rows (bad/duplicate/taken name, unknown owner) are reported and skipped.
+    Each batch commits in its own transaction, so a failure only rolls back that batch.
+    Every batch also writes one "company.provisioned" audit event per company.
+    """
+    report = ProvisionReport()
+    started = time.perf_counter()
+
+    specs = list(specs)
+    owners = _resolve_owners(specs)
+    name_field = Company._meta.get_field('name')
+
+    valid, seen = [], set()
+    for index, spec in enumerate(specs):
+        name = spec.get('name').strip() if _is_text(spec.get('name')) else ''
+        detail = None
+        try:
+            name_field.clean(name, None)
+        except ValidationError as exc:
+            detail = ' '.join(exc.messages)
+        if detail is None and name in seen:
+            detail = 'Duplicate company name in this batch.'
+        elif detail is None and index not in owners:
+            detail = 'Owner not found.'
+
+        seen.add(name)
+        if detail:
+            report.skipped.append({'row': index, 'name': name, 'detail': detail})
+        else:
+            valid.append((index, name, spec.get('description') if isinstance(spec.get('description'), str) else ''))
+
+    for start in range(0, len(valid), batch_size):
+        batch = valid[start:start + batch_size]
+        taken = set(Company.objects.filter(name__in=[name for _, name, _ in batch]).values_list('name', flat=True))
+
+        rows = []
+        for index, name, description in batch:
+            if name in taken:
+                report.skipped.append({'row': index, 'name': name, 'detail': 'A company with that name already exists.'})
+            else:
+                rows.append((index, name, description))
+        if not rows:
+            continue
+
+        with transaction.atomic():
+            companies = Company.objects.bulk_create([
+                Company(name=name, description=description) for _, name, description in rows
+            ])
+            report.rows['companies'] += len(companies)
+            report.rows += bootstrap_companies(
+                [(company, owners[index]) for company, (index, _, _) in zip(companies, rows)],
+                roles=roles,
+            )
+            write_events([
+                AccessAuditEvent(
+                    company_id=company.pk,
+                    actor_id=actor_id,
+                    action='company.provisioned',
+                    target_type='company',
+                    target_id=company.pk,
+                    data={'owner_id': owners[index], 'roles': [role['name'] for role in roles]},
+                )
+                for company, (index, _, _) in zip(companies, rows)
+            ])
+
+        report.created += [
+            {'row': index, 'company_id': company.pk, 'name': company.name}
+            for company, (index, _, _) in zip(companies, rows)
+        ]
+
+    report.skipped.sort(key=lambda row: row['row'])
+    report.seconds = time.perf_counter() - started
+    return report
@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import CompanyCreateView, MyCompaniesListView
+from .views import CompanyCreateView, CompanyProvisionView, MyCompaniesListView
 
 urlpatterns = [
     path("", CompanyCreateView.as_view(), name="company-create"),
     path("me/", MyCompaniesListView.as_view(), name="my-companies"),
+    path("provision/", CompanyProvisionView.as_view(), name="company-provision"),
 ]
\ No newline at end of file
@@ -1,19 +1,23 @@
 from django.db import transaction
-from rest_framework import generics
-from rest_framework.permissions import IsAuthenticated
+from django.db.models import F
+from rest_framework import generics, status
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from .models import Company
 from .serializers import CompanyCreateSerializer, CompanyListSerializer
 from .pagination import MyCompaniesPagination
-
-from access.models import (
-    Membership,
-    Role,
-    Permission,
-    RolePermission,
-    MembershipRole,
+from .services.provisioning import (
+    BATCH_SIZE,
+    bootstrap_companies,
+    provision_companies,
+    validate_default_roles,
 )
 
+from access.services import audit
+from access.services.roles import RoleDefinitionError
+
 
 class CompanyCreateView(generics.CreateAPIView):
     """
@@ -21,49 +25,64 @@ class CompanyCreateView(generics.CreateAPIView):
 
     - Create the Company record
     - Create Membership for request.user in that company
-    - Create a system "Owner" role for the company (if not exists)
+    - Create a system "Owner" role for the company
     - Assign ALL system permissions to the Owner role
     - Assign Owner role to the creator's membership
+
+    The bootstrap is the batched provisioning path with a batch of one:
+    one INSERT per table, permission ids from the in-memory registry.
     """
     permission_classes = [IsAuthenticated]
     serializer_class = CompanyCreateSerializer
 
     @transaction.atomic
     def perform_create(self, serializer):
-        # 1) Create company
         company = serializer.save()
+        bootstrap_companies([(company, self.request.user.pk)])
+        audit.record(self.request, company, 'company.created', target=company, owner_id=self.request.user.pk)
+
+
+class CompanyProvisionView(APIView):
+    """
+    POST /api/companies/provision/
+    Admin only. Provisions many companies with their owners and default roles.
+
+    Body:
+        {
+          "companies": [{"name": "...", "description": "...", "owner_email": "..."}, ...],
+          "roles": [{"name": "Viewer", "description": "...", "permission_keys": ["items.view"]}],
+          "batch_size": 500
+        }
+    Each company may give "owner_id" instead of "owner_email".
 
-        # 2) Ensure creator becomes an active member of the new company
-        membership, _ = Membership.objects.get_or_create(
-            user=self.request.user,
-            company=company,
-            defaults={"is_active": True},
-        )
-
-        # 3) Create the company-scoped "Owner" role (system role)
-        owner_role, _ = Role.objects.get_or_create(
-            company=company,
-            name="Owner",
-            defaults={
-                "description": "Full access to manage the company.",
-                "is_system": True,
-            },
-        )
-
-        # 4) Grant ALL permissions to the Owner role
-        #    (Permissions are system-defined and seeded from permissions.py)
-        permissions = Permission.objects.all().only("id")
-
-        RolePermission.objects.bulk_create(
-            [RolePermission(role=owner_role, permission=p) for p in permissions],
-            ignore_conflicts=True,  # safe if rerun / duplicates
-        )
-
-        # 5) Assign Owner role to the creator
-        MembershipRole.objects.get_or_create(
-            membership=membership,
-            role=owner_role,
-        )
+    Invalid rows are skipped and reported; the response carries per-table row
+    counts and rows per second.
+    """
+    permission_classes = [IsAdminUser]
+    max_companies = 10000
+
+    def post(self, request):
+        specs = request.data.get('companies')
+        if not isinstance(specs, list) or not specs or not all(isinstance(s, dict) for s in specs):
+            return Response({'detail': 'companies must be a non-empty list of objects.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(specs) > self.max_companies:
+            return Response(
+                {'detail': f'At most {self.max_companies} companies per request.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            roles = validate_default_roles(request.data.get('roles'))
+        except RoleDefinitionError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            batch_size = max(1, min(int(request.data.get('batch_size', BATCH_SIZE)), BATCH_SIZE * 4))
+        except (TypeError, ValueError):
+            return Response({'detail': 'batch_size must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        report = provision_companies(specs, roles=roles, batch_size=batch_size, actor_id=request.user.pk)
+        return Response(report.as_dict(), status=status.HTTP_201_CREATED if report.created else status.HTTP_200_OK)
 
 
 class MyCompaniesListView(generics.ListAPIView):
@@ -76,11 +95,16 @@ class MyCompaniesListView(generics.ListAPIView):
     pagination_class = MyCompaniesPagination
 
     def get_queryset(self):
+        # One membership per (user, company), so the join yields no duplicates
+        # and the annotations below read from that same membership row.
         return (
             Company.objects.filter(
                 memberships__user=self.request.user,
                 memberships__is_active=True,
             )
-            .distinct()
-            .order_by("-memberships__joined_at")  # Most recently joined first
+            .annotate(
+                joined_at=F("memberships__joined_at"),
+                membership_id=F("memberships__id"),
+            )
+            .order_by("-joined_at", "-membership_id")  # Most recently joined first
         )
\ No newline at end of file
@@ -0,0 +1,199 @@
+"""
+Keyset (seek) pagination shared by the list endpoints.
+
+PageNumberPagination costs a COUNT(*) plus an OFFSET scan on every page, so deep
+pages get linearly slower. Keyset pagination remembers the sort key of the last
+row instead and asks for rows strictly after it:
+
+    WHERE joined_at <= :t AND (joined_at < :t OR (joined_at = :t AND id < :id))
+    ORDER BY joined_at DESC, id DESC
+    LIMIT :page_size + 1
+
+which a composite index on the ordering columns answers without scanning skipped
+rows. The last ordering field must be unique (usually `id`) and none may be NULL.
+
+Query params:
+    ?cursor=<opaque>        position returned in `next` / `previous`
+    ?page_size=N            capped by max_page_size
+    ?include_total=true     adds an exact `count` (costs one COUNT(*))
+    ?page=N                 legacy page-number mode, same response shape as before
+"""
+import base64
+import binascii
+import datetime
+import json
+from decimal import Decimal
+
+from django.db.models import Q
+from django.utils.encoding import force_str
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    ordering = ('-id',)
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    cursor_query_param = 'cursor'
+    total_query_param = 'include_total'
+    # Presence of ?page= switches to PageNumberPagination (compatibility mode)
+    page_query_param = 'page'
+
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.legacy = None
+
+        if self.page_query_param in request.query_params:
+            self.legacy = self.get_page_number_pagination()
+            return self.legacy.paginate_queryset(queryset.order_by(*self.ordering), request, view)
+
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        ordering = [self._flip(f) for f in self.ordering] if reverse else list(self.ordering)
+        rows = queryset.order_by(*ordering)
+        if position is not None:
+            rows = rows.filter(self.seek_filter(ordering, position))
+
+        rows = list(rows[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.first_position = self.get_position(rows[0]) if rows else None
+        self.last_position = self.get_position(rows[-1]) if rows else None
+        self.count = queryset.count() if self.include_total(request) else None
+        return rows
+
+    def get_paginated_response(self, data):
+        if self.legacy is not None:
+            return self.legacy.get_paginated_response(data)
+
+        payload = {'next': self.get_next_link(), 'previous': self.get_previous_link(), 'results': data}
+        if self.count is not None:
+            payload = {'count': self.count, **payload}
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'example': 123},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    # ── Page size / legacy mode ──────────────────────────────────────────────
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def include_total(self, request):
+        return request.query_params.get(self.total_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def get_page_number_pagination(self):
+        paginator = PageNumberPagination()
+        paginator.page_size = self.page_size
+        paginator.page_size_query_param = self.page_size_query_param
+        paginator.max_page_size = self.max_page_size
+        paginator.page_query_param = self.page_query_param
+        return paginator
+
+    # ── Seek condition ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def seek_filter(ordering, position):
+        """
+        Rows strictly after `position` in `ordering` (mixed directions allowed):
+            f1 ≷ v1  OR  (f1 = v1 AND f2 ≷ v2)  OR  ...
+        The redundant leading `f1 ≷= v1` gives the planner an index range to scan.
+        """
+        lookups = [
+            (field.lstrip('-'), 'lt' if field.startswith('-') else 'gt')
+            for field in ordering
+        ]
+        condition = Q()
+        for i, (name, op) in enumerate(lookups):
+            clause = Q(**{f'{name}__{op}': position[i]})
+            for (prev, _), value in zip(lookups[:i], position):
+                clause &= Q(**{prev: value})
+            condition |= clause
+
+        lead, op = lookups[0]
+        return Q(**{f'{lead}__{op}e': position[0]}) & condition
+
+    # ── Cursor encoding ──────────────────────────────────────────────────────
+
+    def get_position(self, row):
+        # Model instances, or dicts from .values() querysets
+        if isinstance(row, dict):
+            return [row[field.lstrip('-')] for field in self.ordering]
+        return [getattr(row, field.lstrip('-')) for field in self.ordering]
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    def encode_cursor(self, position, reverse):
+        raw = json.dumps({'p': [self._encode_value(v) for v in position], 'r': int(reverse)})
+        token = base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.total_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(force_str(token) + '=' * (-len(token) % 4))
+            data = json.loads(raw)
+            position, reverse = data['p'], bool(data['r'])
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        return self.encode_cursor(self.last_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first_position is None:
+            # Walked past the end: the previous page ends where the cursor pointed
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.encode_cursor(self.first_position, reverse=True)
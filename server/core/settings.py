@@ -65,6 +65,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'access.middleware.TenantContextMiddleware',
+    'access.middleware.AuditMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -176,6 +178,45 @@ JWT_AUTH_COOKIE_SECURE = not DEBUG  # Set to True in production
 JWT_AUTH_COOKIE_HTTP_ONLY = True  # Prevents JavaScript access
 JWT_AUTH_COOKIE_SAMESITE = 'Lax'  # CSRF protection
 JWT_AUTH_COOKIE_PATH = '/'
+
+# Embed a per-company permission digest in access tokens (see access/services/claims.py)
+ACCESS_JWT_PERMISSION_CLAIMS = os.getenv("ACCESS_JWT_PERMISSION_CLAIMS", "false").lower() == "true"
+# Keeps the access cookie well under the 4KB browser limit
+ACCESS_JWT_PERMISSION_CLAIMS_MAX_COMPANIES = int(os.getenv("ACCESS_JWT_PERMISSION_CLAIMS_MAX_COMPANIES", "100"))
+# ==================================
+
+
+# ========== ACCESS CACHE ==========
+# Membership permission masks are cached per membership + company access version.
+# ALIAS points at an entry in CACHES (LocMem by default; use Redis/Memcached
+# in production so workers share warm entries).
+ACCESS_PERMISSION_CACHE = {
+    'ALIAS': 'default',
+    'LOCAL_MAXSIZE': int(os.getenv("ACCESS_PERMISSION_CACHE_LOCAL_MAXSIZE", "4096")),
+    'TIMEOUT': int(os.getenv("ACCESS_PERMISSION_CACHE_TIMEOUT", "3600")),
+    'KEY_PREFIX': 'access:mask',
+}
+# ==================================
+
+
+# ========== ITEMS LIST ==========
+# Catalog list pagination; ?stream=true reads STREAM_CHUNK_SIZE rows at a time.
+ITEMS_LIST = {
+    'PAGE_SIZE': int(os.getenv("ITEMS_LIST_PAGE_SIZE", "50")),
+    'MAX_PAGE_SIZE': int(os.getenv("ITEMS_LIST_MAX_PAGE_SIZE", "500")),
+    'STREAM_CHUNK_SIZE': int(os.getenv("ITEMS_LIST_STREAM_CHUNK_SIZE", "2000")),
+}
+# ================================
+
+
+# ========== ACCESS AUDIT ==========
+# Audit events are written in one bulk insert per request. BACKGROUND moves
+# that insert to a writer thread that flushes every FLUSH_INTERVAL seconds.
+ACCESS_AUDIT = {
+    'BACKGROUND': os.getenv("ACCESS_AUDIT_BACKGROUND", "false").lower() == "true",
+    'FLUSH_INTERVAL': float(os.getenv("ACCESS_AUDIT_FLUSH_INTERVAL", "1.0")),
+    'MAX_BATCH': 500,
+}
 # ==================================
 
 
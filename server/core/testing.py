@@ -0,0 +1,23 @@
+"""
+Shared test fixtures for the apps' tests.py modules.
+"""
+from rest_framework.test import APIClient
+
+from access.services.cache import permission_cache
+from companies.models import Company
+from users.models import User
+
+
+class CompanyFixturesMixin:
+    """Owner + company bootstrapped through the real CompanyCreateView."""
+
+    def setUp(self):
+        super().setUp()
+        # Database ids are reused between tests: neither cache tier may carry entries over
+        permission_cache.clear()
+        permission_cache.backend.clear()
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pass-12345')
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        response = self.client.post('/api/companies/', {'name': 'Acme'}, format='json')
+        self.company = Company.objects.get(pk=response.json()['id'])
@@ -0,0 +1,8 @@
+"""
+Shape checks for values taken from request bodies.
+"""
+
+
+def is_id(value):
+    """A JSON integer usable as a primary key — bool is an int subclass, so true/false are not."""
+    return isinstance(value, int) and not isinstance(value, bool)
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-17 03:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('access', '0006_keyset_pagination_indexes'),
+        ('companies', '0003_company_access_version'),
+        ('invites', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='invite',
+            name='idx_invite_email_status',
+        ),
+        migrations.AddIndex(
+            model_name='invite',
+            index=models.Index(fields=['invitee_email', 'status', '-created_at', '-id'], name='idx_invite_email_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='invite',
+            index=models.Index(fields=['company', '-created_at', '-id'], name='idx_invite_company_keyset'),
+        ),
+    ]
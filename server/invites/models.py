@@ -97,8 +97,13 @@ class Invite(models.Model):
             )
         ]
         indexes = [
-            models.Index(fields=['invitee_email', 'status'], name='idx_invite_email_status'),
             models.Index(fields=['company', 'status'], name='idx_invite_company_status'),
+            # Keyset pagination: received (email, status) and sent (company) lists
+            models.Index(
+                fields=['invitee_email', 'status', '-created_at', '-id'],
+                name='idx_invite_email_keyset',
+            ),
+            models.Index(fields=['company', '-created_at', '-id'], name='idx_invite_company_keyset'),
         ]
     
     def __str__(self) -> str:
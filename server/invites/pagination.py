@@ -1,7 +1,9 @@
-from rest_framework.pagination import PageNumberPagination
+from core.pagination import KeysetPagination
 
 
-class InvitePagination(PageNumberPagination):
+class InvitePagination(KeysetPagination):
+    """Newest invites first; served by the (company|email, ..., created_at, id) indexes."""
+    ordering = ('-created_at', '-id')
     page_size = 10
     page_size_query_param = 'page_size'
-    max_page_size = 50
\ No newline at end of file
+    max_page_size = 50
@@ -12,9 +12,10 @@ from .serializers import (
     InviteDetailSerializer
 )
 from .pagination import InvitePagination
-from companies.models import Company
 from access.models import Membership
-from access.services.permissions import membership_has_perm
+from access.services import audit
+from access.services.permissions import bump_access_version, mask_has_perm
+from access.services.tenant import get_tenant
 
 
 class CompanyInviteCreateView(generics.CreateAPIView):
@@ -26,25 +27,20 @@ class CompanyInviteCreateView(generics.CreateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = InviteCreateSerializer
     
+    def get_tenant(self):
+        return get_tenant(self.request, self.kwargs.get('company_id'))
+    
     def get_company(self):
-        company_id = self.kwargs.get('company_id')
-        return get_object_or_404(Company, id=company_id)
+        return self.get_tenant().company
     
     def get_membership(self):
-        company = self.get_company()
-        return get_object_or_404(
-            Membership,
-            user=self.request.user,
-            company=company,
-            is_active=True
-        )
+        return self.get_tenant().membership
     
     def post(self, request, *args, **kwargs):
         company = self.get_company()
-        membership = self.get_membership()
         
-        # Check permission
-        if not membership_has_perm(membership, 'members.invite'):
+        # Check permission (token claims, permission cache or tenant query)
+        if not mask_has_perm(self.get_tenant().perm_mask, 'members.invite'):
             return Response(
                 {'detail': 'You do not have permission to invite members.'},
                 status=status.HTTP_403_FORBIDDEN
@@ -61,6 +57,10 @@ class CompanyInviteCreateView(generics.CreateAPIView):
             inviter=request.user,
             company=company
         )
+        audit.record(
+            request, company, 'invite.created', target=invite,
+            email=invite.invitee_email, role_id=invite.role_id,
+        )
         
         # TODO: Send invitation email here
         # send_invitation_email(invite)
@@ -81,25 +81,20 @@ class CompanySentInvitesView(generics.ListAPIView):
     serializer_class = InviteListSerializer
     pagination_class = InvitePagination
     
+    def get_tenant(self):
+        return get_tenant(self.request, self.kwargs.get('company_id'))
+    
     def get_company(self):
-        company_id = self.kwargs.get('company_id')
-        return get_object_or_404(Company, id=company_id)
+        return self.get_tenant().company
     
     def get_membership(self):
-        company = self.get_company()
-        return get_object_or_404(
-            Membership,
-            user=self.request.user,
-            company=company,
-            is_active=True
-        )
+        return self.get_tenant().membership
     
     def get_queryset(self):
         company = self.get_company()
-        membership = self.get_membership()
         
-        # Check permission
-        if not membership_has_perm(membership, 'members.view'):
+        # Check permission (token claims, permission cache or tenant query)
+        if not mask_has_perm(self.get_tenant().perm_mask, 'members.view'):
             return Invite.objects.none()
         
         return Invite.objects.filter(company=company).select_related(
@@ -176,6 +171,11 @@ class InviteAcceptView(APIView):
             membership=membership,
             role=invite.role
         )
+        bump_access_version(invite.company_id)
+        audit.record(
+            request, invite.company_id, 'member.joined', target=membership,
+            user_id=request.user.pk, role_ids=[invite.role_id], invite_id=invite.pk,
+        )
         
         # Update invite status
         invite.status = 'accepted'
@@ -224,19 +224,14 @@ class InviteCancelView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request, invite_id):
-        invite = get_object_or_404(Invite, id=invite_id)
+        invite = get_object_or_404(Invite.objects.select_related('company'), id=invite_id)
         
-        # Get membership
-        membership = get_object_or_404(
-            Membership,
-            user=request.user,
-            company=invite.company,
-            is_active=True
-        )
+        # Same tenant resolution as company-scoped views — also enforces membership
+        mask = get_tenant(request, invite.company_id).perm_mask
         
         # Check if user is inviter or has admin permission
         is_inviter = invite.inviter == request.user
-        has_permission = membership_has_perm(membership, 'members.manage')
+        has_permission = mask_has_perm(mask, 'members.manage')
         
         if not (is_inviter or has_permission):
             return Response(
@@ -252,6 +247,7 @@ class InviteCancelView(APIView):
         
         invite.status = 'cancelled'
         invite.save()
+        audit.record(request, invite.company_id, 'invite.cancelled', target=invite, email=invite.invitee_email)
         
         return Response(
             {'detail': 'Invitation cancelled.'},
@@ -0,0 +1,188 @@
+"""
+Multi-level BOM explosion.
+
+"What raw materials, in what quantities, do I need for N units of this item?"
+The item is expanded through its default recipe (Recipe.is_default — the newest
+one if several are flagged), every ingredient line scaled by
+
+    line.quantity × needed / recipe.output_quantity
+
+and BOM ingredients are expanded the same way, level after level.
+
+Loading: one query per BOM level (all default-recipe lines of the whole frontier
+at once), never one per node. An item shared by several sub-assemblies is
+loaded once, and totals are propagated over that shared graph in topological
+order, so they stay cheap even when the expanded tree would be huge. The tree
+itself is optional and capped at MAX_TREE_NODES.
+
+BOM items without a default recipe (or whose default recipe has no lines) can't
+be expanded: they are reported under "unresolved" and counted as leaves.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from .models import RecipeLine
+
+MAX_DEPTH = 64
+MAX_TREE_NODES = 10000
+
+
+class BomError(ValueError):
+    """The BOM can't be exploded (cycle, zero output quantity, too deep/large)."""
+
+
+@dataclass
+class BomGraph:
+    items: dict = field(default_factory=dict)     # item id → {"name", "uom", "item_type"}
+    recipes: dict = field(default_factory=dict)   # BOM item id → {"id", "name", "output_quantity", "lines": [(ingredient id, qty)]}
+    levels: int = 0
+
+
+def _item_info(name, uom, item_type):
+    return {'name': name, 'uom': uom, 'item_type': item_type}
+
+
+def load_graph(root) -> BomGraph:
+    """Default-recipe graph reachable from `root`, one query per level."""
+    graph = BomGraph()
+    graph.items[root.pk] = _item_info(root.name, root.unit_of_measurement.abbreviation, root.item_type)
+    frontier = {root.pk} if root.item_type == 'bom' else set()
+
+    while frontier:
+        if graph.levels >= MAX_DEPTH:
+            raise BomError(f'BOM is deeper than {MAX_DEPTH} levels.')
+        rows = (
+            RecipeLine.objects
+            .filter(recipe__output_item_id__in=frontier, recipe__is_default=True)
+            .order_by('recipe__output_item_id', '-recipe__created_at', '-recipe_id', 'id')
+            .values_list(
+                'recipe__output_item_id', 'recipe_id', 'recipe__name', 'recipe__output_quantity',
+                'ingredient_id', 'ingredient__name', 'ingredient__unit_of_measurement__abbreviation',
+                'ingredient__item_type', 'quantity',
+            )
+        )
+        graph.levels += 1
+
+        next_frontier = set()
+        for output_id, recipe_id, recipe_name, output_quantity, ingredient_id, name, uom, item_type, quantity in rows:
+            recipe = graph.recipes.get(output_id)
+            if recipe is None:
+                # First row per output item belongs to its newest default recipe
+                if output_quantity <= 0:
+                    raise BomError(f'Recipe "{recipe_name or recipe_id}" of "{graph.items[output_id]["name"]}" has no output quantity.')
+                recipe = graph.recipes[output_id] = {
+                    'id': recipe_id, 'name': recipe_name, 'output_quantity': output_quantity, 'lines': [],
+                }
+            if recipe['id'] != recipe_id:
+                continue
+            recipe['lines'].append((ingredient_id, quantity))
+            if ingredient_id not in graph.items:
+                graph.items[ingredient_id] = _item_info(name, uom, item_type)
+                if item_type == 'bom':
+                    next_frontier.add(ingredient_id)
+        frontier = next_frontier
+    return graph
+
+
+def _check_acyclic(graph, root_id):
+    """Iterative DFS; raises BomError naming the cycle."""
+    state = {}  # item id → 1 on the current path, 2 done
+    path = []
+    stack = [(root_id, iter(graph.recipes.get(root_id, {}).get('lines', ())))]
+    state[root_id] = 1
+    path.append(root_id)
+    while stack:
+        item_id, lines = stack[-1]
+        for ingredient_id, _ in lines:
+            if state.get(ingredient_id) == 1:
+                cycle = path[path.index(ingredient_id):] + [ingredient_id]
+                raise BomError('BOM contains a cycle: ' + ' → '.join(graph.items[i]['name'] for i in cycle))
+            if ingredient_id not in state:
+                state[ingredient_id] = 1
+                path.append(ingredient_id)
+                stack.append((ingredient_id, iter(graph.recipes.get(ingredient_id, {}).get('lines', ()))))
+                break
+        else:
+            state[item_id] = 2
+            path.pop()
+            stack.pop()
+
+
+def requirements(graph, root_id, quantity):
+    """{item id: quantity needed} for every reachable item, in one topological pass."""
+    indegree = defaultdict(int)
+    for recipe in graph.recipes.values():
+        for ingredient_id, _ in recipe['lines']:
+            indegree[ingredient_id] += 1
+
+    need = defaultdict(float)
+    need[root_id] = quantity
+    ready = [root_id]
+    while ready:
+        item_id = ready.pop()
+        recipe = graph.recipes.get(item_id)
+        if recipe is None:
+            continue
+        factor = need[item_id] / recipe['output_quantity']
+        for ingredient_id, line_quantity in recipe['lines']:
+            need[ingredient_id] += line_quantity * factor
+            indegree[ingredient_id] -= 1
+            if indegree[ingredient_id] == 0:
+                ready.append(ingredient_id)
+    return need
+
+
+def build_tree(graph, item_id, quantity, budget):
+    """Indented tree; `budget` is a one-element list counting nodes left."""
+    budget[0] -= 1
+    if budget[0] < 0:
+        raise BomError(f'The expanded tree has more than {MAX_TREE_NODES} nodes; request totals only (tree=false).')
+    info = graph.items[item_id]
+    recipe = graph.recipes.get(item_id)
+    node = {'item': item_id, 'name': info['name'], 'uom': info['uom'], 'item_type': info['item_type'], 'quantity': quantity}
+    if recipe is None:
+        return node
+    factor = quantity / recipe['output_quantity']
+    node['recipe'] = {'id': recipe['id'], 'name': recipe['name'], 'output_quantity': recipe['output_quantity']}
+    node['children'] = [
+        build_tree(graph, ingredient_id, line_quantity * factor, budget)
+        for ingredient_id, line_quantity in recipe['lines']
+    ]
+    return node
+
+
+def explode(root, quantity, tree=True):
+    """
+    root: Item (with unit_of_measurement loaded), quantity: units of root to make.
+    Returns {"item", "quantity", "levels", "tree"?, "totals", "unresolved"}.
+    """
+    graph = load_graph(root)
+    _check_acyclic(graph, root.pk)
+    need = requirements(graph, root.pk, quantity)
+
+    # Everything that isn't expanded further — including the root itself when it can't be
+    leaves = [item_id for item_id in need if item_id not in graph.recipes]
+    totals = sorted(
+        (
+            {
+                'item': item_id,
+                'name': graph.items[item_id]['name'],
+                'uom': graph.items[item_id]['uom'],
+                'quantity': need[item_id],
+            }
+            for item_id in leaves
+        ),
+        key=lambda row: row['name'].lower(),
+    )
+    result = {
+        'item': root.pk,
+        'quantity': quantity,
+        'levels': graph.levels,
+        'totals': totals,
+        'unresolved': sorted(
+            item_id for item_id in leaves if graph.items[item_id]['item_type'] == 'bom'
+        ),
+    }
+    if tree:
+        result['tree'] = build_tree(graph, root.pk, quantity, [MAX_TREE_NODES])
+    return result
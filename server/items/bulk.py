@@ -0,0 +1,204 @@
+"""
+Bulk item edits.
+
+Two shapes, both validated with set-based queries (a handful per request,
+whatever the number of items):
+
+    per item    [{"id": 1, "is_active": false, "category": 4}, {"id": 2, "name": "..."}]
+                → current rows loaded with one `id__in` query, changed rows written
+                  with bulk_update in chunks; every row gets an outcome
+                  (updated | unchanged | error) and invalid rows don't block the rest.
+
+    uniform     filter {"category": 3, "active": true} + set {"is_active": false}
+                → one UPDATE ... WHERE, no rows loaded into Python.
+
+Editable fields match ItemDetailView.patch: name, description, unit_of_measurement,
+category, is_active. Names can't be set uniformly (they are unique per company).
+A rename to a name another item currently holds is rejected even if that item is
+renamed in the same request — the unique constraint is checked row by row.
+"""
+from django.db import transaction
+
+from core.validation import is_id
+
+from .facets import FACET_COLUMNS
+from .models import Category, Item, UnitOfMeasure
+from .search import match_items
+
+BULK_UPDATE_BATCH_SIZE = 500
+
+EDITABLE_FIELDS = ('name', 'description', 'unit_of_measurement', 'category', 'is_active')
+UNIFORM_FIELDS = ('description', 'unit_of_measurement', 'category', 'is_active')
+
+# request field → model attribute
+ATTRIBUTES = {
+    'name': 'name',
+    'description': 'description',
+    'unit_of_measurement': 'unit_of_measurement_id',
+    'category': 'category_id',
+    'is_active': 'is_active',
+}
+
+
+class BulkEditError(ValueError):
+    """Request-level problem (bad filter or values); nothing was written."""
+
+
+def _known_references(company, rows):
+    """Category and UOM ids referenced by `rows` that exist (two queries at most)."""
+    category_ids = {row['category'] for row in rows if is_id(row.get('category'))}
+    uom_ids = {row['unit_of_measurement'] for row in rows if is_id(row.get('unit_of_measurement'))}
+    categories = set(
+        Category.objects.filter(company=company, id__in=category_ids).values_list('id', flat=True)
+    ) if category_ids else set()
+    uoms = set(UnitOfMeasure.objects.filter(id__in=uom_ids).values_list('id', flat=True)) if uom_ids else set()
+    return categories, uoms
+
+
+def _check_value(name, value, categories, uoms):
+    """Error message for one field value, or None."""
+    if name == 'name':
+        if not isinstance(value, str) or not value.strip():
+            return 'name must be a non-empty string.'
+        if len(value.strip()) > Item._meta.get_field('name').max_length:
+            return 'name is too long.'
+    elif name == 'description':
+        if not isinstance(value, str):
+            return 'description must be a string.'
+    elif name == 'is_active':
+        if not isinstance(value, bool):
+            return 'is_active must be true or false.'
+    elif name == 'category':
+        if value is not None and (not is_id(value) or value not in categories):
+            return 'Category not found in this company.'
+    elif name == 'unit_of_measurement':
+        if not is_id(value) or value not in uoms:
+            return 'Unit of measure not found.'
+    return None
+
+
+def update_items(company, rows):
+    """
+    Per-item edits. Returns {"updated", "unchanged", "error", "results": [...]}.
+    """
+    dict_rows = [row for row in rows if isinstance(row, dict)]
+    ids = {row.get('id') for row in dict_rows if is_id(row.get('id'))}
+    fields = {name for row in dict_rows for name in EDITABLE_FIELDS if name in row}
+
+    # ── Set-based validation ─────────────────────────────────────────────────
+    items = Item.objects.filter(company=company, id__in=ids).only('id', *(ATTRIBUTES[f] for f in fields)).in_bulk()
+    categories, uoms = _known_references(company, dict_rows)
+    new_names = {row['name'].strip() for row in dict_rows if isinstance(row.get('name'), str)}
+    holders = dict(
+        Item.objects.filter(company=company, name__in=new_names).values_list('name', 'id')
+    ) if new_names else {}
+
+    results, changed, seen_ids, seen_names = [], {}, set(), set()
+    for row in rows:
+        item_id = row.get('id') if isinstance(row, dict) else None
+        changes = {name: row[name] for name in EDITABLE_FIELDS if name in row} if isinstance(row, dict) else {}
+        if isinstance(changes.get('name'), str):
+            changes['name'] = changes['name'].strip()
+
+        error = None
+        if not is_id(item_id):
+            error = 'id must be an id.'
+        elif item_id in seen_ids:
+            error = 'Duplicate id in this request.'
+        elif item_id not in items:
+            error = 'Item not found in this company.'
+        elif not changes:
+            error = f'Nothing to update; editable fields: {", ".join(EDITABLE_FIELDS)}.'
+        else:
+            error = next(filter(None, (_check_value(n, v, categories, uoms) for n, v in changes.items())), None)
+        if error is None and 'name' in changes:
+            if changes['name'] in seen_names:
+                error = 'Duplicate name in this request.'
+            elif holders.get(changes['name'], item_id) != item_id:
+                error = f'Item "{changes["name"]}" already exists in this company.'
+
+        if is_id(item_id):
+            seen_ids.add(item_id)
+        if error:
+            results.append({'id': item_id, 'status': 'error', 'detail': error})
+            continue
+
+        seen_names.add(changes.get('name'))
+        item = items[item_id]
+        diff = {ATTRIBUTES[n]: v for n, v in changes.items() if getattr(item, ATTRIBUTES[n]) != v}
+        for attribute, value in diff.items():
+            setattr(item, attribute, value)
+        if diff:
+            changed[item_id] = (item, diff)
+        results.append({'id': item_id, 'status': 'updated' if diff else 'unchanged'})
+
+    # ── Apply: bulk_update in chunks over the columns that actually changed ──
+    if changed:
+        columns = sorted({attribute for _, diff in changed.values() for attribute in diff})
+        with transaction.atomic():
+            Item.objects.bulk_update(
+                [item for item, _ in changed.values()],
+                columns,
+                batch_size=BULK_UPDATE_BATCH_SIZE,
+            )
+
+    summary = {key: 0 for key in ('updated', 'unchanged', 'error')}
+    for result in results:
+        summary[result['status']] += 1
+    return {**summary, 'results': results}
+
+
+def matching_items(company, filters):
+    """
+    filters: {"ids": [...], "type": "raw"|"bom", "active": bool, "category": id|null, "search": str}
+    At least one is required — a uniform edit of the whole catalog must be asked
+    for explicitly with {"all": true}.
+    """
+    if not isinstance(filters, dict) or not filters:
+        raise BulkEditError('filter must be a non-empty object.')
+    unknown = sorted(set(filters) - {'ids', 'type', 'active', 'category', 'search', 'all'})
+    if unknown:
+        raise BulkEditError(f'Unknown filter keys: {unknown}.')
+    if 'all' in filters and filters['all'] is not True:
+        raise BulkEditError('filter.all must be true.')
+
+    qs = Item.objects.filter(company=company)
+    if 'ids' in filters:
+        ids = filters['ids']
+        if not isinstance(ids, list) or not all(is_id(i) for i in ids):
+            raise BulkEditError('filter.ids must be a list of ids.')
+        qs = qs.filter(id__in=ids)
+    if 'type' in filters:
+        if not isinstance(filters['type'], str) or filters['type'] not in dict(Item.ITEM_TYPES):
+            raise BulkEditError('filter.type must be "raw" or "bom".')
+        qs = qs.filter(**{FACET_COLUMNS['type']: filters['type']})
+    if 'active' in filters:
+        if not isinstance(filters['active'], bool):
+            raise BulkEditError('filter.active must be true or false.')
+        qs = qs.filter(**{FACET_COLUMNS['active']: filters['active']})
+    if 'category' in filters:
+        if filters['category'] is not None and not is_id(filters['category']):
+            raise BulkEditError('filter.category must be an id or null.')
+        qs = qs.filter(**{FACET_COLUMNS['category']: filters['category']})
+    if 'search' in filters:
+        if not isinstance(filters['search'], str) or not filters['search'].strip():
+            raise BulkEditError('filter.search must be a non-empty string.')
+        qs = match_items(qs, filters['search'].strip())
+    return qs
+
+
+def update_matching(company, filters, values):
+    """Uniform edit as a single UPDATE. Returns the number of items matched."""
+    if not isinstance(values, dict) or not values:
+        raise BulkEditError('set must be a non-empty object.')
+    unknown = sorted(set(values) - set(UNIFORM_FIELDS))
+    if unknown:
+        raise BulkEditError(f'Fields that cannot be set uniformly: {unknown}.')
+
+    categories, uoms = _known_references(company, [values])
+    for name, value in values.items():
+        if error := _check_value(name, value, categories, uoms):
+            raise BulkEditError(error)
+
+    qs = matching_items(company, filters)
+    return qs.update(**{ATTRIBUTES[name]: value for name, value in values.items()})
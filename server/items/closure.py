@@ -0,0 +1,220 @@
+"""
+Materialized BOM closure (bom_closure) for where-used queries.
+
+"Which products contain this item, at any depth, and how much of it per unit?"
+Walking the recipe graph upwards costs one query per level; the closure table
+answers it with a single indexed read on `descendant`. One row per
+(ancestor, descendant) pair reachable through default recipes (the newest one
+if several are flagged — same rule as items/bom.py):
+
+    depth   shortest path, 1 = direct ingredient
+    factor  descendant quantity per unit of ancestor, i.e. the sum over every path of
+            the product of line.quantity / recipe.output_quantity along it
+
+Maintenance is incremental. A write to an item's recipes can only change the
+closure of that item and of its ancestors, so refresh_closure() recomputes just
+those, children first, on top of the stored closure of their other ingredients, and
+writes only the rows that differ — a handful of queries whatever the depth. A recipe that would make an item an ingredient
+of itself is rejected with BomError; callers run the refresh inside the write's
+transaction so the write is rolled back with it.
+
+rebuild_closure() recomputes everything from the recipes (manage.py
+rebuild_bom_closure) for recovery after writes that bypassed the API.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from .bom import BomError
+from .models import BomClosure, Item, RecipeLine
+
+WRITE_BATCH_SIZE = 1000
+
+
+def default_recipes(lines):
+    """
+    lines: RecipeLine queryset scoping the recipes to read.
+    Returns {output item id: (output_quantity, [(ingredient id, quantity)])}.
+    """
+    recipes, chosen = {}, {}
+    rows = (
+        lines
+        .filter(recipe__is_default=True)
+        .order_by('recipe__output_item_id', '-recipe__created_at', '-recipe_id', 'id')
+        .values_list('recipe__output_item_id', 'recipe_id', 'recipe__output_quantity', 'ingredient_id', 'quantity')
+    )
+    for output_id, recipe_id, output_quantity, ingredient_id, quantity in rows:
+        # First row per output item belongs to its newest default recipe
+        if output_id not in chosen:
+            chosen[output_id] = recipe_id
+            recipes[output_id] = (output_quantity, [])
+        if chosen[output_id] == recipe_id:
+            recipes[output_id][1].append((ingredient_id, quantity))
+    return recipes
+
+
+def _stored(rows):
+    """(ancestor, descendant, depth, factor) rows → {ancestor: {descendant: (depth, factor)}}."""
+    closure = defaultdict(dict)
+    for ancestor_id, descendant_id, depth, factor in rows:
+        closure[ancestor_id][descendant_id] = (depth, factor)
+    return closure
+
+
+def _add(closure, descendant_id, depth, factor):
+    current = closure.get(descendant_id)
+    if current is None:
+        closure[descendant_id] = (depth, factor)
+    else:
+        closure[descendant_id] = (min(current[0], depth), current[1] + factor)
+
+
+def compute_closure(nodes, recipes, known=None):
+    """
+    nodes: item ids to compute, recipes: their default recipes (see default_recipes),
+    known: stored closure of ingredients outside `nodes`.
+    Returns ({ancestor: {descendant: (depth, factor)}}, ids left out because they reach a cycle).
+
+    Kahn's algorithm children first, so every ingredient's closure is complete
+    before the items using it are computed. Recipes without a positive output
+    quantity can't be scaled and are treated as having no lines.
+    """
+    known = known or {}
+    nodes = set(nodes)
+    usable = {
+        node: recipes[node] for node in nodes
+        if node in recipes and recipes[node][0] > 0
+    }
+
+    parents = defaultdict(set)
+    pending = {}
+    for node in nodes:
+        children = {ingredient_id for ingredient_id, _ in usable.get(node, (0, ()))[1]} & nodes
+        pending[node] = len(children)
+        for child in children:
+            parents[child].add(node)
+
+    closure = {}
+    ready = [node for node, count in pending.items() if count == 0]
+    while ready:
+        node = ready.pop()
+        rows = closure[node] = {}
+        if node in usable:
+            output_quantity, lines = usable[node]
+            for ingredient_id, quantity in lines:
+                per_unit = quantity / output_quantity
+                _add(rows, ingredient_id, 1, per_unit)
+                below = closure[ingredient_id] if ingredient_id in closure else known.get(ingredient_id, {})
+                for descendant_id, (depth, factor) in below.items():
+                    _add(rows, descendant_id, depth + 1, per_unit * factor)
+        for parent in parents[node]:
+            pending[parent] -= 1
+            if pending[parent] == 0:
+                ready.append(parent)
+    return closure, sorted(nodes - closure.keys())
+
+
+def _write(closure):
+    BomClosure.objects.bulk_create(
+        (
+            BomClosure(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=depth, factor=factor)
+            for ancestor_id, rows in closure.items()
+            for descendant_id, (depth, factor) in rows.items()
+        ),
+        batch_size=WRITE_BATCH_SIZE,
+    )
+
+
+def _apply(closure, stored):
+    """
+    Writes the difference between `closure` and the `stored` rows of the same
+    ancestors: a quantity edit deep in a shared BOM changes the factor of a few
+    rows per ancestor, not every row of every ancestor.
+    """
+    stale, changed = [], []
+    pending = {ancestor_id: dict(rows) for ancestor_id, rows in closure.items()}
+    for pk, ancestor_id, descendant_id, depth, factor in stored:
+        value = pending.get(ancestor_id, {}).pop(descendant_id, None)
+        if value is None:
+            stale.append(pk)
+        elif value != (depth, factor):
+            changed.append(BomClosure(pk=pk, depth=value[0], factor=value[1]))
+
+    for start in range(0, len(stale), WRITE_BATCH_SIZE):
+        BomClosure.objects.filter(pk__in=stale[start:start + WRITE_BATCH_SIZE]).delete()
+    BomClosure.objects.bulk_update(changed, ['depth', 'factor'], batch_size=WRITE_BATCH_SIZE)
+    _write(pending)
+
+
+@transaction.atomic
+def refresh_closure(item_id):
+    """Recomputes the closure of `item_id` and its ancestors after a write to its recipes."""
+    nodes = set(BomClosure.objects.filter(descendant_id=item_id).values_list('ancestor_id', flat=True))
+    nodes.add(item_id)
+    recipes = default_recipes(RecipeLine.objects.filter(recipe__output_item_id__in=nodes))
+
+    edited = recipes.get(item_id)
+    if edited and edited[0] <= 0:
+        raise BomError('The default recipe needs a positive output_quantity.')
+
+    children = {ingredient_id for _, lines in recipes.values() for ingredient_id, _ in lines} - nodes
+    known = _stored(
+        BomClosure.objects.filter(ancestor_id__in=children)
+        .values_list('ancestor_id', 'descendant_id', 'depth', 'factor')
+    ) if children else {}
+
+    closure, cyclic = compute_closure(nodes, recipes, known)
+    if cyclic:
+        # Only the edited item gained ingredients, so every cycle runs through it
+        name = Item.objects.filter(pk=item_id).values_list('name', flat=True).first()
+        raise BomError(f'"{name}" would become an ingredient of itself.')
+
+    _apply(closure, BomClosure.objects.filter(ancestor_id__in=nodes).values_list(
+        'id', 'ancestor_id', 'descendant_id', 'depth', 'factor',
+    ))
+
+
+def rebuild_closure(company=None):
+    """
+    Recomputes the closure of every item (or one company's) from its recipes.
+    Returns (rows written, ids of items skipped because they reach a cycle).
+    """
+    lines = RecipeLine.objects.all()
+    stored = BomClosure.objects.all()
+    if company is not None:
+        lines = lines.filter(recipe__output_item__company=company)
+        stored = stored.filter(ancestor__company=company)
+
+    recipes = default_recipes(lines)
+    closure, cyclic = compute_closure(recipes, recipes)
+    with transaction.atomic():
+        stored.delete()
+        _write(closure)
+    return sum(len(rows) for rows in closure.values()), cyclic
+
+
+def where_used(item_id, finished_only=False):
+    """
+    Every item whose default recipes use `item_id`, directly or not — one query on
+    the (descendant, depth) index. finished_only keeps the top-level ones: items
+    that are not themselves an ingredient of any default recipe.
+    """
+    rows = BomClosure.objects.filter(descendant_id=item_id)
+    if finished_only:
+        rows = rows.exclude(Exists(BomClosure.objects.filter(descendant_id=OuterRef('ancestor_id'))))
+    return [
+        {
+            'item': row['ancestor_id'],
+            'name': row['ancestor__name'],
+            'uom': row['ancestor__unit_of_measurement__abbreviation'],
+            'item_type': row['ancestor__item_type'],
+            'is_active': row['ancestor__is_active'],
+            'depth': row['depth'],
+            'factor': row['factor'],
+        }
+        for row in rows.order_by('depth', 'ancestor__name').values(
+            'ancestor_id', 'ancestor__name', 'ancestor__unit_of_measurement__abbreviation',
+            'ancestor__item_type', 'ancestor__is_active', 'depth', 'factor',
+        )
+    ]
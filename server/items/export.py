@@ -0,0 +1,125 @@
+"""
+Catalog export (NDJSON / CSV), streamed in constant memory.
+
+Items are read with `.values().iterator(chunk_size)` in id order and turned into
+rows by the list projection (items/projections.py), so an NDJSON line is the
+same object the item list returns. Optional extras are loaded per chunk — one
+`item_id__in` query each — never per item and never for the whole catalog:
+
+    attributes  {"key": "value", ...}
+    recipe      the item's default recipe (newest if several are flagged) with
+                its lines, or null
+
+CSV has one line per item; the nested extras are JSON-encoded into a single
+cell so the file stays one row per item and round-trips losslessly.
+"""
+import json
+
+from rest_framework.exceptions import ValidationError
+
+from .models import ItemAttribute, Recipe, RecipeLine
+from .projections import item_list_projection
+from .serializers import ItemSerializer
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+EXPORT_INCLUDES = ('attributes', 'recipe')
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def parse_export_format(raw):
+    export_format = (raw or 'ndjson').lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ValidationError({'output': f'Expected one of: {", ".join(EXPORT_FORMATS)}.'})
+    return export_format
+
+
+def parse_includes(raw):
+    return tuple(i for i in EXPORT_INCLUDES if i in (raw or '').split(','))
+
+
+def export_queryset(queryset):
+    """Plain id order: stable across runs and served by the primary key."""
+    return item_list_projection.values(queryset.order_by('id'))
+
+
+def _attributes_for(ids):
+    attributes = {}
+    for row in ItemAttribute.objects.filter(item_id__in=ids).order_by('key').values('item_id', 'key', 'value'):
+        attributes.setdefault(row['item_id'], {})[row['key']] = row['value']
+    return attributes
+
+
+def _recipes_for(ids):
+    recipes = {}
+    defaults = (
+        Recipe.objects
+        .filter(output_item_id__in=ids, is_default=True)
+        .order_by('output_item_id', '-created_at', '-id')
+        .values('id', 'output_item_id', 'name', 'output_quantity')
+    )
+    for row in defaults:
+        item_id = row.pop('output_item_id')
+        if item_id not in recipes:
+            recipes[item_id] = {**row, 'lines': []}
+
+    by_recipe = {recipe['id']: recipe for recipe in recipes.values()}
+    lines = (
+        RecipeLine.objects
+        .filter(recipe_id__in=by_recipe)
+        .order_by('recipe_id', 'id')
+        .values(
+            'recipe_id', 'ingredient_id', 'ingredient__name',
+            'ingredient__unit_of_measurement__abbreviation', 'quantity',
+        )
+    )
+    for line in lines:
+        by_recipe[line['recipe_id']]['lines'].append({
+            'ingredient': line['ingredient_id'],
+            'ingredient_name': line['ingredient__name'],
+            'ingredient_uom': line['ingredient__unit_of_measurement__abbreviation'],
+            'quantity': line['quantity'],
+        })
+    return recipes
+
+
+def export_rows(chunk, includes=()):
+    """One chunk of `.values()` rows → list of export dicts."""
+    rows = item_list_projection.rows(chunk)
+    if not includes:
+        return rows
+
+    ids = [row['id'] for row in rows]
+    attributes = _attributes_for(ids) if 'attributes' in includes else None
+    recipes = _recipes_for(ids) if 'recipe' in includes else None
+    for row in rows:
+        if attributes is not None:
+            row['attributes'] = attributes.get(row['id'], {})
+        if recipes is not None:
+            row['recipe'] = recipes.get(row['id'])
+    return rows
+
+
+def csv_header(includes=()):
+    return [*ItemSerializer.Meta.fields, *includes]
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    return value
+
+
+def csv_rows(chunk, includes=()):
+    header = csv_header(includes)
+    return [
+        [_csv_value(row.get(column)) for column in header]
+        for row in export_rows(chunk, includes)
+    ]
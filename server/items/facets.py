@@ -0,0 +1,90 @@
+"""
+Facet counts for the item list (?facets=type,category,active).
+
+One grouped aggregation over the list's queryset *before* the facet filters:
+
+    SELECT item_type, category_id, category.name, is_active, COUNT(*)
+    ... GROUP BY item_type, category_id, category.name, is_active
+
+The handful of resulting cells is then folded in Python so that each facet's
+counts honour every active filter except its own (the usual faceted-search
+behaviour: with ?type=raw selected you still see how many BOM items there are).
+"""
+from django.db.models import Count
+from rest_framework.exceptions import ValidationError
+
+FACETS = ('type', 'category', 'active')
+
+# facet name → key in the grouped row
+FACET_COLUMNS = {
+    'type': 'item_type',
+    'category': 'category_id',
+    'active': 'is_active',
+}
+
+
+def parse_facet_filters(params):
+    """?type= / ?active= / ?category= → {"type": "raw", "active": True, "category": 3}."""
+    filters = {}
+    item_type = params.get('type')
+    is_active = params.get('active')
+    category = params.get('category')
+    if item_type in ('raw', 'bom'):
+        filters['type'] = item_type
+    if is_active is not None:
+        filters['active'] = is_active.lower() == 'true'
+    if category:
+        if not category.isdigit():
+            raise ValidationError({'detail': 'category must be an id.'})
+        filters['category'] = int(category)
+    return filters
+
+
+def filter_items(queryset, filters):
+    return queryset.filter(**{FACET_COLUMNS[name]: value for name, value in filters.items()})
+
+
+def parse_facets(raw):
+    return [f for f in dict.fromkeys((raw or '').split(',')) if f in FACETS]
+
+
+def facet_counts(queryset, facets, filters):
+    """
+    queryset: items with all non-facet filters (company, search, ...) applied
+    facets:   requested facet names
+    filters:  active facet filters, e.g. {"type": "raw", "active": True, "category": 3}
+    """
+    if not facets:
+        return {}
+
+    cells = list(
+        queryset
+        .order_by()
+        .values('item_type', 'category_id', 'category__name', 'is_active')
+        .annotate(count=Count('id'))
+    )
+    type_labels = dict(queryset.model.ITEM_TYPES)
+
+    result = {}
+    for facet in facets:
+        others = {name: value for name, value in filters.items() if name != facet}
+        totals, labels = {}, {}
+        for cell in cells:
+            if any(cell[FACET_COLUMNS[name]] != value for name, value in others.items()):
+                continue
+            value = cell[FACET_COLUMNS[facet]]
+            totals[value] = totals.get(value, 0) + cell['count']
+            if facet == 'category':
+                labels[value] = cell['category__name']
+
+        if facet == 'type':
+            rows = [{'value': v, 'label': type_labels[v], 'count': totals.get(v, 0)} for v in type_labels]
+        elif facet == 'active':
+            rows = [{'value': v, 'count': totals.get(v, 0)} for v in (True, False)]
+        else:
+            rows = sorted(
+                ({'value': v, 'label': labels[v], 'count': n} for v, n in totals.items()),
+                key=lambda row: (row['value'] is None, (row['label'] or '').lower()),
+            )
+        result[facet] = rows
+    return result
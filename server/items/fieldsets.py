@@ -0,0 +1,80 @@
+"""
+Sparse fieldsets for the catalog list endpoints (?fields=id,name,uom).
+
+Each map below ties a serialized field to the columns it reads. Narrowing a
+list to the requested fields then narrows the SQL as well: `.only()` (or the
+projection's `.values()`) loads just those columns, and joins are added only
+for relations a requested field actually walks — `?fields=id,name` never
+touches `description`, `category` or `unit_of_measurement`.
+
+Responses keep the serializer's field order whatever order was requested.
+"""
+from rest_framework.exceptions import ValidationError
+
+# ItemSerializer field → columns (names valid for both .only() and .values())
+ITEM_LIST_COLUMNS = {
+    'id':            ('id',),
+    'name':          ('name',),
+    'description':   ('description',),
+    'item_type':     ('item_type',),
+    'uom':           ('unit_of_measurement__abbreviation',),
+    'category':      ('category_id',),
+    # category_id too: the serializer omits category_name when there is no category
+    'category_name': ('category_id', 'category__name'),
+    'is_active':     ('is_active',),
+    'date_added':    ('date_added',),
+}
+
+CATEGORY_COLUMNS = {
+    'id':      ('id',),
+    'company': ('company_id',),
+    'name':    ('name',),
+}
+
+RECIPE_COLUMNS = {
+    'id':              ('id',),
+    'name':            ('name',),
+    'output_quantity': ('output_quantity',),
+    'is_default':      ('is_default',),
+    'created_at':      ('created_at',),
+    'lines':           (),  # prefetched separately
+}
+
+
+def parse_fields(raw, available):
+    """
+    `?fields=` → tuple of field names in `available` order, or None when the
+    parameter is absent (= every field). Unknown names are a 400.
+    """
+    if raw is None:
+        return None
+    requested = {f.strip() for f in raw.split(',') if f.strip()}
+    unknown = sorted(requested - set(available))
+    if unknown or not requested:
+        raise ValidationError({
+            'fields': f'Unknown field(s): {", ".join(unknown)}.' if unknown else 'No fields given.',
+            'available': list(available),
+        })
+    return tuple(f for f in available if f in requested)
+
+
+def columns_for(fields, column_map, extra=()):
+    """Columns needed for `fields` (all when None) plus `extra` (e.g. ordering keys), deduplicated."""
+    names = column_map if fields is None else fields
+    columns = [c for name in names for c in column_map[name]]
+    return list(dict.fromkeys(['id', *columns, *(f.lstrip('-') for f in extra)]))
+
+
+def narrow(queryset, fields, column_map, extra=()):
+    """
+    Joins only the relations the fields walk; defers every unrequested column
+    when `fields` is given. `extra` columns stay loaded (keyset pagination reads
+    its ordering fields off each row).
+    """
+    columns = columns_for(fields, column_map, extra)
+    relations = [c.rsplit('__', 1)[0] for c in columns if '__' in c]
+    if relations:
+        queryset = queryset.select_related(*dict.fromkeys(relations))
+    if fields is not None:
+        queryset = queryset.only(*(c for c in columns if c not in queryset.query.annotations))
+    return queryset
@@ -0,0 +1,269 @@
+"""
+Bulk item import (CSV / JSON Lines), streamed.
+
+The creation path in ItemListCreateView.post costs three round trips per item:
+a category exists(), a name exists() and the INSERT. An import does instead:
+
+    once        UOM and category lookup dicts for the company (two queries)
+    per batch   one `name__in` query for names already taken
+                one bulk INSERT for new categories (with create_categories)
+                one bulk INSERT for the items
+
+Records are read lazily from the file, so memory is bounded by the batch size,
+not the file size. Every batch commits on its own; invalid rows are skipped and
+reported with their line number. With dry_run nothing is written but every
+check still runs, so the report is what a real import would produce.
+
+Record fields (CSV header names / JSON keys):
+    name         required, unique within the company
+    uom          unit abbreviation ("kg", "pcs", ...), required
+    description  optional
+    item_type    "raw" (default) or "bom"
+    category     category name, optional
+    is_active    true/false (default true)
+"""
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from .models import Category, Item, UnitOfMeasure
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+ITEM_TYPES = dict(Item.ITEM_TYPES)
+
+TRUE_VALUES = ('true', '1', 'yes', 'y')
+FALSE_VALUES = ('false', '0', 'no', 'n')
+
+
+@dataclass
+class ImportReport:
+    dry_run: bool = False
+    read: int = 0
+    created: int = 0
+    failed: int = 0
+    categories_created: int = 0
+    errors: list = field(default_factory=list)   # [{"line", "name", "detail"}], capped
+    seconds: float = 0.0
+
+    def error(self, line, name, detail):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'name': name, 'detail': detail})
+
+    def as_dict(self):
+        seconds = self.seconds or 1e-9
+        return {
+            'dry_run': self.dry_run,
+            'read': self.read,
+            'created': self.created,
+            'failed': self.failed,
+            'categories_created': self.categories_created,
+            'seconds': round(self.seconds, 3),
+            'rows_per_second': round(self.read / seconds, 1),
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+
+def import_format_for(filename, explicit=None):
+    """Explicit format wins; otherwise `.csv` files are CSV and anything else JSON Lines."""
+    if explicit:
+        if explicit not in IMPORT_FORMATS:
+            raise ValueError(f'Expected one of: {", ".join(IMPORT_FORMATS)}.')
+        return explicit
+    return 'csv' if (filename or '').lower().endswith('.csv') else 'jsonl'
+
+
+def read_records(lines, import_format):
+    """
+    lines: iterable of text lines (a file opened with newline='', decoded upload chunks, ...)
+    Yields (line_number, record, error) — record is a dict of stripped strings, error a
+    message for lines that could not be parsed.
+    """
+    if import_format == 'csv':
+        reader = csv.DictReader(lines)
+        for row in reader:
+            record = {key.strip().lower(): (value or '').strip() for key, value in row.items() if key}
+            yield reader.line_num, record, None
+        return
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield number, None, f'Invalid JSON: {exc.msg}.'
+            continue
+        if not isinstance(record, dict):
+            yield number, None, 'Expected a JSON object.'
+            continue
+        yield number, {key.lower(): value for key, value in record.items()}, None
+
+
+def _batches(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _text(value):
+    return '' if value is None else str(value).strip()
+
+
+class ItemImporter:
+    def __init__(self, company, create_categories=False, dry_run=False, batch_size=BATCH_SIZE):
+        self.company = company
+        self.create_categories = create_categories
+        self.dry_run = dry_run
+        self.batch_size = max(1, batch_size)
+        self.report = ImportReport(dry_run=dry_run)
+
+        # Per-import lookup dicts — no per-row queries
+        self.uoms = dict(UnitOfMeasure.objects.values_list('abbreviation', 'id'))
+        self.uoms_folded = {abbreviation.lower(): pk for abbreviation, pk in self.uoms.items()}
+        self.categories = dict(Category.objects.filter(company=company).values_list('name', 'id'))
+        self.name_field = Item._meta.get_field('name')
+        self.category_field = Category._meta.get_field('name')
+        self.seen = set()
+
+    def run(self, records) -> ImportReport:
+        started = time.perf_counter()
+        try:
+            for batch in _batches(records, self.batch_size):
+                self.import_batch(batch)
+        except UnicodeDecodeError:
+            self.report.error(None, '', 'File is not valid UTF-8; import stopped.')
+        # Name clashes with existing items are found after the per-row checks of their batch
+        self.report.errors.sort(key=lambda error: (error['line'] is None, error['line'] or 0))
+        self.report.seconds = time.perf_counter() - started
+        return self.report
+
+    def clean(self, record):
+        """Record → (values for Item, None) or (None, error message)."""
+        name = _text(record.get('name'))
+        try:
+            self.name_field.clean(name, None)
+        except ValidationError as exc:
+            return None, ' '.join(exc.messages)
+        if name in self.seen:
+            return None, 'Duplicate item name in this file.'
+
+        uom = _text(record.get('uom'))
+        uom_id = self.uoms.get(uom) or self.uoms_folded.get(uom.lower())
+        if uom_id is None:
+            return None, f'Unknown unit of measure "{uom}".' if uom else 'uom is required.'
+
+        item_type = _text(record.get('item_type')) or 'raw'
+        if item_type not in ITEM_TYPES:
+            return None, 'item_type must be "raw" or "bom".'
+
+        is_active = record.get('is_active', '')
+        if not isinstance(is_active, bool):
+            # Only a missing key or blank cell defaults to true; JSON null is rejected
+            is_active = None if is_active is None else _text(is_active).lower()
+            if is_active not in ('', *TRUE_VALUES, *FALSE_VALUES):
+                return None, 'is_active must be true or false.'
+            is_active = is_active not in FALSE_VALUES
+
+        category = _text(record.get('category'))
+        if category and category not in self.categories:
+            if not self.create_categories:
+                return None, f'Unknown category "{category}".'
+            try:
+                self.category_field.clean(category, None)
+            except ValidationError as exc:
+                return None, ' '.join(exc.messages)
+
+        return {
+            'name': name,
+            'description': _text(record.get('description')),
+            'item_type': item_type,
+            'unit_of_measurement_id': uom_id,
+            'category': category,
+            'is_active': is_active,
+        }, None
+
+    def import_batch(self, batch):
+        rows = []
+        for line, record, error in batch:
+            self.report.read += 1
+            if error:
+                self.report.error(line, '', error)
+                continue
+            values, error = self.clean(record)
+            if error:
+                self.report.error(line, _text(record.get('name')), error)
+                continue
+            self.seen.add(values['name'])
+            rows.append((line, values))
+
+        taken = set(
+            Item.objects
+            .filter(company=self.company, name__in=[values['name'] for _, values in rows])
+            .values_list('name', flat=True)
+        ) if rows else set()
+
+        valid = []
+        for line, values in rows:
+            if values['name'] in taken:
+                self.report.error(line, values['name'], 'An item with that name already exists in this company.')
+            else:
+                valid.append((line, values))
+        if not valid:
+            return
+
+        new_categories = list(dict.fromkeys(
+            values['category'] for _, values in valid
+            if values['category'] and values['category'] not in self.categories
+        ))
+        if self.dry_run:
+            self.categories.update(dict.fromkeys(new_categories))
+            self.report.categories_created += len(new_categories)
+            self.report.created += len(valid)
+            return
+
+        # A concurrent writer can still take a name between the check above and the
+        # insert: the batch is rolled back and reported, earlier batches stay committed.
+        try:
+            with transaction.atomic():
+                created = Category.objects.bulk_create([
+                    Category(company=self.company, name=name) for name in new_categories
+                ])
+                category_ids = {**self.categories, **{category.name: category.pk for category in created}}
+                Item.objects.bulk_create([
+                    Item(
+                        company=self.company,
+                        name=values['name'],
+                        description=values['description'],
+                        item_type=values['item_type'],
+                        unit_of_measurement_id=values['unit_of_measurement_id'],
+                        category_id=category_ids.get(values['category']),
+                        is_active=values['is_active'],
+                    )
+                    for _, values in valid
+                ])
+        except IntegrityError:
+            for line, values in valid:
+                self.report.error(line, values['name'], 'Conflicting change by another user; row not imported, retry it.')
+            return
+        self.categories.update((category.name, category.pk) for category in created)
+        self.report.categories_created += len(created)
+        self.report.created += len(valid)
+
+
+def import_items(company, lines, import_format, **options) -> ImportReport:
+    """Parses `lines` as `import_format` and imports them (options: see ItemImporter)."""
+    return ItemImporter(company, **options).run(read_records(lines, import_format))
@@ -0,0 +1,55 @@
+"""
+Batch item lookup by id (?ids=1,2,3 on the item list, or POST .../items/lookup/).
+
+All requested items come from one `id__in` query scoped to the company, through
+the list projection (so ?fields= works here too). Results keep the requested
+order; ids that don't exist in the company are listed under "missing" rather
+than silently dropped.
+"""
+from rest_framework.exceptions import ValidationError
+
+from core.validation import is_id
+
+from .projections import item_list_projection
+
+MAX_LOOKUP_IDS = 1000
+
+
+def parse_ids(raw):
+    """ "3,1,2" or [3, 1, 2] → [3, 1, 2] (deduplicated, order kept). """
+    values = raw.split(',') if isinstance(raw, str) else raw
+    if not isinstance(values, list):
+        raise ValidationError({'ids': 'Expected a comma-separated string or a list of ids.'})
+
+    ids = []
+    for value in values:
+        if isinstance(value, str):
+            value = value.strip()
+            if not value:
+                continue
+            if not value.isdigit():
+                raise ValidationError({'ids': f'Invalid id: {value!r}.'})
+            value = int(value)
+        elif not is_id(value):
+            raise ValidationError({'ids': f'Invalid id: {value!r}.'})
+        ids.append(value)
+
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise ValidationError({'ids': 'No ids given.'})
+    if len(ids) > MAX_LOOKUP_IDS:
+        raise ValidationError({'ids': f'At most {MAX_LOOKUP_IDS} ids per lookup.'})
+    return ids
+
+
+def lookup_items(queryset, ids, fields=None):
+    """{"results": [rows in `ids` order], "missing": [ids not found]}"""
+    rows = {
+        values['id']: values
+        for values in item_list_projection.values(queryset.filter(id__in=ids), fields=fields)
+    }
+    found = [rows[item_id] for item_id in ids if item_id in rows]
+    return {
+        'results': item_list_projection.rows(found, fields),
+        'missing': [item_id for item_id in ids if item_id not in rows],
+    }
@@ -0,0 +1,62 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from companies.models import Company
+from items.importer import BATCH_SIZE, IMPORT_FORMATS, import_format_for, import_items
+
+
+class Command(BaseCommand):
+    """
+    Imports a company's item catalog in batches.
+
+        python manage.py import_items 42 catalog.csv
+        python manage.py import_items 42 catalog.jsonl --dry-run
+        cat catalog.jsonl | python manage.py import_items 42 - --create-categories
+
+    Rows: name, uom (abbreviation), description, item_type, category (name), is_active.
+    CSV needs a header row; anything else is read as JSON Lines ("-" reads stdin).
+    """
+    help = "Import items from a CSV or JSON Lines file (batched, with a per-row error report)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('company_id', type=int)
+        parser.add_argument('path', help='CSV or JSON Lines file, or "-" for stdin.')
+        parser.add_argument('--input', choices=IMPORT_FORMATS, help='Override the format guessed from the extension.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Validate and report without writing.')
+        parser.add_argument('--create-categories', action='store_true', help='Create unknown categories.')
+
+    def handle(self, *args, **options):
+        company = Company.objects.filter(pk=options['company_id']).first()
+        if company is None:
+            raise CommandError(f"Company {options['company_id']} not found.")
+
+        path = options['path']
+        import_format = import_format_for(path if path != '-' else '', options['input'])
+        import_options = {
+            'dry_run': options['dry_run'],
+            'create_categories': options['create_categories'],
+            'batch_size': options['batch_size'],
+        }
+        try:
+            if path == '-':
+                report = import_items(company, sys.stdin, import_format, **import_options)
+            else:
+                with open(path, newline='', encoding='utf-8-sig') as fh:
+                    report = import_items(company, fh, import_format, **import_options)
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        summary = report.as_dict()
+        for error in report.errors:
+            self.stderr.write(f"line {error['line']} ({error['name']!r}): {error['detail']}")
+        if summary['errors_truncated']:
+            self.stderr.write(f"... {report.failed - len(report.errors)} more errors not shown")
+
+        prefix = '[dry run] would have imported' if report.dry_run else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {summary['created']} of {summary['read']} items ({summary['failed']} failed, "
+            f"{summary['categories_created']} new categories) in {summary['seconds']}s — "
+            f"{summary['rows_per_second']} rows/s."
+        ))
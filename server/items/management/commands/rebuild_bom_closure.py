@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from companies.models import Company
+from items.closure import rebuild_closure
+from items.models import Item
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the BOM closure table (items/closure.py) from the default recipes.
+
+        python manage.py rebuild_bom_closure
+        python manage.py rebuild_bom_closure --company 42
+
+    The API keeps the table current on every recipe write; this is for recovery
+    after writes that bypassed it (admin, shell, raw SQL, restored backups).
+    """
+    help = "Rebuild the BOM closure table used by where-used queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', type=int, help='Only rebuild this company.')
+
+    def handle(self, *args, **options):
+        company = None
+        if options['company'] is not None:
+            company = Company.objects.filter(pk=options['company']).first()
+            if company is None:
+                raise CommandError(f"Company {options['company']} not found.")
+
+        started = time.perf_counter()
+        written, cyclic = rebuild_closure(company)
+        seconds = time.perf_counter() - started
+
+        if cyclic:
+            names = Item.objects.filter(id__in=cyclic).order_by('name').values_list('name', flat=True)
+            self.stderr.write(
+                f"{len(cyclic)} items reach a recipe cycle and were left out: " + ', '.join(names)
+            )
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} closure rows in {seconds:.2f}s."))
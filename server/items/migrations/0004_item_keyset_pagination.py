@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-17 03:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_company_access_version'),
+        ('items', '0003_itemattribute'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='item',
+            options={'ordering': ['-date_added', 'id'], 'verbose_name': 'Item', 'verbose_name_plural': 'Items'},
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['company', '-date_added', 'id'], name='idx_item_company_keyset'),
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 6.0.2 on 2026-10-17 07:00
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_closure(apps, schema_editor):
+    """
+    Self-contained copy of the closure computation as it stood when this migration
+    was written (items/closure.py may change later; this must not).
+    """
+    RecipeLine = apps.get_model("items", "RecipeLine")
+    BomClosure = apps.get_model("items", "BomClosure")
+
+    # Newest default recipe per output item: {output id: (output_quantity, [(ingredient id, quantity)])}
+    recipes, chosen = {}, {}
+    rows = (
+        RecipeLine.objects
+        .filter(recipe__is_default=True)
+        .order_by("recipe__output_item_id", "-recipe__created_at", "-recipe_id", "id")
+        .values_list("recipe__output_item_id", "recipe_id", "recipe__output_quantity", "ingredient_id", "quantity")
+    )
+    for output_id, recipe_id, output_quantity, ingredient_id, quantity in rows.iterator():
+        if output_id not in chosen:
+            chosen[output_id] = recipe_id
+            recipes[output_id] = (output_quantity, [])
+        if chosen[output_id] == recipe_id:
+            recipes[output_id][1].append((ingredient_id, quantity))
+
+    # Recipes without a positive output quantity can't be scaled: no lines
+    usable = {node: recipe for node, recipe in recipes.items() if recipe[0] > 0}
+    parents, pending = defaultdict(set), {}
+    for node in recipes:
+        children = {ingredient_id for ingredient_id, _ in usable.get(node, (0, ()))[1]} & recipes.keys()
+        pending[node] = len(children)
+        for child in children:
+            parents[child].add(node)
+
+    # Kahn's algorithm, children first; items reaching a cycle are left out
+    # (manage.py rebuild_bom_closure reports them)
+    closure = {}
+    ready = [node for node, count in pending.items() if count == 0]
+    while ready:
+        node = ready.pop()
+        closure_rows = closure[node] = {}
+        output_quantity, lines = usable.get(node, (0, ()))
+        for ingredient_id, quantity in lines:
+            per_unit = quantity / output_quantity
+            paths = [(ingredient_id, 1, per_unit)] + [
+                (descendant_id, depth + 1, per_unit * factor)
+                for descendant_id, (depth, factor) in closure.get(ingredient_id, {}).items()
+            ]
+            for descendant_id, depth, factor in paths:
+                if descendant_id in closure_rows:
+                    current_depth, current_factor = closure_rows[descendant_id]
+                    closure_rows[descendant_id] = (min(current_depth, depth), current_factor + factor)
+                else:
+                    closure_rows[descendant_id] = (depth, factor)
+        for parent in parents[node]:
+            pending[parent] -= 1
+            if pending[parent] == 0:
+                ready.append(parent)
+
+    BomClosure.objects.bulk_create(
+        (
+            BomClosure(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=depth, factor=factor)
+            for ancestor_id, closure_rows in closure.items()
+            for descendant_id, (depth, factor) in closure_rows.items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0005_item_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BomClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField(help_text='Shortest path, 1 = direct ingredient')),
+                ('factor', models.FloatField(help_text='Descendant quantity per unit of ancestor, summed over all paths')),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='closure_descendants', to='items.item')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='closure_ancestors', to='items.item')),
+            ],
+            options={
+                'verbose_name': 'BOM Closure',
+                'verbose_name_plural': 'BOM Closure',
+                'db_table': 'bom_closure',
+                'indexes': [models.Index(fields=['descendant', 'depth'], name='idx_bom_closure_where_used')],
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='uniq_bom_closure_pair')],
+            },
+        ),
+        migrations.RunPython(populate_closure, migrations.RunPython.noop),
+    ]
@@ -62,11 +62,15 @@ class Item(models.Model):
         db_table = 'items'
         verbose_name = 'Item'
         verbose_name_plural = 'Items'
-        ordering = ['-date_added']
+        ordering = ['-date_added', 'id']
         constraints = [
             # Same item name can exist in different companies, not within the same one
             models.UniqueConstraint(fields=['company', 'name'], name='uniq_item_name_per_company')
         ]
+        indexes = [
+            # Cursor pagination of the catalog list (see items/pagination.py)
+            models.Index(fields=['company', '-date_added', 'id'], name='idx_item_company_keyset'),
+        ]
     
     def __str__(self):
         return self.name
@@ -109,6 +113,29 @@ class RecipeLine(models.Model):
         verbose_name_plural = 'Recipe Lines'
 
 
+class BomClosure(models.Model):
+    """
+    Transitive closure of the default-recipe graph: one row per (ancestor, descendant)
+    pair, kept up to date by items/closure.py on every recipe write.
+    """
+    ancestor = models.ForeignKey(Item, on_delete=models.CASCADE, related_name='closure_descendants')
+    descendant = models.ForeignKey(Item, on_delete=models.CASCADE, related_name='closure_ancestors')
+    depth = models.PositiveIntegerField(help_text="Shortest path, 1 = direct ingredient")
+    factor = models.FloatField(help_text="Descendant quantity per unit of ancestor, summed over all paths")
+
+    class Meta:
+        db_table = 'bom_closure'
+        verbose_name = 'BOM Closure'
+        verbose_name_plural = 'BOM Closure'
+        constraints = [
+            models.UniqueConstraint(fields=['ancestor', 'descendant'], name='uniq_bom_closure_pair')
+        ]
+        indexes = [
+            # Where-used: every row for one descendant, nearest ancestors first
+            models.Index(fields=['descendant', 'depth'], name='idx_bom_closure_where_used'),
+        ]
+
+
 class ItemAttribute(models.Model):
     """
     Dynamic key-value attributes attached to an Item.
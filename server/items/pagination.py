@@ -0,0 +1,29 @@
+from django.conf import settings
+
+from core.pagination import KeysetPagination
+
+
+def items_list_setting(name):
+    return settings.ITEMS_LIST[name]
+
+
+class ItemPagination(KeysetPagination):
+    """
+    Newest items first, id as tie-breaker — matches Item.Meta.ordering and is
+    served by idx_item_company_keyset. Sizes come from settings.ITEMS_LIST.
+    """
+    ordering = ('-date_added', 'id')
+    page_size_query_param = 'page_size'
+
+    @property
+    def page_size(self):
+        return items_list_setting('PAGE_SIZE')
+
+    @property
+    def max_page_size(self):
+        return items_list_setting('MAX_PAGE_SIZE')
+
+
+class ItemSearchPagination(ItemPagination):
+    """Best matches first (see items/search.py for the rank annotations)."""
+    ordering = ('search_rank', 'search_distance', 'id')
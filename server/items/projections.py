@@ -0,0 +1,85 @@
+"""
+Projection-based read path for item lists.
+
+ItemSerializer builds a DRF field tree per row and walks `category.name` /
+`unit_of_measurement.abbreviation` through model instances. For list endpoints
+the same JSON can be produced straight from `.values()` rows with the joined
+columns, skipping model instantiation and the field machinery.
+
+The output is byte-identical to ItemSerializer (same keys, order and value
+formatting — checked by items/tests.py ItemProjectionTests), including its quirk
+of omitting `category_name` when the item has no category.
+
+Views opt in per endpoint (`fast_list_serialization = True`). With sparse
+fieldsets (?fields=, see items/fieldsets.py) only the requested columns are
+selected and only the requested keys are built.
+"""
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+
+from .fieldsets import ITEM_LIST_COLUMNS, columns_for
+from .serializers import ItemSerializer
+
+
+class ItemListProjection:
+    """Builds ItemSerializer-shaped dicts from `.values()` rows."""
+
+    def values(self, queryset, extra=(), fields=None):
+        """
+        extra:  additional columns/annotations the caller needs (e.g. cursor fields)
+        fields: sparse fieldset, None for every ItemSerializer field
+        """
+        return queryset.values(*columns_for(fields, ITEM_LIST_COLUMNS, extra))
+
+    @staticmethod
+    def datetime_field():
+        """
+        Formats like ItemSerializer's date_added. The current timezone is resolved
+        once here instead of per row (a context-local lookup that otherwise costs
+        about half of the projection's time).
+        """
+        return serializers.DateTimeField(
+            default_timezone=timezone.get_current_timezone() if settings.USE_TZ else None,
+        )
+
+    def row(self, values, datetime_field):
+        data = {
+            'id': values['id'],
+            'name': values['name'],
+            'description': values['description'],
+            'item_type': values['item_type'],
+            'uom': values['unit_of_measurement__abbreviation'],
+            'category': values['category_id'],
+        }
+        # ItemSerializer skips category_name entirely when category is NULL
+        if values['category_id'] is not None:
+            data['category_name'] = values['category__name']
+        data['is_active'] = values['is_active']
+        data['date_added'] = datetime_field.to_representation(values['date_added'])
+        return data
+
+    def sparse_row(self, values, fields, datetime_field):
+        data = {}
+        for name in fields:
+            if name == 'category_name' and values['category_id'] is None:
+                continue
+            value = values[ITEM_LIST_COLUMNS[name][-1]]
+            data[name] = datetime_field.to_representation(value) if name == 'date_added' else value
+        return data
+
+    def rows(self, values_rows, fields=None):
+        datetime_field = self.datetime_field()
+        if fields is None:
+            return [self.row(values, datetime_field) for values in values_rows]
+        return [self.sparse_row(values, fields, datetime_field) for values in values_rows]
+
+
+item_list_projection = ItemListProjection()
+
+
+def serialize_item_rows(rows, fast, fields=None):
+    """List rows for either path: `.values()` dicts when fast, Item instances otherwise."""
+    if fast:
+        return item_list_projection.rows(rows, fields)
+    return ItemSerializer(rows, many=True, fields=fields).data
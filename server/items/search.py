@@ -0,0 +1,78 @@
+"""
+Indexed item search.
+
+`search_items(queryset, term, fields)` narrows an item queryset to matches of
+`term` in name (and optionally description) and annotates the ranking:
+
+    search_rank      0 = name starts with the term, 1 = contains it elsewhere
+    search_distance  PostgreSQL: pg_trgm distance (1 - similarity) between the term
+                     and UPPER(name::text), the expression the GIN index is built on.
+                     Elsewhere: name length — shorter names first, which for a
+                     contained term tracks similarity (fewer extra trigrams).
+
+The match itself uses whatever index the backend has:
+
+    PostgreSQL  icontains → UPPER(col::text) LIKE UPPER('%term%'), answered by the
+                pg_trgm GIN indexes from migration 0005.
+    SQLite      FTS5 `items_fts` shadow table (trigram tokenizer) kept in sync by
+                triggers; terms shorter than a trigram fall back to LIKE.
+    other       plain icontains scan.
+"""
+from django.db import connection
+from django.db.models import Case, FloatField, IntegerField, Q, TextField, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Length, Upper
+
+SEARCH_FIELDS = ('name', 'description')
+
+# SQLite FTS5 trigram tokenizer needs at least 3 characters to match anything
+FTS_MIN_LENGTH = 3
+
+
+def parse_search_fields(raw):
+    """`?search_in=name,description` → tuple of known fields (default: name only)."""
+    fields = tuple(f for f in (raw or '').split(',') if f in SEARCH_FIELDS)
+    return fields or ('name',)
+
+
+def _fts_query(term, fields):
+    phrase = '"' + term.replace('"', '""') + '"'
+    columns = ' '.join(fields)
+    return f'{{{columns}}} : {phrase}'
+
+
+def match_items(queryset, term, fields=('name',)):
+    if connection.vendor == 'sqlite' and len(term) >= FTS_MIN_LENGTH:
+        return queryset.filter(id__in=RawSQL(
+            'SELECT rowid FROM items_fts WHERE items_fts MATCH %s',
+            (_fts_query(term, fields),),
+        ))
+
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__icontains': term})
+    return queryset.filter(condition)
+
+
+def _search_distance(term):
+    if connection.vendor != 'postgresql':
+        return Length('name')
+    # Imported here: needs psycopg, which other backends don't install
+    from django.contrib.postgres.search import TrigramDistance
+
+    # pg_trgm returns real; as double precision the value survives a keyset cursor exactly
+    return Cast(
+        TrigramDistance(Upper(Cast('name', TextField())), Upper(Value(term, output_field=TextField()))),
+        FloatField(),
+    )
+
+
+def search_items(queryset, term, fields=('name',)):
+    return match_items(queryset, term, fields).annotate(
+        search_rank=Case(
+            When(name__istartswith=term, then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+        ),
+        search_distance=_search_distance(term),
+    )
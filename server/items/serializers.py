@@ -2,6 +2,20 @@ from rest_framework import serializers
 from .models import Category, Item, Recipe, RecipeLine, UnitOfMeasure, ItemAttribute
 
 
+# ============================================================================
+# SPARSE FIELDSETS
+# ============================================================================
+
+class SparseFieldsMixin:
+    """Optional `fields=(...)` kwarg: drop every other field (?fields=, see items/fieldsets.py)."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
 # ============================================================================
 # UNITS OF MEASURE
 # ============================================================================
@@ -16,7 +30,7 @@ class UOMSerializer(serializers.ModelSerializer):
 # CATEGORIES
 # ============================================================================
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'company', 'name']
@@ -48,7 +62,7 @@ class RecipeSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'output_quantity', 'is_default', 'created_at']
 
 
-class RecipeDetailSerializer(serializers.ModelSerializer):
+class RecipeDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Full recipe with all ingredient lines expanded."""
     lines = RecipeLineSerializer(many=True, read_only=True)
 
@@ -61,7 +75,7 @@ class RecipeDetailSerializer(serializers.ModelSerializer):
 # ITEMS
 # ============================================================================
 
-class ItemSerializer(serializers.ModelSerializer):
+class ItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Lightweight — used in list views."""
     category_name = serializers.CharField(source='category.name', read_only=True)
     uom           = serializers.CharField(source='unit_of_measurement.abbreviation', read_only=True)
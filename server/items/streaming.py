@@ -0,0 +1,79 @@
+"""
+Streaming responses for endpoints that must return a whole (possibly huge) result set.
+
+Rows are read with QuerySet.iterator(chunk_size) and serialized one chunk at a
+time, so memory stays flat regardless of catalog size and the first bytes leave
+before the last row is read.
+"""
+import csv
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def iter_chunks(queryset, chunk_size):
+    chunk = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def encode_json(encoder, data):
+    # Same escaping as rest_framework.renderers.JSONRenderer
+    return encoder.encode(data).replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+
+
+def json_array_stream(queryset, serialize, chunk_size):
+    """
+    Yields a JSON array of serialized rows, chunk by chunk (same bytes as JSONRenderer).
+    serialize: callable turning a chunk of rows into a list of dicts.
+    """
+    encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    yield '['
+    first = True
+    for chunk in iter_chunks(queryset, chunk_size):
+        body = ','.join(encode_json(encoder, row) for row in serialize(chunk))
+        yield body if first else ',' + body
+        first = False
+    yield ']'
+
+
+def ndjson_stream(queryset, serialize, chunk_size):
+    """One JSON document per line (application/x-ndjson), chunk by chunk."""
+    encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for chunk in iter_chunks(queryset, chunk_size):
+        yield ''.join(encode_json(encoder, row) + '\n' for row in serialize(chunk))
+
+
+class _Echo:
+    """File-like sink for csv.writer: hands each formatted line back instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_stream(queryset, header, serialize, chunk_size):
+    """
+    CSV with a header line, chunk by chunk.
+    serialize: callable turning a chunk of rows into a list of value sequences.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for chunk in iter_chunks(queryset, chunk_size):
+        yield ''.join(writer.writerow(row) for row in serialize(chunk))
+
+
+def streaming_response(stream, content_type, filename=None):
+    response = StreamingHttpResponse(stream, content_type=content_type)
+    response['Cache-Control'] = 'private, no-store'
+    if filename:
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def streaming_json_response(queryset, serialize, chunk_size):
+    return streaming_response(json_array_stream(queryset, serialize, chunk_size), 'application/json')
@@ -1,3 +1,679 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from companies.models import Company
+from core.testing import CompanyFixturesMixin
+from items.closure import rebuild_closure
+from items.fieldsets import parse_fields
+from items.models import BomClosure, Category, Item, ItemAttribute, Recipe, RecipeLine, UnitOfMeasure
+from items.pagination import ItemPagination
+from items.projections import item_list_projection, serialize_item_rows
+from items.serializers import ItemSerializer
+
+
+class ItemFixturesMixin(CompanyFixturesMixin):
+    """Catalog rows on top of the owner + company fixture."""
+
+    def setUp(self):
+        super().setUp()
+        self.kg = UnitOfMeasure.objects.get(abbreviation='kg')
+        self.base = f'/api/items/companies/{self.company.id}/items/'
+
+    def add_items(self, *names, item_type='raw'):
+        return Item.objects.bulk_create([
+            Item(company=self.company, name=name, unit_of_measurement=self.kg, item_type=item_type)
+            for name in names
+        ])
+
+    def add_recipe(self, item, output_quantity, lines, is_default=True):
+        """Through the API, so the BOM closure is maintained as in production."""
+        response = self.client.post(f'{self.base}{item.pk}/recipes/', {
+            'output_quantity': output_quantity,
+            'is_default': is_default,
+            'lines': [{'ingredient': ingredient.pk, 'quantity': quantity} for ingredient, quantity in lines],
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return Recipe.objects.get(pk=response.json()['id'])
+
+
+class ItemTestCase(ItemFixturesMixin, TestCase):
+    pass
+
+
+class ItemKeysetPaginationTests(ItemTestCase):
+    def test_pages_cover_the_catalog_once_in_order(self):
+        self.add_items(*(f'Item {i}' for i in range(7)))
+        expected = list(
+            Item.objects.filter(company=self.company).order_by('-date_added', 'id').values_list('id', flat=True)
+        )
+
+        seen, url = [], f'{self.base}?page_size=3'
+        while url:
+            body = self.client.get(url).json()
+            self.assertLessEqual(len(body['results']), 3)
+            seen += [row['id'] for row in body['results']]
+            url = body['next']
+
+        self.assertEqual(seen, expected)
+
+    def test_include_total(self):
+        self.add_items('A', 'B')
+        body = self.client.get(f'{self.base}?page_size=1&include_total=true').json()
+        self.assertEqual((body['count'], len(body['results'])), (2, 1))
+
+
+class ItemSearchTests(ItemTestCase):
+    def test_prefix_matches_first_then_closest(self):
+        self.add_items('Brown sugar syrup', 'Sugar cubes', 'Cane sugar', 'Sugar', 'Salt')
+
+        body = self.client.get(f'{self.base}?search=sugar').json()
+
+        self.assertEqual(
+            [row['name'] for row in body['results']], ['Sugar', 'Sugar cubes', 'Cane sugar', 'Brown sugar syrup'],
+        )
+
+    def test_search_pages_follow_the_ranking(self):
+        self.add_items(*(f'Resin {"x" * i}' for i in range(5)), *(f'Pine resin {i}' for i in range(3)))
+        first = self.client.get(f'{self.base}?search=resin&page_size=5').json()
+        ranked = [row['name'] for row in first['results']]
+        ranked += [row['name'] for row in self.client.get(first['next']).json()['results']]
+
+        self.assertEqual(len(ranked), 8)
+        self.assertEqual(ranked[:5], [f'Resin {"x" * i}' for i in range(5)])
+
+    def test_description_only_when_asked(self):
+        item, = self.add_items('Widget')
+        Item.objects.filter(pk=item.pk).update(description='food grade lubricant')
+
+        self.assertEqual(self.client.get(f'{self.base}?search=lubricant').json()['results'], [])
+        body = self.client.get(f'{self.base}?search=lubricant&search_in=name,description').json()
+        self.assertEqual([row['id'] for row in body['results']], [item.pk])
+
+
+class ItemProjectionTests(ItemTestCase):
+    def render_both(self, fields=None):
+        base = (
+            Item.objects.filter(company=self.company)
+            .select_related('unit_of_measurement', 'category')
+            .order_by(*ItemPagination.ordering)
+        )
+        renderer = JSONRenderer()
+        serializer = renderer.render(serialize_item_rows(list(base), fast=False, fields=fields))
+        projection = renderer.render(
+            serialize_item_rows(list(item_list_projection.values(base, fields=fields)), fast=True, fields=fields)
+        )
+        return serializer, projection
+
+    def setUp(self):
+        super().setUp()
+        oils = Category.objects.create(company=self.company, name='Oils')
+        oil, _ = self.add_items('Olive oil', 'Água "mineral"\u2028')
+        Item.objects.filter(pk=oil.pk).update(category=oils, description='cold pressed', is_active=False)
+
+    def test_byte_identical_to_item_serializer(self):
+        serializer, projection = self.render_both()
+
+        self.assertEqual(projection, serializer)
+        rows = {row['name']: row for row in json.loads(projection)}
+        # ItemSerializer leaves category_name out when there is no category
+        self.assertNotIn('category_name', rows['Água "mineral"\u2028'])
+        self.assertEqual(rows['Olive oil']['category_name'], 'Oils')
+
+    @override_settings(TIME_ZONE='Asia/Kolkata')
+    def test_date_added_in_the_current_timezone(self):
+        serializer, projection = self.render_both()
+
+        self.assertEqual(projection, serializer)
+        self.assertTrue(json.loads(projection)[0]['date_added'].endswith('+05:30'))
+
+    def test_sparse_fields(self):
+        for raw in ('id,category_name', 'date_added,name,uom'):
+            with self.subTest(fields=raw):
+                serializer, projection = self.render_both(parse_fields(raw, ItemSerializer.Meta.fields))
+                self.assertEqual(projection, serializer)
+
+
+class SparseFieldsetTests(ItemTestCase):
+    def setUp(self):
+        super().setUp()
+        self.oils = Category.objects.create(company=self.company, name='Oils')
+        self.oil, self.salt = self.add_items('Olive oil', 'Salt')
+        Item.objects.filter(pk=self.oil.pk).update(category=self.oils)
+
+    def get_with_queries(self, url):
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response, [query['sql'] for query in queries]
+
+    def test_item_list_skips_unrequested_joins(self):
+        response, queries = self.get_with_queries(f'{self.base}?fields=name,id')
+
+        self.assertEqual(
+            response.json()['results'], [{'id': self.salt.pk, 'name': 'Salt'}, {'id': self.oil.pk, 'name': 'Olive oil'}],
+        )
+        item_queries = [sql for sql in queries if 'FROM "items"' in sql]
+        self.assertEqual(len(item_queries), 1)
+        self.assertNotIn('"category"', item_queries[0])
+        self.assertNotIn('"unitofmeasure"', item_queries[0])
+        self.assertNotIn('"description"', item_queries[0])
+
+        response, queries = self.get_with_queries(f'{self.base}?fields=id,category_name')
+        self.assertIn('"category"', next(sql for sql in queries if 'FROM "items"' in sql))
+        self.assertEqual(response.json()['results'][1], {'id': self.oil.pk, 'category_name': 'Oils'})
+
+    def test_categories(self):
+        response = self.client.get(f'/api/items/companies/{self.company.id}/categories/?fields=name')
+
+        self.assertEqual(response.json(), [{'name': 'Oils'}])
+
+    def test_recipes_without_lines_skip_the_prefetch(self):
+        bread, = self.add_items('Bread', item_type='bom')
+        recipe = self.add_recipe(bread, 1, [(self.salt, 1)])
+        url = f'{self.base}{bread.pk}/recipes/'
+
+        response, queries = self.get_with_queries(f'{url}?fields=id,is_default')
+        self.assertEqual(response.json(), [{'id': recipe.pk, 'is_default': True}])
+        self.assertFalse(any('"recipeline"' in sql for sql in queries))
+
+        response = self.client.get(f'{url}?fields=lines')
+        self.assertEqual([line['ingredient'] for line in response.json()[0]['lines']], [self.salt.pk])
+
+    def test_unknown_or_empty_fields_are_400(self):
+        for url in (
+            f'{self.base}?fields=id,colour',
+            f'{self.base}?fields=',
+            f'{self.base}?fields=,',
+            f'/api/items/companies/{self.company.id}/categories/?fields=description',
+            f'{self.base}{self.oil.pk}/recipes/?fields=uom',
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 400)
+
+
+class ItemFacetTests(ItemTestCase):
+    def setUp(self):
+        super().setUp()
+        self.oils = Category.objects.create(company=self.company, name='Oils')
+        self.spices = Category.objects.create(company=self.company, name='Spices')
+        olive, sesame, pepper, _ = self.add_items('Olive oil', 'Sesame oil', 'Pepper', 'Water')
+        bread, = self.add_items('Bread', item_type='bom')
+        Item.objects.filter(pk__in=[olive.pk, sesame.pk]).update(category=self.oils)
+        Item.objects.filter(pk__in=[pepper.pk, bread.pk]).update(category=self.spices)
+        Item.objects.filter(pk=sesame.pk).update(is_active=False)
+
+    def facets(self, query=''):
+        return self.client.get(f'{self.base}?facets=type,category,active{query}').json()['facets']
+
+    def test_counts_without_filters(self):
+        facets = self.facets()
+
+        self.assertEqual(facets['type'], [
+            {'value': 'raw', 'label': 'Raw Material', 'count': 4},
+            {'value': 'bom', 'label': 'Manufactured / BOM Item', 'count': 1},
+        ])
+        self.assertEqual(facets['category'], [
+            {'value': self.oils.pk, 'label': 'Oils', 'count': 2},
+            {'value': self.spices.pk, 'label': 'Spices', 'count': 2},
+            {'value': None, 'label': None, 'count': 1},
+        ])
+        self.assertEqual(facets['active'], [{'value': True, 'count': 4}, {'value': False, 'count': 1}])
+
+    def test_each_facet_ignores_its_own_filter(self):
+        body = self.client.get(f'{self.base}?facets=type,category,active&category={self.oils.pk}').json()
+        facets = body['facets']
+
+        self.assertEqual(len(body['results']), 2)
+        # Every category is still offered, counted without the category filter
+        self.assertEqual([row['count'] for row in facets['category']], [2, 2, 1])
+        self.assertEqual([row['count'] for row in facets['type']], [2, 0])
+        self.assertEqual([row['count'] for row in facets['active']], [1, 1])
+
+        facets = self.facets('&type=raw&active=true')
+        self.assertEqual([row['count'] for row in facets['type']], [3, 1])
+        self.assertEqual([row['count'] for row in facets['active']], [3, 1])
+        self.assertEqual([row['count'] for row in facets['category']], [1, 1, 1])
+
+    def test_search_keeps_zero_buckets(self):
+        facets = self.facets('&search=oil')
+
+        self.assertEqual(facets['type'][1], {'value': 'bom', 'label': 'Manufactured / BOM Item', 'count': 0})
+        self.assertEqual(facets['category'], [{'value': self.oils.pk, 'label': 'Oils', 'count': 2}])
+
+    def test_facets_cost_one_query(self):
+        url = f'{self.base}?category={self.spices.pk}'
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as plain:
+            self.client.get(url)
+        with CaptureQueriesContext(connection) as faceted:
+            self.client.get(f'{url}&facets=type,category,active')
+
+        self.assertEqual(len(faceted), len(plain) + 1)
+
+
+class ItemExportTests(ItemTestCase):
+    def setUp(self):
+        super().setUp()
+        self.oil, self.salt = self.add_items('Oil, "extra" virgin', 'Salt')
+        self.dressing, = self.add_items('Dressing', item_type='bom')
+        self.add_recipe(self.dressing, 2, [(self.oil, 1.5), (self.salt, 0.1)])
+        ItemAttribute.objects.create(item=self.oil, key='Origin', value='Crete')
+
+    def export(self, query=''):
+        response = self.client.get(f'{self.base}export/{query}')
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_ndjson_lines_match_the_item_list(self):
+        response, body = self.export()
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        listed = {row['id']: row for row in self.client.get(self.base).json()['results']}
+        self.assertEqual([row['id'] for row in rows], sorted(listed))
+        self.assertEqual(rows, [listed[row['id']] for row in rows])
+
+    def test_csv_quotes_names(self):
+        response, body = self.export('?output=csv&type=raw')
+
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('"Oil, ""extra"" virgin"', body)
+        header, *rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(header[:2], ['id', 'name'])
+        self.assertEqual([row[1] for row in rows], ['Oil, "extra" virgin', 'Salt'])
+
+    def test_includes(self):
+        _, body = self.export('?include=attributes,recipe')
+        rows = {row['id']: row for row in map(json.loads, body.splitlines())}
+
+        self.assertEqual(rows[self.oil.pk]['attributes'], {'Origin': 'Crete'})
+        self.assertIsNone(rows[self.oil.pk]['recipe'])
+        recipe = rows[self.dressing.pk]['recipe']
+        self.assertEqual(recipe['output_quantity'], 2)
+        self.assertEqual(
+            [(line['ingredient_name'], line['quantity']) for line in recipe['lines']],
+            [('Oil, "extra" virgin', 1.5), ('Salt', 0.1)],
+        )
+
+        _, body = self.export('?output=csv&include=attributes')
+        header, *rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(header[-1], 'attributes')
+        self.assertEqual(json.loads(rows[0][-1]), {'Origin': 'Crete'})
+
+    def test_unknown_output_is_400(self):
+        self.assertEqual(self.client.get(f'{self.base}export/?output=xlsx').status_code, 400)
+
+    def test_queries_are_bounded_per_chunk(self):
+        self.add_items(*(f'Extra {i}' for i in range(7)))
+        settings = {'PAGE_SIZE': 50, 'MAX_PAGE_SIZE': 500, 'STREAM_CHUNK_SIZE': 2}
+        with override_settings(ITEMS_LIST=settings):
+            response = self.client.get(f'{self.base}export/?include=attributes,recipe')
+            with CaptureQueriesContext(connection) as queries:
+                lines = b''.join(response.streaming_content).splitlines()
+
+        # 10 items in chunks of 2: the item read, then attributes + recipes + lines per chunk at most
+        self.assertEqual(len(lines), 10)
+        self.assertLessEqual(len(queries), 1 + 3 * 5)
+
+
+class ItemImportTests(ItemTestCase):
+    def upload(self, name, content, **options):
+        return self.client.post(
+            f'{self.base}import/', {'file': SimpleUploadedFile(name, content.encode()), **options}, format='multipart',
+        )
+
+    def test_csv_rows_are_reported_by_line(self):
+        self.add_items('Existing')
+        Category.objects.create(company=self.company, name='Oils')
+
+        response = self.upload('items.csv', '\n'.join([
+            'name,uom,category,item_type,is_active',
+            'Olive oil,kg,Oils,raw,true',
+            'Existing,kg,,,',
+            'Olive oil,kg,,,',
+            'Flour,parsec,,,',
+            ',kg,,,',
+            'Salt,KG,Spices,,',
+            'Sugar,kg,,widget,',
+            'Yeast,kg,,,maybe',
+            'Water,kg,,bom,false',
+        ]))
+
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual((body['read'], body['created'], body['failed']), (9, 2, 7))
+        self.assertEqual([error['line'] for error in body['errors']], [3, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(body['errors'][0]['detail'], 'An item with that name already exists in this company.')
+        self.assertEqual(body['errors'][1]['detail'], 'Duplicate item name in this file.')
+        self.assertEqual(body['errors'][2]['detail'], 'Unknown unit of measure "parsec".')
+        self.assertEqual(body['errors'][4]['detail'], 'Unknown category "Spices".')
+        water = Item.objects.get(company=self.company, name='Water')
+        self.assertEqual((water.item_type, water.is_active), ('bom', False))
+        self.assertEqual(Item.objects.get(company=self.company, name='Olive oil').category.name, 'Oils')
+
+    def test_jsonl_parse_errors(self):
+        response = self.upload('items.jsonl', '\n'.join([
+            '{"name": "Olive oil", "uom": "kg", "is_active": false}',
+            '{"name": ',
+            '[1, 2]',
+            '',
+            '{"name": "Flour", "uom": "kg"}',
+        ]))
+
+        body = response.json()
+        self.assertEqual((body['read'], body['created'], body['failed']), (4, 2, 2))
+        self.assertEqual([error['line'] for error in body['errors']], [2, 3])
+        self.assertEqual(body['errors'][1]['detail'], 'Expected a JSON object.')
+        self.assertFalse(Item.objects.get(company=self.company, name='Olive oil').is_active)
+
+    def test_dry_run_writes_nothing(self):
+        response = self.upload('items.csv', 'name,uom,category\nOlive oil,kg,Oils\n', dry_run='true', create_categories='true')
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body['created'], body['categories_created'], body['dry_run']), (1, 1, True))
+        self.assertFalse(Item.objects.filter(company=self.company).exists())
+        self.assertFalse(Category.objects.filter(company=self.company).exists())
+
+    def test_create_categories_across_batches(self):
+        response = self.upload(
+            'items.csv', 'name,uom,category\nA,kg,Oils\nB,kg,Oils\nC,kg,Spices\n',
+            create_categories='true', batch_size='1',
+        )
+
+        body = response.json()
+        self.assertEqual((body['created'], body['categories_created']), (3, 2))
+        self.assertEqual(
+            sorted(Item.objects.filter(company=self.company).values_list('name', 'category__name')),
+            [('A', 'Oils'), ('B', 'Oils'), ('C', 'Spices')],
+        )
+
+    def test_jsonl_null_is_active_is_rejected(self):
+        response = self.upload('items.jsonl', '{"name": "Olive oil", "uom": "kg", "is_active": null}\n')
+
+        body = response.json()
+        self.assertEqual((body['created'], body['failed']), (0, 1))
+        self.assertEqual(body['errors'][0]['detail'], 'is_active must be true or false.')
+
+    def test_conflicting_batch_is_reported_and_import_continues(self):
+        bulk_create = Item.objects.bulk_create
+
+        def concurrent_writer_took_b(objs, *args, **kwargs):
+            if any(obj.name == 'B' for obj in objs):
+                raise IntegrityError('duplicate key value violates unique constraint')
+            return bulk_create(objs, *args, **kwargs)
+
+        with mock.patch.object(Item.objects, 'bulk_create', side_effect=concurrent_writer_took_b):
+            response = self.upload(
+                'items.csv', 'name,uom,category\nA,kg,Oils\nB,kg,Spices\nC,kg,Spices\n',
+                create_categories='true', batch_size='1',
+            )
+
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual((body['created'], body['failed'], body['categories_created']), (2, 1, 2))
+        self.assertEqual([(error['line'], error['name']) for error in body['errors']], [(3, 'B')])
+        self.assertEqual(
+            sorted(Item.objects.filter(company=self.company).values_list('name', 'category__name')),
+            [('A', 'Oils'), ('C', 'Spices')],
+        )
+
+    def test_bad_options_are_400(self):
+        self.assertEqual(self.client.post(f'{self.base}import/', {}, format='multipart').status_code, 400)
+        self.assertEqual(self.upload('items.txt', 'x', input='xml').status_code, 400)
+        self.assertEqual(self.upload('items.csv', 'x', batch_size='many').status_code, 400)
+
+
+class ItemBulkUpdateTests(ItemTestCase):
+    def bulk(self, body):
+        return self.client.post(f'{self.base}bulk/', body, format='json')
+
+    def test_per_item_rows_get_their_own_outcome(self):
+        oil, flour, salt, sugar, yeast, water, honey = self.add_items(
+            'Olive oil', 'Flour', 'Salt', 'Sugar', 'Yeast', 'Water', 'Honey',
+        )
+        oils = Category.objects.create(company=self.company, name='Oils')
+        foreign = Category.objects.create(company=Company.objects.create(name='Other'), name='Foreign')
+
+        response = self.bulk({'items': [
+            {'id': oil.pk, 'category': oils.pk, 'is_active': False},
+            {'id': flour.pk, 'name': ' Flour '},
+            {'id': salt.pk, 'name': 'Olive oil'},
+            {'id': sugar.pk, 'category': foreign.pk},
+            {'id': oil.pk, 'description': 'again'},
+            {'id': 999999, 'is_active': False},
+            {'id': [oil.pk], 'is_active': False},
+            {'id': yeast.pk, 'category': [oils.pk]},
+            {'id': water.pk, 'unit_of_measurement': {}},
+            {'id': honey.pk, 'is_active': 'no'},
+            'x',
+        ]})
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body['updated'], body['unchanged'], body['error']), (1, 1, 9))
+        self.assertEqual([row['status'] for row in body['results'][:2]], ['updated', 'unchanged'])
+        self.assertEqual(
+            [row['detail'] for row in body['results'][2:]],
+            [
+                'Item "Olive oil" already exists in this company.',
+                'Category not found in this company.',
+                'Duplicate id in this request.',
+                'Item not found in this company.',
+                'id must be an id.',
+                'Category not found in this company.',
+                'Unit of measure not found.',
+                'is_active must be true or false.',
+                'id must be an id.',
+            ],
+        )
+        oil.refresh_from_db()
+        self.assertEqual((oil.category_id, oil.is_active, oil.description), (oils.pk, False, ''))
+        self.assertEqual(Item.objects.get(pk=salt.pk).name, 'Salt')
+
+    def test_uniform_edit_by_filter(self):
+        self.add_items('Olive oil', 'Flour')
+        self.add_items('Bread', item_type='bom')
+
+        response = self.bulk({'filter': {'type': 'raw', 'active': True}, 'set': {'is_active': False}})
+
+        self.assertEqual(response.json(), {'updated': 2})
+        self.assertEqual(
+            sorted(Item.objects.filter(company=self.company, is_active=False).values_list('name', flat=True)),
+            ['Flour', 'Olive oil'],
+        )
+
+    def test_bad_uniform_edits_are_400(self):
+        self.add_items('Olive oil')
+        for body in (
+            {'items': []},
+            {'filter': {}, 'set': {'is_active': False}},
+            {'filter': {'all': True}, 'set': {'name': 'Same'}},
+            {'filter': {'all': True}, 'set': {'category': 999999}},
+            {'filter': {'all': 'yes'}, 'set': {'is_active': False}},
+            {'filter': {'type': ['raw']}, 'set': {'is_active': False}},
+            {'filter': {'ids': 'abc'}, 'set': {'is_active': False}},
+            {'filter': {'colour': 'red'}, 'set': {'is_active': False}},
+        ):
+            with self.subTest(body=body):
+                self.assertEqual(self.bulk(body).status_code, 400)
+        self.assertTrue(Item.objects.get(company=self.company, name='Olive oil').is_active)
+
+
+class ItemLookupTests(ItemTestCase):
+    def test_results_keep_the_requested_order(self):
+        a, b, c = self.add_items('A', 'B', 'C')
+        foreign = Item.objects.create(company=Company.objects.create(name='Other'), name='X', unit_of_measurement=self.kg)
+
+        body = self.client.get(f'{self.base}?ids={c.pk},{a.pk},999999,{foreign.pk},{c.pk},{b.pk}').json()
+
+        self.assertEqual([row['id'] for row in body['results']], [c.pk, a.pk, b.pk])
+        self.assertEqual(body['missing'], [999999, foreign.pk])
+
+    def test_post_with_sparse_fields(self):
+        a, b = self.add_items('A', 'B')
+
+        response = self.client.post(f'{self.base}lookup/', {'ids': [b.pk, a.pk], 'fields': ['id', 'name']}, format='json')
+
+        self.assertEqual(response.json(), {
+            'results': [{'id': b.pk, 'name': 'B'}, {'id': a.pk, 'name': 'A'}],
+            'missing': [],
+        })
+
+    def test_invalid_ids_are_400(self):
+        for ids in ('1,x', '', [True], {'id': 1}, list(range(1, 1002))):
+            with self.subTest(ids=ids):
+                response = self.client.post(f'{self.base}lookup/', {'ids': ids}, format='json')
+                self.assertEqual(response.status_code, 400)
+
+
+class BomExplosionTests(ItemTestCase):
+    def setUp(self):
+        super().setUp()
+        self.flour, self.sugar, self.yeast = self.add_items('Flour', 'Sugar', 'Yeast')
+        self.dough, self.bread = self.add_items('Dough', 'Bread', item_type='bom')
+        # 2 dough ← 1 flour + 0.1 yeast;  4 bread ← 2 dough + 0.5 sugar + 1 flour
+        self.add_recipe(self.dough, 2, [(self.flour, 1), (self.yeast, 0.1)])
+        self.add_recipe(self.bread, 4, [(self.dough, 2), (self.sugar, 0.5), (self.flour, 1)])
+
+    def explode(self, item, query=''):
+        return self.client.get(f'{self.base}{item.pk}/explode/{query}')
+
+    def totals(self, body):
+        return {row['name']: round(row['quantity'], 9) for row in body['totals']}
+
+    def test_totals_scale_by_output_quantity(self):
+        body = self.explode(self.bread, '?quantity=8').json()
+
+        # 8 bread = 2 runs: 4 dough (2 runs: 2 flour, 0.2 yeast) + 1 sugar + 2 flour
+        self.assertEqual(self.totals(body), {'Flour': 4, 'Sugar': 1, 'Yeast': 0.2})
+        self.assertEqual((body['levels'], body['unresolved']), (2, []))
+        dough = body['tree']['children'][0]
+        self.assertEqual((dough['name'], dough['quantity'], dough['recipe']['output_quantity']), ('Dough', 4, 2))
+
+    def test_newest_default_recipe_wins(self):
+        older = Recipe.objects.get(output_item=self.dough)
+        newer = Recipe.objects.create(output_item=self.dough, output_quantity=1, is_default=True)
+        RecipeLine.objects.create(recipe=newer, ingredient=self.flour, quantity=3)
+        Recipe.objects.filter(pk=older.pk).update(created_at=newer.created_at.replace(year=2000))
+
+        body = self.explode(self.dough, '?quantity=2&tree=false').json()
+
+        self.assertEqual(self.totals(body), {'Flour': 6})
+        self.assertNotIn('tree', body)
+
+    def test_bom_without_default_recipe_is_unresolved(self):
+        filling, = self.add_items('Filling', item_type='bom')
+        pie, = self.add_items('Pie', item_type='bom')
+        self.add_recipe(pie, 1, [(filling, 2), (self.sugar, 1)])
+
+        body = self.explode(pie, '?tree=false').json()
+
+        self.assertEqual(self.totals(body), {'Filling': 2, 'Sugar': 1})
+        self.assertEqual(body['unresolved'], [filling.pk])
+
+    def test_cycle_and_bad_quantity_are_400(self):
+        # Written behind the API's back: the closure refresh would reject it
+        recipe = Recipe.objects.get(output_item=self.dough)
+        RecipeLine.objects.create(recipe=recipe, ingredient=self.bread, quantity=1)
+
+        response = self.explode(self.bread)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cycle', response.json()['detail'])
+        for quantity in ('abc', '0', '-1', 'inf'):
+            with self.subTest(quantity=quantity):
+                self.assertEqual(self.explode(self.flour, f'?quantity={quantity}').status_code, 400)
+
+
+class BomWhereUsedTests(ItemTestCase):
+    def setUp(self):
+        super().setUp()
+        self.flour, self.sugar, self.yeast = self.add_items('Flour', 'Sugar', 'Yeast')
+        self.dough, self.bread = self.add_items('Dough', 'Bread', item_type='bom')
+        self.dough_recipe = self.add_recipe(self.dough, 2, [(self.flour, 1), (self.yeast, 0.1)])
+        self.bread_recipe = self.add_recipe(self.bread, 4, [(self.dough, 2), (self.sugar, 0.5), (self.flour, 1)])
+
+    def where_used(self, item, query=''):
+        results = self.client.get(f'{self.base}{item.pk}/where-used/{query}').json()['results']
+        return {row['name']: (row['depth'], round(row['factor'], 9)) for row in results}
+
+    def lines_url(self, recipe, line=None):
+        url = f'{self.base}{recipe.output_item_id}/recipes/{recipe.pk}/lines/'
+        return f'{url}{line.pk}/' if line else url
+
+    def line(self, recipe, ingredient):
+        return RecipeLine.objects.get(recipe=recipe, ingredient=ingredient)
+
+    def assertMatchesRebuild(self):
+        stored = set(BomClosure.objects.values_list('ancestor_id', 'descendant_id', 'depth', 'factor'))
+        rebuild_closure(self.company)
+        self.assertEqual(stored, set(BomClosure.objects.values_list('ancestor_id', 'descendant_id', 'depth', 'factor')))
+
+    def test_depth_and_factor_over_every_path(self):
+        # Flour per bread: 1/4 directly + 2/4 dough × 1/2 flour per dough
+        self.assertEqual(self.where_used(self.flour), {'Dough': (1, 0.5), 'Bread': (1, 0.5)})
+        self.assertEqual(self.where_used(self.yeast), {'Dough': (1, 0.05), 'Bread': (2, 0.025)})
+        self.assertEqual(self.where_used(self.yeast, '?finished=true'), {'Bread': (2, 0.025)})
+        self.assertEqual(self.where_used(self.bread), {})
+        self.assertMatchesRebuild()
+
+    def test_line_writes_refresh_ancestors(self):
+        yeast_line = self.line(self.dough_recipe, self.yeast)
+        response = self.client.patch(self.lines_url(self.dough_recipe, yeast_line), {'quantity': 0.2}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.where_used(self.yeast), {'Dough': (1, 0.1), 'Bread': (2, 0.05)})
+
+        response = self.client.post(
+            self.lines_url(self.dough_recipe), {'ingredient': self.sugar.pk, 'quantity': 1}, format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.where_used(self.sugar), {'Dough': (1, 0.5), 'Bread': (1, 0.375)})
+
+        response = self.client.delete(self.lines_url(self.bread_recipe, self.line(self.bread_recipe, self.flour)))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.where_used(self.flour), {'Dough': (1, 0.5), 'Bread': (2, 0.25)})
+        self.assertMatchesRebuild()
+
+    def test_recipe_writes_refresh_ancestors(self):
+        url = f'{self.base}{self.bread.pk}/recipes/{self.bread_recipe.pk}/'
+
+        self.client.patch(url, {'output_quantity': 2}, format='json')
+        self.assertEqual(self.where_used(self.yeast), {'Dough': (1, 0.05), 'Bread': (2, 0.05)})
+
+        self.client.patch(url, {'lines': [{'ingredient': self.sugar.pk, 'quantity': 1}]}, format='json')
+        self.assertEqual(self.where_used(self.yeast), {'Dough': (1, 0.05)})
+        self.assertEqual(self.where_used(self.sugar), {'Bread': (1, 0.5)})
+
+        # A non-default recipe doesn't count
+        self.add_recipe(self.bread, 1, [(self.yeast, 1)], is_default=False)
+        self.assertEqual(self.where_used(self.yeast), {'Dough': (1, 0.05)})
+
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self.where_used(self.sugar), {})
+        self.assertMatchesRebuild()
+
+    def test_cycles_are_rejected_and_rolled_back(self):
+        response = self.client.post(
+            self.lines_url(self.dough_recipe), {'ingredient': self.bread.pk, 'quantity': 1}, format='json',
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['detail'], '"Dough" would become an ingredient of itself.')
+        self.assertFalse(RecipeLine.objects.filter(recipe=self.dough_recipe, ingredient=self.bread).exists())
+        self.assertEqual(self.where_used(self.bread), {})
+        self.assertMatchesRebuild()
+
+    def test_deleted_items_leave_the_closure(self):
+        self.assertEqual(self.client.delete(f'{self.base}{self.bread.pk}/').status_code, 204)
+
+        self.assertEqual(self.where_used(self.flour), {'Dough': (1, 0.5)})
+        self.assertEqual(self.where_used(self.flour, '?finished=true'), {'Dough': (1, 0.5)})
+        self.assertMatchesRebuild()
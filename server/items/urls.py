@@ -13,12 +13,31 @@ urlpatterns = [
          views.CategoryDetailView.as_view()),
 
     # ── Items ─────────────────────────────────────────────────────────────────
-    # GET supports ?type=raw|bom  &active=true|false  &category=<id>
+    # GET supports ?type=raw|bom  &active=true|false  &category=<id>  &ids=<id,id,...>
     path('companies/<int:company_id>/items/',
          views.ItemListCreateView.as_view()),
+    # Whole catalog as NDJSON/CSV: ?output=ndjson|csv  &include=attributes,recipe
+    path('companies/<int:company_id>/items/export/',
+         views.ItemExportView.as_view()),
+    # Batch lookup for long id lists (short ones: GET items/?ids=1,2,3)
+    path('companies/<int:company_id>/items/lookup/',
+         views.ItemLookupView.as_view()),
+    # Mass edits: {"items": [{id, ...fields}]} or {"filter": {...}, "set": {...}}
+    path('companies/<int:company_id>/items/bulk/',
+         views.ItemBulkUpdateView.as_view()),
+    # Multipart CSV/JSON Lines upload: file, dry_run, create_categories, batch_size
+    path('companies/<int:company_id>/items/import/',
+         views.ItemImportView.as_view()),
     path('companies/<int:company_id>/items/<int:item_id>/',
          views.ItemDetailView.as_view()),
 
+    # Raw material requirements through default recipes: ?quantity=N  &tree=false
+    path('companies/<int:company_id>/items/<int:item_id>/explode/',
+         views.ItemExplodeView.as_view()),
+    # Items using this one at any depth (BOM closure table): ?finished=true
+    path('companies/<int:company_id>/items/<int:item_id>/where-used/',
+         views.ItemWhereUsedView.as_view()),
+
     # ── Recipes (nested under BOM items) ──────────────────────────────────────
     path('companies/<int:company_id>/items/<int:item_id>/recipes/',
          views.RecipeListCreateView.as_view()),
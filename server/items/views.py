@@ -1,16 +1,36 @@
+import codecs
+
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework import status
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from access.models import Membership
-from companies.models import Company
-from access.services.permissions import membership_has_perm
+from access.services.permissions import keys_for_mask, mask_has_perm
+from access.services.tenant import get_tenant
 
 from .models import Category, Item, Recipe, RecipeLine, UnitOfMeasure, ItemAttribute
+from .bom import BomError, explode
+from .bulk import BulkEditError, update_items, update_matching
+from .closure import refresh_closure, where_used
+from .export import (
+    CONTENT_TYPES,
+    csv_header,
+    csv_rows,
+    export_queryset,
+    export_rows,
+    parse_export_format,
+    parse_includes,
+)
+from .facets import facet_counts, filter_items, parse_facet_filters, parse_facets
+from .fieldsets import CATEGORY_COLUMNS, ITEM_LIST_COLUMNS, RECIPE_COLUMNS, narrow, parse_fields
+from .importer import BATCH_SIZE as IMPORT_BATCH_SIZE, import_format_for, import_items
+from .lookup import lookup_items, parse_ids
+from .pagination import ItemPagination, ItemSearchPagination, items_list_setting
+from .projections import item_list_projection, serialize_item_rows
+from .search import parse_search_fields, search_items
 from .serializers import (
     CategorySerializer,
     ItemSerializer,
@@ -21,6 +41,7 @@ from .serializers import (
     UOMSerializer,
     ItemAttributeSerializer
 )
+from .streaming import csv_stream, ndjson_stream, streaming_json_response, streaming_response
 
 
 # ============================================================================
@@ -33,24 +54,36 @@ class CompanyMemberMixin:
     Raises 404 if the company doesn't exist or the user is not an active member.
     """
 
+    def get_tenant(self):
+        """Company + membership + permission mask, resolved in one query per request."""
+        return get_tenant(self.request, self.kwargs['company_id'])
+
     def get_company(self):
-        if not hasattr(self, '_company'):
-            self._company = get_object_or_404(Company, id=self.kwargs['company_id'])
-        return self._company
+        return self.get_tenant().company
 
     def get_membership(self):
-        if not hasattr(self, '_membership'):
-            self._membership = get_object_or_404(
-                Membership,
-                user=self.request.user,
-                company=self.get_company(),
-                is_active=True,
-            )
-        return self._membership
+        return self.get_tenant().membership
+
+    def get_perm_mask(self) -> int:
+        """
+        Requester's permission bitmask in this company — from the access-token
+        claims when present, else the permission cache or the tenant query.
+        """
+        return self.get_tenant().perm_mask
+
+    def get_perm_keys(self):
+        return keys_for_mask(self.get_perm_mask())
+
+    def has_perm(self, perm: str) -> bool:
+        return mask_has_perm(self.get_perm_mask(), perm)
+
+    def has_perms(self, *perms: str) -> bool:
+        mask = self.get_perm_mask()
+        return all(mask_has_perm(mask, perm) for perm in perms)
 
     def require_perm(self, perm: str):
         """Returns 403 Response if lacking permission. Use inside APIView methods."""
-        if not membership_has_perm(self.get_membership(), perm):
+        if not self.has_perm(perm):
             return Response(
                 {'detail': f'Missing permission: {perm}'},
                 status=status.HTTP_403_FORBIDDEN,
@@ -59,7 +92,7 @@ class CompanyMemberMixin:
 
     def check_perm(self, perm: str):
         """Raises PermissionDenied if lacking permission. Use inside get_queryset."""
-        if not membership_has_perm(self.get_membership(), perm):
+        if not self.has_perm(perm):
             raise PermissionDenied(f'Missing permission: {perm}')
 
 
@@ -86,14 +119,17 @@ class CategoryListCreateView(CompanyMemberMixin, APIView):
     """
     GET  /api/items/companies/{company_id}/categories/   → items.view
     POST /api/items/companies/{company_id}/categories/   → items.create
+
+    GET accepts ?fields=id,name (sparse fieldset, items/fieldsets.py).
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request, company_id):
         if denied := self.require_perm('items.view'):
             return denied
-        categories = Category.objects.filter(company=self.get_company())
-        return Response(CategorySerializer(categories, many=True).data)
+        fields = parse_fields(request.query_params.get('fields'), CategorySerializer.Meta.fields)
+        categories = narrow(Category.objects.filter(company=self.get_company()), fields, CATEGORY_COLUMNS)
+        return Response(CategorySerializer(categories, many=True, fields=fields).data)
 
     def post(self, request, company_id):
         if denied := self.require_perm('items.create'):
@@ -170,34 +206,65 @@ class ItemListCreateView(CompanyMemberMixin, APIView):
         ?type=raw|bom
         ?active=true|false
         ?category=<id>
+        ?search=<text>          indexed search, best matches first (items/search.py)
+        ?search_in=name,description   fields to search (default: name)
+        ?facets=type,category,active  adds "facets": counts per value, from one
+                                      grouped query (items/facets.py)
+        ?fields=id,name,uom     sparse fieldset; only those columns/joins are queried
+                                (items/fieldsets.py)
+        ?ids=3,1,2              batch lookup instead of a page: {"results", "missing"}
+                                (items/lookup.py; other filters don't apply)
+
+    GET is cursor-paginated (newest first, see ItemPagination):
+        ?cursor=<opaque>  ?page_size=N (≤ ITEMS_LIST["MAX_PAGE_SIZE"])  ?include_total=true
+    ?stream=true returns the whole filtered catalog as one JSON array, streamed
+    in chunks — for clients that really need every item.
     """
     permission_classes = [IsAuthenticated]
+    # List rows come from .values() via ItemListProjection (same JSON as ItemSerializer)
+    fast_list_serialization = True
 
     def get(self, request, company_id):
         if denied := self.require_perm('items.view'):
             return denied
 
-        qs = (
-            Item.objects
-            .filter(company=self.get_company())
-            .select_related('unit_of_measurement', 'category')
-        )
+        fields = parse_fields(request.query_params.get('fields'), ItemSerializer.Meta.fields)
+        qs = Item.objects.filter(company=self.get_company())
+
+        if 'ids' in request.query_params:
+            return Response(lookup_items(qs, parse_ids(request.query_params['ids']), fields))
 
-        item_type = request.query_params.get('type')
-        is_active = request.query_params.get('active')
-        category  = request.query_params.get('category')
         search = request.query_params.get('search', '').strip()
 
+        paginator = ItemPagination()
         if search:
-            qs = qs.filter(name__icontains=search)
-        if item_type in ('raw', 'bom'):
-            qs = qs.filter(item_type=item_type)
-        if is_active is not None:
-            qs = qs.filter(is_active=is_active.lower() == 'true')
-        if category:
-            qs = qs.filter(category_id=category)
+            qs = search_items(qs, search, parse_search_fields(request.query_params.get('search_in')))
+            paginator = ItemSearchPagination()
+
+        facet_filters = parse_facet_filters(request.query_params)
+        unfiltered = qs
+        qs = filter_items(qs, facet_filters)
+
+        fast = self.fast_list_serialization
+        if fast:
+            qs = item_list_projection.values(qs, extra=paginator.ordering, fields=fields)
+        else:
+            qs = narrow(qs, fields, ITEM_LIST_COLUMNS, extra=paginator.ordering)
+
+        if request.query_params.get('stream', '').lower() == 'true':
+            return streaming_json_response(
+                qs.order_by(*paginator.ordering),
+                lambda chunk: serialize_item_rows(chunk, fast, fields),
+                chunk_size=items_list_setting('STREAM_CHUNK_SIZE'),
+            )
+
+        page = paginator.paginate_queryset(qs, request, view=self)
+        response = paginator.get_paginated_response(serialize_item_rows(page, fast, fields))
 
-        return Response(ItemSerializer(qs, many=True).data)
+        facets = parse_facets(request.query_params.get('facets'))
+        if facets:
+            response.data['facets'] = facet_counts(unfiltered, facets, facet_filters)
+        return response
 
     def post(self, request, company_id):
         if denied := self.require_perm('items.create'):
@@ -238,6 +305,143 @@ class ItemListCreateView(CompanyMemberMixin, APIView):
         return Response(ItemDetailSerializer(item).data, status=status.HTTP_201_CREATED)
 
 
+class ItemExportView(CompanyMemberMixin, APIView):
+    """
+    GET /api/items/companies/{company_id}/items/export/   → items.view
+
+    Streams the company's whole catalog in id order (items/export.py):
+        ?output=ndjson|csv             default ndjson
+        ?include=attributes,recipe     attributes and the default recipe's lines
+        ?type= ?active= ?category=     same filters as the item list
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, company_id):
+        if denied := self.require_perm('items.view'):
+            return denied
+
+        export_format = parse_export_format(request.query_params.get('output'))
+        includes = parse_includes(request.query_params.get('include'))
+        qs = filter_items(Item.objects.filter(company=self.get_company()), parse_facet_filters(request.query_params))
+        rows = export_queryset(qs)
+        chunk_size = items_list_setting('STREAM_CHUNK_SIZE')
+
+        if export_format == 'csv':
+            stream = csv_stream(rows, csv_header(includes), lambda chunk: csv_rows(chunk, includes), chunk_size)
+        else:
+            stream = ndjson_stream(rows, lambda chunk: export_rows(chunk, includes), chunk_size)
+        return streaming_response(
+            stream,
+            CONTENT_TYPES[export_format],
+            filename=f'items-{company_id}.{export_format}',
+        )
+
+
+class ItemImportView(CompanyMemberMixin, APIView):
+    """
+    POST /api/items/companies/{company_id}/items/import/   → items.create
+
+    Multipart upload, imported in batches (items/importer.py):
+        file                 CSV (with header) or JSON Lines
+        input=csv|jsonl      optional, otherwise taken from the file extension
+        dry_run=true         validate and report without writing anything
+        create_categories=true   create unknown category names instead of rejecting rows
+        batch_size=N         rows per batch/transaction (≤ 4 × BATCH_SIZE)
+
+    Invalid rows are skipped and reported by line; the response carries the
+    counts and rows per second.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, company_id):
+        if denied := self.require_perm('items.create'):
+            return denied
+
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'detail': 'file is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            import_format = import_format_for(upload.name, request.data.get('input'))
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            batch_size = max(1, min(int(request.data.get('batch_size', IMPORT_BATCH_SIZE)), IMPORT_BATCH_SIZE * 4))
+        except (TypeError, ValueError):
+            return Response({'detail': 'batch_size must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        report = import_items(
+            self.get_company(),
+            codecs.iterdecode(upload, 'utf-8-sig'),
+            import_format,
+            dry_run=str(request.data.get('dry_run', '')).lower() == 'true',
+            create_categories=str(request.data.get('create_categories', '')).lower() == 'true',
+            batch_size=batch_size,
+        )
+        created = report.created and not report.dry_run
+        return Response(report.as_dict(), status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+class ItemLookupView(CompanyMemberMixin, APIView):
+    """
+    POST /api/items/companies/{company_id}/items/lookup/   → items.view
+    Body: { "ids": [3, 1, 2], "fields": ["id", "name", "uom"]? }
+
+    Same as GET items/?ids= for id lists too long for a URL:
+        { "results": [...in requested order], "missing": [ids not in this company] }
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, company_id):
+        if denied := self.require_perm('items.view'):
+            return denied
+
+        raw_fields = request.data.get('fields')
+        if isinstance(raw_fields, list):
+            raw_fields = ','.join(map(str, raw_fields))
+        fields = parse_fields(raw_fields, ItemSerializer.Meta.fields)
+        ids = parse_ids(request.data.get('ids'))
+        return Response(lookup_items(Item.objects.filter(company=self.get_company()), ids, fields))
+
+
+class ItemBulkUpdateView(CompanyMemberMixin, APIView):
+    """
+    POST /api/items/companies/{company_id}/items/bulk/   → items.edit
+
+    Per-item edits (items/bulk.py):
+        { "items": [ {"id": 12, "is_active": false}, {"id": 13, "category": 4, "name": "..."} ] }
+        → { "updated", "unchanged", "error", "results": [{"id", "status", "detail"?}] }
+
+    Uniform edit of every matching item, one UPDATE:
+        { "filter": {"category": 3, "active": true}, "set": {"is_active": false} }
+        → { "updated": <items matched> }
+    filter keys: ids, type, active, category (id or null), search, or {"all": true}.
+    """
+    permission_classes = [IsAuthenticated]
+    max_items = 5000
+
+    def post(self, request, company_id):
+        if denied := self.require_perm('items.edit'):
+            return denied
+
+        company = self.get_company()
+        if 'items' in request.data:
+            rows = request.data['items']
+            if not isinstance(rows, list) or not rows:
+                return Response({'detail': 'items must be a non-empty list.'}, status=status.HTTP_400_BAD_REQUEST)
+            if len(rows) > self.max_items:
+                return Response(
+                    {'detail': f'At most {self.max_items} items per request.'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            return Response(update_items(company, rows))
+
+        try:
+            updated = update_matching(company, request.data.get('filter'), request.data.get('set'))
+        except BulkEditError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'updated': updated})
+
+
 class ItemDetailView(CompanyMemberMixin, APIView):
     """
     GET    /api/items/companies/{company_id}/items/{item_id}/   → items.view
@@ -301,15 +505,87 @@ class ItemDetailView(CompanyMemberMixin, APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class ItemExplodeView(CompanyMemberMixin, APIView):
+    """
+    GET /api/items/companies/{company_id}/items/{item_id}/explode/   → items.view
+
+    Explodes the item through its default recipes (items/bom.py):
+        ?quantity=5000     units of the item to make (default 1)
+        ?tree=false        totals only — skips the indented tree
+
+    Returns { "item", "quantity", "levels", "totals": [{item, name, uom, quantity}],
+              "unresolved": [BOM ids without a default recipe], "tree"? }
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, company_id, item_id):
+        if denied := self.require_perm('items.view'):
+            return denied
+
+        item = get_object_or_404(
+            Item.objects.select_related('unit_of_measurement'),
+            id=item_id,
+            company=self.get_company(),
+        )
+        try:
+            quantity = float(request.query_params.get('quantity', 1))
+        except ValueError:
+            return Response({'detail': 'quantity must be a number.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not quantity > 0 or quantity == float('inf'):
+            return Response({'detail': 'quantity must be positive.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        tree = request.query_params.get('tree', 'true').lower() != 'false'
+        try:
+            return Response(explode(item, quantity, tree=tree))
+        except BomError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ItemWhereUsedView(CompanyMemberMixin, APIView):
+    """
+    GET /api/items/companies/{company_id}/items/{item_id}/where-used/   → items.view
+
+    Every item whose default recipes use this one, at any depth, read from the
+    BOM closure table (items/closure.py):
+        ?finished=true     only top-level items (not an ingredient of anything)
+
+    Returns { "item", "results": [{item, name, uom, item_type, is_active, depth, factor}] }
+    nearest first; factor = units of this item per unit of the result.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, company_id, item_id):
+        if denied := self.require_perm('items.view'):
+            return denied
+
+        item = get_object_or_404(Item.objects.only('id'), id=item_id, company=self.get_company())
+        finished_only = request.query_params.get('finished', 'false').lower() == 'true'
+        return Response({'item': item.pk, 'results': where_used(item.pk, finished_only=finished_only)})
+
+
 # ============================================================================
 # RECIPES
 # ============================================================================
 
+def refresh_bom_closure(item_id):
+    """
+    Brings bom_closure up to date after a write to the item's recipes. Call it
+    inside the write's transaction: a cycle raises a 400 and rolls the write back.
+    """
+    try:
+        refresh_closure(item_id)
+    except BomError as exc:
+        raise ValidationError({'detail': str(exc)})
+
+
 class RecipeListCreateView(CompanyMemberMixin, APIView):
     """
     GET  /api/items/companies/{company_id}/items/{item_id}/recipes/   → items.view
     POST /api/items/companies/{company_id}/items/{item_id}/recipes/   → items.create
 
+    GET accepts ?fields=id,name,is_default (sparse fieldset, items/fieldsets.py);
+    lines are only loaded when requested.
+
     POST body:
     {
         "name": "Standard Recipe",
@@ -335,12 +611,11 @@ class RecipeListCreateView(CompanyMemberMixin, APIView):
     def get(self, request, company_id, item_id):
         if denied := self.require_perm('items.view'):
             return denied
-        recipes = (
-            Recipe.objects
-            .filter(output_item=self.get_item())
-            .prefetch_related('lines__ingredient__unit_of_measurement')
-        )
-        return Response(RecipeDetailSerializer(recipes, many=True).data)
+        fields = parse_fields(request.query_params.get('fields'), RecipeDetailSerializer.Meta.fields)
+        recipes = narrow(Recipe.objects.filter(output_item=self.get_item()), fields, RECIPE_COLUMNS)
+        if fields is None or 'lines' in fields:
+            recipes = recipes.prefetch_related('lines__ingredient__unit_of_measurement')
+        return Response(RecipeDetailSerializer(recipes, many=True, fields=fields).data)
 
     @transaction.atomic
     def post(self, request, company_id, item_id):
@@ -376,6 +651,7 @@ class RecipeListCreateView(CompanyMemberMixin, APIView):
         )
         invalid = set(ingredient_ids) - valid_ids
         if invalid:
+            transaction.set_rollback(True)
             return Response(
                 {'detail': f'Ingredients not found in this company: {list(invalid)}'},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -385,6 +661,7 @@ class RecipeListCreateView(CompanyMemberMixin, APIView):
             RecipeLine(recipe=recipe, ingredient_id=l['ingredient'], quantity=l['quantity'])
             for l in lines_data
         ])
+        refresh_bom_closure(item.pk)
 
         return Response(RecipeDetailSerializer(recipe).data, status=status.HTTP_201_CREATED)
 
@@ -437,6 +714,7 @@ class RecipeDetailView(CompanyMemberMixin, APIView):
         if 'lines' in request.data:
             lines_data = request.data['lines']
             if not lines_data:
+                transaction.set_rollback(True)
                 return Response(
                     {'detail': 'lines cannot be empty. Provide at least one ingredient.'},
                     status=status.HTTP_400_BAD_REQUEST,
@@ -449,6 +727,7 @@ class RecipeDetailView(CompanyMemberMixin, APIView):
             )
             invalid = set(ingredient_ids) - valid_ids
             if invalid:
+                transaction.set_rollback(True)
                 return Response(
                     {'detail': f'Ingredients not found in this company: {list(invalid)}'},
                     status=status.HTTP_400_BAD_REQUEST,
@@ -460,12 +739,17 @@ class RecipeDetailView(CompanyMemberMixin, APIView):
                 for l in lines_data
             ])
 
+        refresh_bom_closure(recipe.output_item_id)
         return Response(RecipeDetailSerializer(recipe).data)
 
+    @transaction.atomic
     def delete(self, request, company_id, item_id, recipe_id):
         if denied := self.require_perm('items.delete'):
             return denied
-        self.get_recipe().delete()
+        recipe = self.get_recipe()
+        recipe.delete()
+        if recipe.is_default:
+            refresh_bom_closure(recipe.output_item_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -502,6 +786,7 @@ class RecipeLineListCreateView(CompanyMemberMixin, APIView):
         )
         return Response(RecipeLineSerializer(lines, many=True).data)
 
+    @transaction.atomic
     def post(self, request, company_id, item_id, recipe_id):
         if denied := self.require_perm('items.edit'):
             return denied
@@ -529,6 +814,8 @@ class RecipeLineListCreateView(CompanyMemberMixin, APIView):
             )
 
         line = RecipeLine.objects.create(recipe=recipe, ingredient=ingredient, quantity=quantity)
+        if recipe.is_default:
+            refresh_bom_closure(recipe.output_item_id)
         return Response(RecipeLineSerializer(line).data, status=status.HTTP_201_CREATED)
 
 
@@ -546,13 +833,14 @@ class RecipeLineDetailView(CompanyMemberMixin, APIView):
     def get_line(self):
         # Traverse the full chain to ensure the line belongs to this company
         return get_object_or_404(
-            RecipeLine.objects.select_related('ingredient__unit_of_measurement'),
+            RecipeLine.objects.select_related('recipe', 'ingredient__unit_of_measurement'),
             id=self.kwargs['line_id'],
             recipe__id=self.kwargs['recipe_id'],
             recipe__output_item__id=self.kwargs['item_id'],
             recipe__output_item__company=self.get_company(),
         )
 
+    @transaction.atomic
     def patch(self, request, company_id, item_id, recipe_id, line_id):
         if denied := self.require_perm('items.edit'):
             return denied
@@ -567,8 +855,11 @@ class RecipeLineDetailView(CompanyMemberMixin, APIView):
 
         line.quantity = quantity
         line.save(update_fields=['quantity'])
+        if line.recipe.is_default:
+            refresh_bom_closure(line.recipe.output_item_id)
         return Response(RecipeLineSerializer(line).data)
 
+    @transaction.atomic
     def delete(self, request, company_id, item_id, recipe_id, line_id):
         if denied := self.require_perm('items.edit'):
             return denied
@@ -584,6 +875,8 @@ class RecipeLineDetailView(CompanyMemberMixin, APIView):
             )
 
         line.delete()
+        if recipe.is_default:
+            refresh_bom_closure(recipe.output_item_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
     
 
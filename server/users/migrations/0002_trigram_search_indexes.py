@@ -0,0 +1,43 @@
+# Generated by Django 6.0.2 on 2026-10-17 04:05
+
+from django.db import migrations
+
+# icontains on PostgreSQL compiles to  UPPER("users"."username"::text) LIKE UPPER('%term%'),
+# so the trigram indexes are built on exactly that expression. Other backends (SQLite in
+# development) keep the plain LIKE scan — no extension, nothing to create.
+TRIGRAM_INDEXES = {
+    "idx_users_username_trgm": "username",
+    "idx_users_email_trgm": "email",
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+            f'ON users USING gin (UPPER("{column}"::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
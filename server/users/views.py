@@ -2,8 +2,10 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.conf import settings
+from access.services.claims import add_permission_claims
 from .serializers import RegisterSerializer, LoginSerializer, UserSerializer
 from .utils import set_jwt_cookies, clear_jwt_cookies
 
@@ -93,7 +95,7 @@ def login_view(request):
     
     # Generate JWT tokens
     refresh = RefreshToken.for_user(user)
-    access_token = refresh.access_token
+    access_token = add_permission_claims(refresh.access_token, user.id)
     
     # Prepare response
     response_data = {
@@ -158,7 +160,10 @@ def refresh_token_view(request):
     
     try:
         refresh = RefreshToken(refresh_token)
-        access_token = refresh.access_token
+        access_token = add_permission_claims(
+            refresh.access_token,
+            refresh[jwt_settings.USER_ID_CLAIM],
+        )
         
         response = Response(
             {'message': 'Token refreshed'},